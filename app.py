@@ -14,12 +14,19 @@ from dotenv import load_dotenv
 import eventlet
 eventlet.monkey_patch()
 
-from nova_sonic_web_adapter_v3 import NovaSonicWebAdapterV3
+from nova_sonic_web_adapter_v3 import NovaSonicWebAdapterV3, get_stream_pool
+from processors.tool_registry import preload_tool_registries
+from streaming.engine import load_engine_kind
+from streaming.inference import load_inference_profile
+from streaming.regions import configured_regions
+from streaming.retry import CircuitOpenError
 from config import (
     get_voice_id,
     get_prompt_config_path,
     DEFAULT_PROMPT_CONFIG,
-    DIAGNOSTICS_MODE
+    PROMPT_CONFIG_MAPPING,
+    DIAGNOSTICS_MODE,
+    DOWNLINK_CODEC
 )
 
 load_dotenv()
@@ -56,6 +63,29 @@ socketio = SocketIO(
 # Diccionario para manejar múltiples sesiones de Nova Sonic
 nova_adapters = {}
 
+# Pre-calentar streams de Nova Sonic en este worker (no-op si NOVA_SONIC_POOL_SIZE=0)
+try:
+    get_stream_pool()
+except Exception as exc:
+    safe_print(f"⚠️ No se pudo iniciar el pool de streams: {exc}")
+
+# Resolver una sola vez los handlers de tools declarados en cada YAML de contexto
+try:
+    preload_tool_registries(list(PROMPT_CONFIG_MAPPING.values()))
+except Exception as exc:
+    safe_print(f"⚠️ No se pudieron cargar las tools de los prompts: {exc}")
+
+# Validar al arrancar las secciones 'inference' y 'engine' de cada prompt (y no en la primera llamada)
+for _prompt_key, _config_path in PROMPT_CONFIG_MAPPING.items():
+    try:
+        load_inference_profile(_config_path)
+    except Exception as exc:
+        safe_print(f"⚠️ Perfil de inferencia inválido en el prompt '{_prompt_key}': {exc}")
+    try:
+        load_engine_kind(_config_path)
+    except Exception as exc:
+        safe_print(f"⚠️ Motor de sesión inválido en el prompt '{_prompt_key}': {exc}")
+
 # ==================== Pre-flight Checks ====================
 def run_diagnostics():
     """Ejecuta verificaciones de entorno si DIAGNOSTICS_MODE está habilitado."""
@@ -80,6 +110,9 @@ def run_diagnostics():
         safe_print("⚠️  AWS_REGION no configurado (se usará us-east-1)")
     else:
         safe_print(f"✅ AWS_REGION: {region}")
+    regions = configured_regions()
+    if len(regions) > 1:
+        safe_print(f"✅ Regiones Bedrock (ruteo por latencia): {', '.join(regions)}")
     
     # Check FFmpeg
     ffmpeg_path = shutil.which('ffmpeg')
@@ -151,6 +184,9 @@ def handle_call_started(data):
     session_id = request.sid
     voice_code = data.get('voice', 'es-ES-Female')
     prompt_name = data.get('prompt', 'udep')
+    # Opus solo si el servidor lo tiene habilitado y el navegador puede decodificarlo (WebCodecs)
+    client_codecs = data.get('downlink_codecs') or ['pcm']
+    downlink_codec = 'opus' if DOWNLINK_CODEC == 'opus' and 'opus' in client_codecs else 'pcm'
     
     try:
         # Convertir códigos del frontend usando configuración centralizada
@@ -176,16 +212,18 @@ def handle_call_started(data):
             }, room=session_id)
         
         _last_audio_emit_ts = {'ts': None}
-        def on_audio_response(audio_base64):
+        def on_audio_response(audio, seq=None, codec='pcm'):
             now = datetime.datetime.now().timestamp()
             jitter_ms = None
             if _last_audio_emit_ts['ts'] is not None:
                 jitter_ms = int((now - _last_audio_emit_ts['ts']) * 1000)
             _last_audio_emit_ts['ts'] = now
 
-            socketio.emit('audio_playback', {
-                'audio': audio_base64
-            }, room=session_id)
+            if codec == 'opus':
+                payload = {'frames': audio, 'codec': 'opus', 'seq': seq}
+            else:
+                payload = {'audio': audio, 'codec': 'pcm', 'seq': seq}
+            socketio.emit('audio_playback', payload, room=session_id)
             if jitter_ms is not None and jitter_ms > 400:
                 socketio.emit('debug', {
                     'message': f'🔊 Audio enviado (jitter {jitter_ms} ms)'
@@ -202,6 +240,9 @@ def handle_call_started(data):
                 'timestamp': datetime.datetime.now().isoformat()
             }, room=session_id)
 
+        def on_assistant_partial(payload):
+            socketio.emit('nova_response_partial', payload, room=session_id)
+
         def on_lead_snapshot(payload):
             socketio.emit('lead_snapshot', payload, room=session_id)
 
@@ -246,12 +287,32 @@ def handle_call_started(data):
             on_lead_snapshot=on_lead_snapshot,
             on_session_summary=on_session_summary,
             on_usage=on_usage,
-            on_event=on_event  # Nuevo callback para eventos de sistema
+            on_event=on_event,  # Nuevo callback para eventos de sistema
+            downlink_codec=downlink_codec,
+            on_assistant_partial=on_assistant_partial
         )
         
         nova_adapters[session_id] = adapter
         try:
             adapter.start()
+        except CircuitOpenError as exc:
+            # Bedrock está fallando para todo el worker: se rechaza sin abrir stream
+            nova_adapters.pop(session_id, None)
+            socketio.emit('error', {
+                'message': (
+                    'El servicio de voz está saturado en este momento. '
+                    f'Vuelve a intentarlo en unos {exc.retry_after:.0f} segundos.'
+                )
+            }, room=session_id)
+            socketio.emit('debug', {
+                'message': f'⛔ Llamada rechazada por el circuit breaker: {exc}'
+            }, room=session_id)
+            socketio.emit('connection_info', {
+                'status': 'error',
+                'message': str(exc),
+                'retryAfter': exc.retry_after
+            }, room=session_id)
+            return
         except Exception as exc:
             nova_adapters.pop(session_id, None)
             socketio.emit('error', {
@@ -287,7 +348,9 @@ def handle_call_started(data):
             'voice': nova_voice,
             'prompt': prompt_name,
             'status': 'connected',
-            'region': adapter.region
+            'region': adapter.region,
+            'pool': 'hit' if adapter.pool_hit else 'miss',
+            'downlink': adapter.downlink_codec
         })
         
     except Exception as e:
@@ -325,7 +388,15 @@ def handle_voice_select(data):
 def handle_prompt_select(data):
     session_id = request.sid
     prompt_name = data['prompt']
-    
+
+    # Llamada en curso: el cambio se aplica sobre el mismo stream, sin cortar audio ni decoder
+    adapter = nova_adapters.get(session_id)
+    if adapter and adapter.switch_prompt(prompt_name):
+        emit('debug', {
+            'message': f'🔀 Prompt seleccionado: {prompt_name} (se aplica en la llamada en curso)'
+        })
+        return
+
     emit('debug', {
         'message': f'📝 Prompt seleccionado: {prompt_name} (se aplicará en la próxima llamada)'
     })
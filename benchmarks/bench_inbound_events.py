@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Benchmark: costo de clasificar/parsear eventos entrantes de Nova Sonic en _read_loop.
+
+Compara el camino anterior (decode UTF-8 + json.loads de cada mensaje) con el
+router actual (extracción directa del base64 de audioOutput y json.loads solo
+para el resto) sobre una mezcla realista dominada por audioOutput.
+
+Uso:
+    python benchmarks/bench_inbound_events.py [--events 200000] [--audio-ratio 0.9]
+"""
+import argparse
+import base64
+import json
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from streaming.audio_frames import extract_audio_output
+
+# audioOutput típico de Nova Sonic: ~80 ms @ 24 kHz mono 16-bit
+CHUNK_PCM_BYTES = 3840
+
+
+def _audio_event() -> bytes:
+    content = base64.b64encode(os.urandom(CHUNK_PCM_BYTES)).decode("ascii")
+    return json.dumps({
+        "event": {
+            "audioOutput": {
+                "content": content,
+                "contentId": "c-1",
+                "promptName": "p-1",
+                "completionId": "x-1",
+            }
+        }
+    }, separators=(",", ":")).encode("utf-8")
+
+
+CONTROL_EVENTS = [
+    json.dumps({"event": {"contentStart": {"role": "ASSISTANT", "type": "AUDIO"}}}).encode("utf-8"),
+    json.dumps({"event": {"textOutput": {"role": "ASSISTANT", "content": "Hola, ¿en qué te ayudo?"}}}).encode("utf-8"),
+    json.dumps({"event": {"contentEnd": {"type": "AUDIO", "stopReason": "END_TURN"}}}).encode("utf-8"),
+    json.dumps({"event": {"usageEvent": {"totalInputTokens": 120, "totalOutputTokens": 80}}}).encode("utf-8"),
+]
+
+
+def _build_mix(events: int, audio_ratio: float) -> list:
+    rng = random.Random(7)
+    audio = [_audio_event() for _ in range(16)]
+    return [
+        rng.choice(audio) if rng.random() < audio_ratio else rng.choice(CONTROL_EVENTS)
+        for _ in range(events)
+    ]
+
+
+def _legacy(messages: list) -> int:
+    handled = 0
+    for raw in messages:
+        payload = json.loads(raw.decode("utf-8"))
+        event = payload.get("event") or {}
+        if "audioOutput" in event and event["audioOutput"].get("content"):
+            handled += 1
+    return handled
+
+
+def _routed(messages: list) -> int:
+    handled = 0
+    for raw in messages:
+        if extract_audio_output(raw) is not None:
+            handled += 1
+            continue
+        json.loads(raw)
+    return handled
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=200000)
+    parser.add_argument("--audio-ratio", type=float, default=0.9)
+    args = parser.parse_args()
+
+    messages = _build_mix(args.events, args.audio_ratio)
+    print(f"📦 {len(messages)} eventos ({args.audio_ratio:.0%} audioOutput)")
+
+    results = {}
+    for name, fn in (("json.loads", _legacy), ("router", _routed)):
+        start = time.process_time()
+        fn(messages)
+        elapsed = time.process_time() - start
+        results[name] = elapsed
+        rate = len(messages) / elapsed if elapsed else float("inf")
+        print(f"  {name:<12} {elapsed * 1000:8.1f} ms CPU  ·  {rate:,.0f} eventos/s por núcleo")
+
+    if results["router"]:
+        print(f"⚡ Speedup: {results['json.loads'] / results['router']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
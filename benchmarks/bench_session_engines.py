@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Benchmark: memoria y CPU por sesión de los dos motores de sesión.
+
+- full: BedrockStreamManager (processor de leads, Subject, monitor de silencio,
+  scheduler de salida, watchdog, usage ledger, ...).
+- lean: NovaSonicRealtimeSession (handshake, audio y texto FINAL).
+
+Cada sesión corre contra un stream en memoria (loopback) que acepta las
+escrituras y entrega una conversación guionada: por turno el micrófono sube
+``--mic-chunks`` chunks de 100 ms y el modelo responde con transcript, texto
+FINAL y ``--tts-chunks`` audioOutput. Así se mide solo el costo del motor,
+sin red ni credenciales. Requiere el SDK aws_sdk_bedrock_runtime instalado.
+
+Uso:
+    python benchmarks/bench_session_engines.py [--sessions 200] [--turns 5] [--prompt v8_minimal]
+"""
+import argparse
+import asyncio
+import base64
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from config.constants import get_prompt_config_path
+from context.bootstrap import load_context_settings, load_context_sources
+from streaming.engine import ENGINE_KINDS, create_session_engine
+
+# 100 ms de micrófono @ 16 kHz mono 16-bit y ~80 ms de TTS @ 24 kHz
+MIC_CHUNK = b"\x01\x00" * 1600
+TTS_B64 = base64.b64encode(b"\x00\x00" * 1920).decode("ascii")
+
+
+def _event(body: dict) -> bytes:
+    return json.dumps({"event": body}).encode("utf-8")
+
+
+def _turn_events(turn: int, tts_chunks: int) -> list:
+    final = json.dumps({"generationStage": "FINAL"})
+    events = [
+        _event({"contentStart": {"role": "USER", "type": "TEXT"}}),
+        _event({"textOutput": {"role": "USER", "content": f"Quisiera saber los horarios del curso {turn}"}}),
+        _event({"contentEnd": {"type": "TEXT", "stopReason": "END_TURN"}}),
+        _event({"contentStart": {"role": "ASSISTANT", "type": "TEXT", "additionalModelFields": final}}),
+        _event({"textOutput": {"role": "ASSISTANT", "content": "Claro, las clases son de lunes a viernes por la tarde."}}),
+        _event({"contentEnd": {"type": "TEXT", "stopReason": "END_TURN"}}),
+        _event({"contentStart": {"role": "ASSISTANT", "type": "AUDIO"}}),
+    ]
+    events += [_event({"audioOutput": {"content": TTS_B64}})] * tts_chunks
+    events.append(_event({"contentEnd": {"type": "AUDIO", "stopReason": "END_TURN"}}))
+    return events
+
+
+class _Message:
+    def __init__(self, data: bytes) -> None:
+        self.value = self
+        self.bytes_ = data
+
+
+class LoopbackStream:
+    """Stream bidireccional en memoria: cuenta las escrituras y entrega lo encolado."""
+
+    def __init__(self) -> None:
+        self.input_stream = self
+        self.writes = 0
+        self._inbound: asyncio.Queue = asyncio.Queue()
+
+    async def send(self, chunk) -> None:
+        self.writes += 1
+
+    async def close(self) -> None:
+        pass
+
+    async def await_output(self):
+        return None, self
+
+    async def receive(self) -> _Message:
+        return _Message(await self._inbound.get())
+
+    def push(self, events: list) -> None:
+        for data in events:
+            self._inbound.put_nowait(data)
+
+
+class LoopbackClient:
+    def __init__(self) -> None:
+        self.streams = []
+
+    async def invoke_model_with_bidirectional_stream(self, request) -> LoopbackStream:
+        stream = LoopbackStream()
+        self.streams.append(stream)
+        return stream
+
+
+def _new_engine(kind: str, sources, settings, client):
+    engine = create_session_engine(kind, context_sources=sources, region="us-east-1", voice_id="lupe", settings=settings)
+    # El cliente compartido se reemplaza por el loopback (mismo atributo que usa cada motor)
+    if kind == "full":
+        engine.bedrock_client = client
+    else:
+        engine._client = client
+    return engine
+
+
+async def _run_turn(engine, stream: LoopbackStream, turn: int, mic_chunks: int, tts_chunks: int) -> None:
+    for _ in range(mic_chunks):
+        engine.add_audio_chunk(MIC_CHUNK)
+        await asyncio.sleep(0)
+    stream.push(_turn_events(turn, tts_chunks))
+    received = 0
+    while received < tts_chunks:
+        await engine.audio_output_queue.get()
+        received += 1
+
+
+async def _bench(kind: str, args, sources, settings, *, trace_memory: bool) -> dict:
+    """Una corrida completa. Con ``trace_memory`` se mide memoria (tracemalloc
+    encarece cada asignación, así que la CPU se mide en otra corrida sin él)."""
+    client = LoopbackClient()
+    gc.collect()
+    if trace_memory:
+        tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0] if trace_memory else 0
+    cpu_start = time.process_time()
+
+    engines = [_new_engine(kind, sources, settings, client) for _ in range(args.sessions)]
+    await asyncio.gather(*(engine.initialize_stream(open_audio=True) for engine in engines))
+    cpu_open = time.process_time() - cpu_start
+
+    cpu_turns_start = time.process_time()
+    for turn in range(args.turns):
+        await asyncio.gather(*(
+            _run_turn(engine, stream, turn, args.mic_chunks, args.tts_chunks)
+            for engine, stream in zip(engines, client.streams)
+        ))
+    cpu_turns = time.process_time() - cpu_turns_start
+    live_bytes = peak_bytes = 0
+    if trace_memory:
+        # Memoria con todas las sesiones vivas tras la conversación
+        gc.collect()
+        live_bytes, peak_bytes = (value - baseline for value in tracemalloc.get_traced_memory())
+
+    cpu_close_start = time.process_time()
+    await asyncio.gather(*(engine.close() for engine in engines))
+    cpu_close = time.process_time() - cpu_close_start
+    if trace_memory:
+        tracemalloc.stop()
+
+    sessions = args.sessions
+    writes = sum(stream.writes for stream in client.streams)
+    return {
+        "kb_per_session": live_bytes / sessions / 1024,
+        "peak_kb_per_session": peak_bytes / sessions / 1024,
+        "open_ms": cpu_open * 1000 / sessions,
+        "turn_ms": cpu_turns * 1000 / (sessions * max(1, args.turns)),
+        "close_ms": cpu_close * 1000 / sessions,
+        "writes_per_session": writes / sessions,
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--turns", type=int, default=5)
+    parser.add_argument("--mic-chunks", type=int, default=30, help="chunks de 100 ms por turno de usuario")
+    parser.add_argument("--tts-chunks", type=int, default=40, help="audioOutput por respuesta")
+    parser.add_argument("--prompt", default="v8_minimal")
+    args = parser.parse_args()
+
+    config_path = get_prompt_config_path(args.prompt)
+    sources = load_context_sources(config_path)
+    settings = load_context_settings(config_path)
+    print(
+        f"🧪 {args.sessions} sesiones × {args.turns} turnos | prompt {args.prompt} | "
+        f"{args.mic_chunks} chunks de micrófono y {args.tts_chunks} de TTS por turno"
+    )
+    # Calentar caché de contexto e imports para no cargarlos al primer motor medido
+    warmup = argparse.Namespace(**{**vars(args), "sessions": 2, "turns": 1})
+    for kind in ENGINE_KINDS:
+        await _bench(kind, warmup, sources, settings, trace_memory=False)
+
+    results = {}
+    for kind in ENGINE_KINDS:
+        stats = await _bench(kind, args, sources, settings, trace_memory=False)
+        memory = await _bench(kind, args, sources, settings, trace_memory=True)
+        stats["kb_per_session"] = memory["kb_per_session"]
+        stats["peak_kb_per_session"] = memory["peak_kb_per_session"]
+        results[kind] = stats
+        print(
+            f"  {kind:<5} memoria {stats['kb_per_session']:7.1f} KB/sesión (pico {stats['peak_kb_per_session']:7.1f}) · "
+            f"CPU apertura {stats['open_ms']:6.2f} ms, turno {stats['turn_ms']:6.2f} ms, cierre {stats['close_ms']:5.2f} ms · "
+            f"{stats['writes_per_session']:.0f} escrituras/sesión"
+        )
+    full, lean = results["full"], results["lean"]
+    if lean["kb_per_session"] > 0 and lean["turn_ms"] > 0:
+        print(
+            f"⚡ lean: {full['kb_per_session'] / lean['kb_per_session']:.1f}x menos memoria, "
+            f"{full['turn_ms'] / lean['turn_ms']:.1f}x menos CPU por turno"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
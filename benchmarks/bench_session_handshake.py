@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Benchmark: inicio de llamada hasta el primer audio aceptado por Nova Sonic.
+
+- secuencial: comportamiento anterior; cada evento del handshake (sesión,
+  prompt, contexto) se escribe esperando el anterior, el contentStart de audio
+  va después y recién entonces sale el primer audioInput.
+- pipelined: ``initialize_stream(open_audio=True)``; lector primero, todo el
+  handshake y el contentStart de audio encolados en una sola ráfaga y el PCM
+  en cola desde antes de terminar el handshake.
+
+Ambos modos usan los mismos eventos (mismo prompt y contexto) y el cliente
+compartido ya calentado. Requiere credenciales AWS con acceso a Bedrock.
+
+Uso:
+    python benchmarks/bench_session_handshake.py [--calls 10] [--prompt v8_minimal]
+"""
+import argparse
+import asyncio
+import base64
+import json
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from aws_sdk_bedrock_runtime.client import InvokeModelWithBidirectionalStreamOperationInput
+from aws_sdk_bedrock_runtime.models import (
+    BidirectionalInputPayloadPart,
+    InvokeModelWithBidirectionalStreamInputChunk,
+)
+
+from config.constants import DEFAULT_AWS_REGION, get_prompt_config_path
+from context.bootstrap import load_context_sources
+from nova_sonic_es_sd import BedrockStreamManager
+from streaming.clients import get_shared_client
+
+# 100 ms de silencio @ 16 kHz mono 16-bit
+SILENCE_CHUNK = b"\x00\x00" * 1600
+
+
+async def _send(stream, data: bytes) -> None:
+    chunk = InvokeModelWithBidirectionalStreamInputChunk(value=BidirectionalInputPayloadPart(bytes_=data))
+    await stream.input_stream.send(chunk)
+
+
+async def _close(stream, prompt_name: str, content_name: str) -> None:
+    for event in (
+        {"event": {"contentEnd": {"promptName": prompt_name, "contentName": content_name}}},
+        {"event": {"promptEnd": {"promptName": prompt_name}}},
+        {"event": {"sessionEnd": {}}},
+    ):
+        await _send(stream, json.dumps(event).encode("utf-8"))
+    await stream.input_stream.close()
+
+
+async def _sequential_call(sources, region: str) -> float:
+    # El manager solo construye los eventos; el envío replica el flujo anterior
+    manager = BedrockStreamManager(context_sources=sources, region=region)
+    start = time.perf_counter()
+    request = InvokeModelWithBidirectionalStreamOperationInput(model_id=manager.model_id)
+    stream = await get_shared_client(region).invoke_model_with_bidirectional_stream(request)
+    for data in manager._handshake_events():
+        await _send(stream, data)
+    content_name = "audio-bench"
+    await _send(stream, json.dumps(manager._build_audio_content_start_event(content_name)).encode("utf-8"))
+    audio = {
+        "event": {
+            "audioInput": {
+                "promptName": manager.prompt_name,
+                "contentName": content_name,
+                "content": base64.b64encode(SILENCE_CHUNK).decode("ascii"),
+            }
+        }
+    }
+    await _send(stream, json.dumps(audio).encode("utf-8"))
+    elapsed = (time.perf_counter() - start) * 1000.0
+    await _close(stream, manager.prompt_name, content_name)
+    return elapsed
+
+
+async def _pipelined_call(sources, region: str) -> float:
+    manager = BedrockStreamManager(context_sources=sources, region=region)
+    init = asyncio.create_task(manager.initialize_stream(open_audio=True))
+    # El micrófono empieza a mandar apenas el stream está activo
+    while not manager.is_active and not init.done():
+        await asyncio.sleep(0.001)
+    manager.add_audio_chunk(SILENCE_CHUNK)
+    await init
+    while manager.get_stream_metrics()["first_audio_accepted_ms"] is None:
+        await asyncio.sleep(0.001)
+    elapsed = manager.get_stream_metrics()["first_audio_accepted_ms"]
+    await manager.close()
+    return elapsed
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--calls", type=int, default=10)
+    parser.add_argument("--prompt", default="v8_minimal")
+    parser.add_argument("--region", default=os.getenv("AWS_REGION", DEFAULT_AWS_REGION))
+    args = parser.parse_args()
+
+    sources = load_context_sources(get_prompt_config_path(args.prompt))
+    print(f"Llamadas por modo: {args.calls} | prompt: {args.prompt} | región: {args.region}")
+    # Calentar cliente y caché de contexto: la primera apertura paga el TLS
+    await _sequential_call(sources, args.region)
+    for kind, call in (("secuencial", _sequential_call), ("pipelined", _pipelined_call)):
+        samples = [await call(sources, args.region) for _ in range(args.calls)]
+        print(
+            f"{kind:10s} | primer audio aceptado: media {statistics.mean(samples):7.1f} ms, "
+            f"p50 {statistics.median(samples):7.1f} ms, máx {max(samples):7.1f} ms"
+        )
+    # Antes el adaptador descartaba el audio captado hasta tener la sesión lista
+    print("secuencial pierde el audio del micrófono previo a ese instante; pipelined lo retiene y lo envía")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
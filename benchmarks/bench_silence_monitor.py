@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Benchmark: despertares del event loop por sesión del monitor de silencios.
+
+Compara el monitor antiguo (polling cada 100 ms) con el DeadlineTimer actual:
+- Sesiones inactivas: cuántas veces despierta el loop por sesión y por segundo.
+- Sesiones con habla: jitter entre el plazo teórico de fin de turno y el disparo real.
+
+Uso:
+    python benchmarks/bench_silence_monitor.py [--sessions 200] [--seconds 3]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from streaming.timers import DeadlineTimer
+
+SILENCE_TIMEOUT = 0.8
+CHUNK_INTERVAL = 0.075  # ~2400 bytes @ 16 kHz
+
+
+class PollingMonitor:
+    """Réplica del _monitor_silence anterior (sleep de 100 ms en bucle)."""
+
+    def __init__(self) -> None:
+        self.active = True
+        self.wakeups = 0
+        self.last_chunk = None
+        self.turn_active = False
+        self.fired_at = []
+
+    def add_chunk(self) -> None:
+        self.last_chunk = asyncio.get_running_loop().time()
+        self.turn_active = True
+
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while self.active:
+            await asyncio.sleep(0.1)
+            self.wakeups += 1
+            if not self.turn_active or self.last_chunk is None:
+                continue
+            if loop.time() - self.last_chunk > SILENCE_TIMEOUT:
+                self.turn_active = False
+                self.fired_at.append(loop.time() - (self.last_chunk + SILENCE_TIMEOUT))
+                self.last_chunk = None
+
+
+class TimerMonitor:
+    """Mismo contrato usando DeadlineTimer (lo que hace BedrockStreamManager)."""
+
+    def __init__(self) -> None:
+        self.timer = DeadlineTimer(self._fire)
+        self.last_chunk = None
+        self.fired_at = []
+
+    @property
+    def wakeups(self) -> int:
+        return self.timer.wakeups
+
+    def add_chunk(self) -> None:
+        self.last_chunk = self.timer.time()
+        self.timer.reschedule_at(self.last_chunk + SILENCE_TIMEOUT)
+
+    def _fire(self) -> None:
+        self.fired_at.append(self.timer.time() - (self.last_chunk + SILENCE_TIMEOUT))
+
+
+async def _idle(kind: str, sessions: int, seconds: float) -> float:
+    if kind == "polling":
+        monitors = [PollingMonitor() for _ in range(sessions)]
+        tasks = [asyncio.create_task(m.run()) for m in monitors]
+        await asyncio.sleep(seconds)
+        for m in monitors:
+            m.active = False
+        await asyncio.gather(*tasks)
+    else:
+        monitors = [TimerMonitor() for _ in range(sessions)]
+        await asyncio.sleep(seconds)
+    return sum(m.wakeups for m in monitors) / sessions / seconds
+
+
+async def _speech(kind: str, sessions: int) -> list:
+    if kind == "polling":
+        monitors = [PollingMonitor() for _ in range(sessions)]
+        tasks = [asyncio.create_task(m.run()) for m in monitors]
+    else:
+        monitors = [TimerMonitor() for _ in range(sessions)]
+        tasks = []
+    # 1 s de "habla" con chunks cada 75 ms y luego silencio
+    for _ in range(int(1.0 / CHUNK_INTERVAL)):
+        for m in monitors:
+            m.add_chunk()
+        await asyncio.sleep(CHUNK_INTERVAL)
+    await asyncio.sleep(SILENCE_TIMEOUT + 0.3)
+    for m in monitors:
+        if hasattr(m, "active"):
+            m.active = False
+    await asyncio.gather(*tasks)
+    return [d * 1000.0 for m in monitors for d in m.fired_at]
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    args = parser.parse_args()
+
+    print(f"Sesiones: {args.sessions} | ventana inactiva: {args.seconds}s | timeout: {SILENCE_TIMEOUT}s")
+    for kind in ("polling", "timer"):
+        idle_rate = await _idle(kind, args.sessions, args.seconds)
+        jitter = await _speech(kind, args.sessions)
+        mean_jitter = statistics.mean(jitter) if jitter else float("nan")
+        max_jitter = max(jitter) if jitter else float("nan")
+        print(
+            f"{kind:8s} | despertares/sesión/s inactiva: {idle_rate:6.2f} | "
+            f"jitter fin de turno: media {mean_jitter:6.1f} ms, máx {max_jitter:6.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
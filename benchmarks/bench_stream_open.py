@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Benchmark: latencia de apertura de streams de Nova Sonic según qué se reutiliza.
+
+Como en producción, cada sesión corre en su propio hilo y event loop, y el
+cliente Bedrock es uno por región y loop (``streaming.clients``):
+
+- frío: sin nada cacheado (comportamiento anterior: endpoint, credenciales y
+  TLS nuevos en cada sesión).
+- sesión nueva: loop y cliente nuevos, credenciales cacheadas del worker.
+- reconexión: segunda apertura dentro de la misma sesión (reconexión o
+  rollover), sobre el cliente y las conexiones ya abiertas de su loop.
+
+Mide el tiempo hasta tener el stream abierto y el sessionStart enviado.
+Requiere credenciales AWS con acceso a Bedrock.
+
+Uso:
+    python benchmarks/bench_stream_open.py [--opens 10] [--region us-east-1]
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from aws_sdk_bedrock_runtime.client import InvokeModelWithBidirectionalStreamOperationInput
+from aws_sdk_bedrock_runtime.models import (
+    BidirectionalInputPayloadPart,
+    InvokeModelWithBidirectionalStreamInputChunk,
+)
+
+from config.constants import DEFAULT_AWS_REGION, NOVA_SONIC_MODEL_ID
+from streaming.clients import get_shared_client, reset_shared_clients
+
+SESSION_START = {
+    "event": {
+        "sessionStart": {
+            "inferenceConfiguration": {"maxTokens": 1024, "topP": 0.9, "temperature": 0.7}
+        }
+    }
+}
+SESSION_END = {"event": {"sessionEnd": {}}}
+
+
+async def _send(stream, payload: dict) -> None:
+    chunk = InvokeModelWithBidirectionalStreamInputChunk(
+        value=BidirectionalInputPayloadPart(bytes_=json.dumps(payload).encode("utf-8"))
+    )
+    await stream.input_stream.send(chunk)
+
+
+async def _open_once(region: str) -> float:
+    start = time.perf_counter()
+    client = get_shared_client(region)
+    request = InvokeModelWithBidirectionalStreamOperationInput(model_id=NOVA_SONIC_MODEL_ID)
+    stream = await client.invoke_model_with_bidirectional_stream(request)
+    await _send(stream, SESSION_START)
+    elapsed = (time.perf_counter() - start) * 1000.0
+    await _send(stream, SESSION_END)
+    await stream.input_stream.close()
+    return elapsed
+
+
+async def _session(region: str, opens: int) -> list:
+    """Una sesión: ``opens`` aperturas seguidas en el mismo loop."""
+    return [await _open_once(region) for _ in range(opens)]
+
+
+def _in_session_thread(region: str, opens: int) -> list:
+    """Corre una sesión en su propio hilo y loop, como el web adapter."""
+    result: list = []
+    errors: list = []
+
+    def runner() -> None:
+        try:
+            result.extend(asyncio.run(_session(region, opens)))
+        except Exception as exc:
+            errors.append(exc)
+
+    thread = threading.Thread(target=runner, daemon=True)
+    thread.start()
+    thread.join()
+    if errors:
+        raise errors[0]
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--opens", type=int, default=10)
+    parser.add_argument("--region", default=os.getenv("AWS_REGION", DEFAULT_AWS_REGION))
+    args = parser.parse_args()
+
+    print(f"Aperturas por modo: {args.opens} | región: {args.region}")
+    samples = {"frío": [], "sesión nueva": [], "reconexión": []}
+    for _ in range(args.opens):
+        reset_shared_clients()
+        samples["frío"].extend(_in_session_thread(args.region, 1))
+    reset_shared_clients()
+    _in_session_thread(args.region, 1)  # la primera sesión cachea las credenciales
+    for _ in range(args.opens):
+        samples["sesión nueva"].extend(_in_session_thread(args.region, 1))
+    samples["reconexión"] = _in_session_thread(args.region, args.opens + 1)[1:]
+    for kind, values in samples.items():
+        print(
+            f"{kind:12s} | apertura: media {statistics.mean(values):7.1f} ms, "
+            f"p50 {statistics.median(values):7.1f} ms, máx {max(values):7.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark: costo por chunk TTS del camino manager → adaptador → Socket.IO.
+
+Compara el camino anterior (b64decode en el manager + b64encode en el adaptador)
+con el passthrough actual (OutputAudioChunk reenvía el base64 original) con
+muchas sesiones hablando a la vez sobre un solo event loop.
+
+Uso:
+    python benchmarks/bench_tts_passthrough.py [--sessions 100] [--chunks 200]
+"""
+import argparse
+import asyncio
+import base64
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from streaming.audio_frames import OutputAudioChunk
+
+# audioOutput típico de Nova Sonic: ~80 ms @ 24 kHz mono 16-bit
+CHUNK_PCM_BYTES = 3840
+
+
+async def _session(kind: str, payload_b64: str, chunks: int, sink: list) -> None:
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def producer() -> None:
+        for _ in range(chunks):
+            if kind == "decode+encode":
+                await queue.put(base64.b64decode(payload_b64))
+            else:
+                await queue.put(OutputAudioChunk(payload_b64))
+            await asyncio.sleep(0)
+        await queue.put(None)
+
+    async def consumer() -> None:
+        while True:
+            item = await queue.get()
+            if item is None:
+                break
+            if kind == "decode+encode":
+                sink.append(len(base64.b64encode(item).decode("utf-8")))
+            else:
+                sink.append(len(item.b64))
+
+    await asyncio.gather(producer(), consumer())
+
+
+async def _run(kind: str, sessions: int, chunks: int) -> float:
+    payload_b64 = base64.b64encode(os.urandom(CHUNK_PCM_BYTES)).decode("ascii")
+    sink: list = []
+    start = time.process_time()
+    await asyncio.gather(*(_session(kind, payload_b64, chunks, sink) for _ in range(sessions)))
+    return time.process_time() - start
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--sessions", type=int, default=100)
+    parser.add_argument("--chunks", type=int, default=200)
+    args = parser.parse_args()
+
+    total = args.sessions * args.chunks
+    print(f"Sesiones: {args.sessions} | chunks por sesión: {args.chunks} | chunk PCM: {CHUNK_PCM_BYTES} bytes")
+    for kind in ("decode+encode", "passthrough"):
+        cpu = await _run(kind, args.sessions, args.chunks)
+        print(f"{kind:14s} | CPU total {cpu * 1000:8.1f} ms | por chunk {cpu / total * 1e6:6.2f} µs")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -15,21 +15,62 @@ from .constants import (
     WEBM_INIT_TIMEOUT_SECONDS,
     DECODER_MAX_BUFFER_BYTES,
     AUDIO_INPUT_QUEUE_MAX_SIZE,
+    AUDIO_COALESCE_MAX_MS,
+    AUDIO_PACING_MODE,
+    AUDIO_PACING_LOOKAHEAD_MS,
+    STREAM_POOL_SIZE,
+    STREAM_POOL_PROMPTS,
+    STREAM_POOL_VOICES,
+    STREAM_POOL_MAX_IDLE_SECONDS,
+    SESSION_ENGINE,
+    STARTUP_AUDIO_BUFFER_MS,
+    RECONNECT_AUDIO_BUFFER_MS,
+    STALL_RESPONSE_TIMEOUT_SECONDS,
+    STALL_UPLINK_TIMEOUT_SECONDS,
+    RETRY_BUDGET_TOKENS,
+    RETRY_BUDGET_REFILL_PER_SECOND,
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_WINDOW_SECONDS,
+    CIRCUIT_OPEN_SECONDS,
+    RECONNECT_TRANSCRIPT_TURNS,
+    STREAM_ROLLOVER_SECONDS,
+    PROMPT_SWITCH_MODE,
+    DOWNLINK_CODEC,
+    DOWNLINK_OPUS_BITRATE,
+    DOWNLINK_OPUS_FRAME_MS,
     SILENCE_TIMEOUT_DEFAULT,
     SILENCE_TIMEOUT_FAST,
     TOKEN_COST_INPUT,
     TOKEN_COST_OUTPUT,
+    TOKEN_COST_SPEECH_INPUT,
+    TOKEN_COST_SPEECH_OUTPUT,
+    SPEECH_TOKENS_PER_SECOND,
+    SESSION_BUDGET_USD,
+    SESSION_BUDGET_TOKENS,
+    SESSION_BUDGET_WARN_RATIO,
+    SESSION_BUDGET_ACTION,
+    SESSION_BUDGET_FALLBACK_PROMPT,
+    INJECTION_WINDOW_MS,
     DNI_LENGTH,
     PHONE_LENGTH,
+    TOOL_TIMEOUT_SECONDS,
+    TOOL_EXECUTOR_WORKERS,
     LEADS_EXPORT_FOLDER,
     DEFAULT_AWS_REGION,
+    BEDROCK_REGIONS,
+    REGION_LATENCY_ALPHA,
+    REGION_PROBE_SECONDS,
     NOVA_SONIC_MODEL_ID,
+    INFERENCE_MAX_TOKENS,
+    INFERENCE_TOP_P,
+    INFERENCE_TEMPERATURE,
     DEBUG_MODE,
     DIAGNOSTICS_MODE,
     MAX_DEBUG_MESSAGES,
     get_voice_id,
     get_prompt_config_path,
     calculate_token_cost,
+    calculate_usage_cost,
     mask_pii,
 )
 
@@ -48,20 +89,61 @@ __all__ = [
     'WEBM_INIT_TIMEOUT_SECONDS',
     'DECODER_MAX_BUFFER_BYTES',
     'AUDIO_INPUT_QUEUE_MAX_SIZE',
+    'AUDIO_COALESCE_MAX_MS',
+    'AUDIO_PACING_MODE',
+    'AUDIO_PACING_LOOKAHEAD_MS',
+    'STREAM_POOL_SIZE',
+    'STREAM_POOL_PROMPTS',
+    'STREAM_POOL_VOICES',
+    'STREAM_POOL_MAX_IDLE_SECONDS',
+    'SESSION_ENGINE',
+    'STARTUP_AUDIO_BUFFER_MS',
+    'RECONNECT_AUDIO_BUFFER_MS',
+    'STALL_RESPONSE_TIMEOUT_SECONDS',
+    'STALL_UPLINK_TIMEOUT_SECONDS',
+    'RETRY_BUDGET_TOKENS',
+    'RETRY_BUDGET_REFILL_PER_SECOND',
+    'CIRCUIT_FAILURE_THRESHOLD',
+    'CIRCUIT_WINDOW_SECONDS',
+    'CIRCUIT_OPEN_SECONDS',
+    'RECONNECT_TRANSCRIPT_TURNS',
+    'STREAM_ROLLOVER_SECONDS',
+    'PROMPT_SWITCH_MODE',
+    'DOWNLINK_CODEC',
+    'DOWNLINK_OPUS_BITRATE',
+    'DOWNLINK_OPUS_FRAME_MS',
     'SILENCE_TIMEOUT_DEFAULT',
     'SILENCE_TIMEOUT_FAST',
     'TOKEN_COST_INPUT',
     'TOKEN_COST_OUTPUT',
+    'TOKEN_COST_SPEECH_INPUT',
+    'TOKEN_COST_SPEECH_OUTPUT',
+    'SPEECH_TOKENS_PER_SECOND',
+    'SESSION_BUDGET_USD',
+    'SESSION_BUDGET_TOKENS',
+    'SESSION_BUDGET_WARN_RATIO',
+    'SESSION_BUDGET_ACTION',
+    'SESSION_BUDGET_FALLBACK_PROMPT',
+    'INJECTION_WINDOW_MS',
     'DNI_LENGTH',
     'PHONE_LENGTH',
+    'TOOL_TIMEOUT_SECONDS',
+    'TOOL_EXECUTOR_WORKERS',
     'LEADS_EXPORT_FOLDER',
     'DEFAULT_AWS_REGION',
+    'BEDROCK_REGIONS',
+    'REGION_LATENCY_ALPHA',
+    'REGION_PROBE_SECONDS',
     'NOVA_SONIC_MODEL_ID',
+    'INFERENCE_MAX_TOKENS',
+    'INFERENCE_TOP_P',
+    'INFERENCE_TEMPERATURE',
     'DEBUG_MODE',
     'DIAGNOSTICS_MODE',
     'MAX_DEBUG_MESSAGES',
     'get_voice_id',
     'get_prompt_config_path',
     'calculate_token_cost',
+    'calculate_usage_cost',
     'mask_pii',
 ]
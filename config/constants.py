@@ -49,6 +49,59 @@ DECODER_MAX_BUFFER_BYTES = 4 * 1024 * 1024  # 4MB límite seguridad
 # Queue backpressure
 AUDIO_INPUT_QUEUE_MAX_SIZE = 50  # ~5 segundos @ 100ms chunks
 
+# Coalescing del uplink: cuando hay backlog en la cola se fusionan chunks
+# en un único audioInput de hasta esta duración (0 = desactivado)
+AUDIO_COALESCE_MAX_MS = int(os.getenv('NOVA_SONIC_AUDIO_COALESCE_MAX_MS', '300'))
+
+# Pacing del uplink: off | realtime | burst (override por prompt con 'audio_pacing' en el YAML)
+AUDIO_PACING_MODE = os.getenv('NOVA_SONIC_AUDIO_PACING_MODE', 'off').lower()
+AUDIO_PACING_LOOKAHEAD_MS = int(os.getenv('NOVA_SONIC_AUDIO_PACING_LOOKAHEAD_MS', '500'))
+
+# ==================== Pool de streams pre-calentados ====================
+# Streams de Nova Sonic ya cebados (sesión + prompt + contexto) por (prompt, voz)
+STREAM_POOL_SIZE = int(os.getenv('NOVA_SONIC_POOL_SIZE', '0'))  # por clave; 0 = desactivado
+STREAM_POOL_PROMPTS = [p.strip() for p in os.getenv('NOVA_SONIC_POOL_PROMPTS', 'v8_minimal').split(',') if p.strip()]
+STREAM_POOL_VOICES = [v.strip() for v in os.getenv('NOVA_SONIC_POOL_VOICES', 'lupe').split(',') if v.strip()]
+# Debe quedar por debajo del límite de inactividad del stream en el servidor
+STREAM_POOL_MAX_IDLE_SECONDS = float(os.getenv('NOVA_SONIC_POOL_MAX_IDLE_S', '30'))
+# Motor de sesión por defecto: full (BedrockStreamManager) | lean (NovaSonicRealtimeSession,
+# sin heurísticas de captura de leads); override por prompt con 'engine' en el YAML
+SESSION_ENGINE = os.getenv('NOVA_SONIC_ENGINE', 'full').lower()
+# Audio del micrófono retenido mientras se abre el stream (el navegador graba desde el clic)
+STARTUP_AUDIO_BUFFER_MS = int(os.getenv('NOVA_SONIC_STARTUP_BUFFER_MS', '3000'))
+
+# ==================== Reconexión ====================
+# Audio del usuario retenido mientras se reabre el stream (se reenvía al reconectar)
+RECONNECT_AUDIO_BUFFER_MS = int(os.getenv('NOVA_SONIC_RECONNECT_BUFFER_MS', '5000'))
+# Turnos recientes del transcript que se re-inyectan como historial al reconectar
+RECONNECT_TRANSCRIPT_TURNS = int(os.getenv('NOVA_SONIC_RECONNECT_TRANSCRIPT_TURNS', '8'))
+# Rollover proactivo: Nova Sonic corta la conexión a los ~8 min; pasado este tiempo
+# se abre un stream de reemplazo en la siguiente pausa del asistente (0 = desactivado)
+STREAM_ROLLOVER_SECONDS = float(os.getenv('NOVA_SONIC_ROLLOVER_S', '420'))
+# Cambio de prompt en una llamada en curso: in_stream (promptEnd + promptStart nuevo
+# en el mismo stream) | rollover (stream nuevo). Si el perfil de inferencia cambia
+# siempre se rota el stream: la inferenceConfiguration viaja en sessionStart
+PROMPT_SWITCH_MODE = os.getenv('NOVA_SONIC_PROMPT_SWITCH_MODE', 'in_stream').lower()
+# Watchdog de lectura: un stream medio abierto no lanza error, solo deja de entregar
+# eventos. Se reconecta si no llega nada tras el fin de turno del usuario o un
+# toolResult (respuesta), o mientras se sube audio (uplink). 0 = desactivado
+STALL_RESPONSE_TIMEOUT_SECONDS = float(os.getenv('NOVA_SONIC_STALL_RESPONSE_S', '8'))
+STALL_UPLINK_TIMEOUT_SECONDS = float(os.getenv('NOVA_SONIC_STALL_UPLINK_S', '10'))
+# Coordinador de reintentos por región del worker: presupuesto de reintentos
+# (token bucket; un reintento por throttling cuesta 2) y circuit breaker que
+# rechaza llamadas nuevas tras N fallas del servicio en la ventana (0 = sin breaker)
+RETRY_BUDGET_TOKENS = float(os.getenv('NOVA_SONIC_RETRY_BUDGET', '20'))
+RETRY_BUDGET_REFILL_PER_SECOND = float(os.getenv('NOVA_SONIC_RETRY_REFILL_PER_S', '0.5'))
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv('NOVA_SONIC_CIRCUIT_FAILURES', '8'))
+CIRCUIT_WINDOW_SECONDS = float(os.getenv('NOVA_SONIC_CIRCUIT_WINDOW_S', '30'))
+CIRCUIT_OPEN_SECONDS = float(os.getenv('NOVA_SONIC_CIRCUIT_OPEN_S', '15'))
+
+# ==================== Downlink de TTS ====================
+# pcm | opus (Opus requiere opuslib/libopus en el servidor y WebCodecs en el navegador)
+DOWNLINK_CODEC = os.getenv('NOVA_SONIC_DOWNLINK_CODEC', 'pcm').lower()
+DOWNLINK_OPUS_BITRATE = int(os.getenv('NOVA_SONIC_DOWNLINK_OPUS_BITRATE', '32000'))
+DOWNLINK_OPUS_FRAME_MS = 20
+
 # ==================== VAD y Silencios ====================
 # Timeout de silencio para detectar fin de turno automático
 SILENCE_TIMEOUT_DEFAULT = float(os.getenv('NOVA_SONIC_SILENCE_TIMEOUT_DEFAULT', '0.8'))  # 800ms
@@ -62,18 +115,53 @@ SILENCE_MAX_CHUNKS = int(os.getenv('NOVA_SONIC_SILENCE_WINDOW', '20'))
 # Nova Sonic v1:0 pricing (USD por 1K tokens)
 TOKEN_COST_INPUT = 0.0006   # $0.0006 per 1K input tokens
 TOKEN_COST_OUTPUT = 0.0024  # $0.0024 per 1K output tokens
+# Tarifas de tokens de voz (por defecto iguales a las de texto; ajustar a la tarifa vigente)
+TOKEN_COST_SPEECH_INPUT = float(os.getenv('NOVA_SONIC_COST_SPEECH_INPUT', str(TOKEN_COST_INPUT)))
+TOKEN_COST_SPEECH_OUTPUT = float(os.getenv('NOVA_SONIC_COST_SPEECH_OUTPUT', str(TOKEN_COST_OUTPUT)))
+# Estimación de tokens de voz por segundo de audio mientras llega el usageEvent
+SPEECH_TOKENS_PER_SECOND = float(os.getenv('NOVA_SONIC_SPEECH_TOKENS_PER_S', '25'))
+
+# Presupuesto por sesión (0 = sin límite); override por prompt con 'budget' en el YAML
+SESSION_BUDGET_USD = float(os.getenv('NOVA_SONIC_BUDGET_USD', '0'))
+SESSION_BUDGET_TOKENS = int(os.getenv('NOVA_SONIC_BUDGET_TOKENS', '0'))
+SESSION_BUDGET_WARN_RATIO = float(os.getenv('NOVA_SONIC_BUDGET_WARN_RATIO', '0.8'))
+# Acción al agotarlo: wrap_up (cerrar la llamada) | switch_prompt (prompt más barato) | none
+SESSION_BUDGET_ACTION = os.getenv('NOVA_SONIC_BUDGET_ACTION', 'wrap_up').lower()
+SESSION_BUDGET_FALLBACK_PROMPT = os.getenv('NOVA_SONIC_BUDGET_FALLBACK_PROMPT', 'v8_minimal')
+
+# Ventana en la que las instrucciones de coach/sistema pendientes se fusionan en un
+# solo bloque de texto antes de inyectarse (0 = enviar en la siguiente vuelta del loop)
+INJECTION_WINDOW_MS = int(os.getenv('NOVA_SONIC_INJECTION_WINDOW_MS', '300'))
 
 # ==================== Tool Use y Validación ====================
 # Longitudes esperadas para campos
 DNI_LENGTH = 8              # Perú
 PHONE_LENGTH = 9            # Perú (celular)
 
+# Plazo por defecto de un tool call (s); se puede ajustar por herramienta
+TOOL_TIMEOUT_SECONDS = float(os.getenv('NOVA_SONIC_TOOL_TIMEOUT_S', '8.0'))
+# Hilos del pool compartido para handlers de tools síncronos
+TOOL_EXECUTOR_WORKERS = int(os.getenv('NOVA_SONIC_TOOL_WORKERS', '4'))
+
 # Carpeta de exportación de leads
 LEADS_EXPORT_FOLDER = 'leads'
 
 # ==================== AWS Configuration ====================
 DEFAULT_AWS_REGION = 'us-east-1'
+# Regiones de Bedrock candidatas en orden de preferencia (vacío = solo AWS_REGION).
+# Cada sesión nueva va a la de menor latencia medida cuyo circuito admita
+# llamadas (ver streaming/regions.py)
+BEDROCK_REGIONS = [r.strip() for r in os.getenv('NOVA_SONIC_REGIONS', '').split(',') if r.strip()]
+# Peso de cada muestra nueva en el promedio móvil de latencia por región
+REGION_LATENCY_ALPHA = float(os.getenv('NOVA_SONIC_REGION_LATENCY_ALPHA', '0.3'))
+# Una región sin muestras en este plazo recibe una sesión para re-medirla (0 = nunca)
+REGION_PROBE_SECONDS = float(os.getenv('NOVA_SONIC_REGION_PROBE_S', '300'))
 NOVA_SONIC_MODEL_ID = 'amazon.nova-sonic-v1:0'
+# inferenceConfiguration por defecto del sessionStart; override por prompt con
+# 'inference' en el YAML (ver streaming/inference.py)
+INFERENCE_MAX_TOKENS = int(os.getenv('NOVA_SONIC_MAX_TOKENS', '1024'))
+INFERENCE_TOP_P = float(os.getenv('NOVA_SONIC_TOP_P', '0.9'))
+INFERENCE_TEMPERATURE = float(os.getenv('NOVA_SONIC_TEMPERATURE', '0.7'))
 
 # ==================== Debug y Logging ====================
 DEBUG_MODE = os.getenv('NOVA_SONIC_DEBUG', 'false').lower() in {'1', 'true', 'yes', 'y'}
@@ -97,6 +185,21 @@ def calculate_token_cost(input_tokens: int, output_tokens: int) -> float:
     output_cost = (float(output_tokens) / 1000.0) * TOKEN_COST_OUTPUT
     return round(float(input_cost + output_cost), 6)
 
+def calculate_usage_cost(
+    speech_input: int,
+    text_input: int,
+    speech_output: int,
+    text_output: int,
+) -> float:
+    """Costo estimado en USD con tarifas separadas para tokens de voz y de texto."""
+    cost = (
+        (float(speech_input) / 1000.0) * TOKEN_COST_SPEECH_INPUT
+        + (float(text_input) / 1000.0) * TOKEN_COST_INPUT
+        + (float(speech_output) / 1000.0) * TOKEN_COST_SPEECH_OUTPUT
+        + (float(text_output) / 1000.0) * TOKEN_COST_OUTPUT
+    )
+    return round(cost, 6)
+
 def mask_pii(value: str, mask_char: str = '*', show_last: int = 2) -> str:
     """Enmascara datos sensibles mostrando solo últimos N caracteres."""
     if not value or len(value) <= show_last:
@@ -1,6 +1,6 @@
 # context/base.py
 from abc import ABC, abstractmethod
-from typing import Literal
+from typing import Hashable, Literal, Optional
 
 Role = Literal["SYSTEM", "USER"]
 
@@ -12,3 +12,7 @@ class ContextSource(ABC):
     def render(self) -> str:
         """Devuelve el texto final a inyectar (ya procesado)."""
         ...
+
+    def cache_key(self) -> Optional[Hashable]:
+        """Identidad del contenido renderizado; None si no se puede cachear."""
+        return None
@@ -28,6 +28,11 @@ def _load_config(path: str) -> Dict[str, Any]:
         return yaml.safe_load(raw) or {}
     return json.loads(raw or "{}")
 
+def load_context_settings(config_path: str) -> Dict[str, Any]:
+    """Devuelve las secciones del config distintas de 'sources' (p. ej. audio_pacing)."""
+    cfg = _load_config(config_path)
+    return {k: v for k, v in cfg.items() if k != "sources"}
+
 def load_context_sources(config_path: str) -> List[ContextSource]:
     cfg = _load_config(config_path)
     items = cfg.get("sources", [])
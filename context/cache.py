@@ -0,0 +1,177 @@
+# context/cache.py
+"""
+Caché de contexto renderizado y sus eventos ya serializados.
+
+La clave se arma con el ``cache_key()`` de cada ContextSource (ruta, mtime,
+tamaño y vars), así que editar un prompt o la KB invalida la entrada sin
+reiniciar el proceso. Los eventos se guardan como bytes JSON con un marcador
+en ``promptName`` que se sustituye por el de cada sesión al enviar.
+"""
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+
+from .base import ContextSource
+
+PROMPT_NAME_PLACEHOLDER = "__NOVA_PROMPT_NAME__"
+_PLACEHOLDER_BYTES = PROMPT_NAME_PLACEHOLDER.encode("utf-8")
+
+
+@dataclass
+class ContextBlock:
+    """Un bloque contentStart/textInput.../contentEnd listo para enviar."""
+    role: str
+    content_name: str
+    events: List[bytes]
+    fragment_lengths: List[int]
+    combined: bool = False
+
+
+@dataclass
+class RenderedContext:
+    blocks: List[ContextBlock] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
+
+    def events_for(self, prompt_name: str) -> List[Tuple[ContextBlock, List[bytes]]]:
+        name = prompt_name.encode("utf-8")
+        return [(b, [e.replace(_PLACEHOLDER_BYTES, name) for e in b.events]) for b in self.blocks]
+
+
+def _serialize(payload: Dict[str, Any]) -> bytes:
+    return json.dumps(payload).encode("utf-8")
+
+
+def _text_block_events(role: str, content_name: str, fragments: Sequence[str]) -> List[bytes]:
+    events = [_serialize({
+        "event": {
+            "contentStart": {
+                "promptName": PROMPT_NAME_PLACEHOLDER,
+                "contentName": content_name,
+                "role": role,
+                "type": "TEXT",
+                "interactive": False,
+                "textInputConfiguration": {"mediaType": "text/plain"},
+            }
+        }
+    })]
+    for fragment in fragments:
+        events.append(_serialize({
+            "event": {
+                "textInput": {
+                    "promptName": PROMPT_NAME_PLACEHOLDER,
+                    "contentName": content_name,
+                    "content": fragment,
+                }
+            }
+        }))
+    events.append(_serialize({
+        "event": {
+            "contentEnd": {
+                "promptName": PROMPT_NAME_PLACEHOLDER,
+                "contentName": content_name,
+            }
+        }
+    }))
+    return events
+
+
+def render_context(sources: Sequence[ContextSource]) -> RenderedContext:
+    """Renderiza y agrupa por rol (SYSTEM múltiple → un solo bloque combinado)."""
+    result = RenderedContext()
+    grouped: Dict[str, List[str]] = {}
+    for src in sources:
+        role = getattr(src, "role", "SYSTEM") or "SYSTEM"
+        try:
+            rendered = src.render()
+        except Exception as exc:
+            result.errors.append(str(exc))
+            continue
+        text = (rendered or "").strip()
+        if text:
+            grouped.setdefault(role.upper(), []).append(text)
+
+    for role, fragments in grouped.items():
+        digest = hashlib.sha1("\x00".join(fragments).encode("utf-8")).hexdigest()[:12]
+        if role == "SYSTEM" and len(fragments) > 1:
+            result.blocks.append(ContextBlock(
+                role=role,
+                content_name=f"ctx-{digest}",
+                events=_text_block_events(role, f"ctx-{digest}", fragments),
+                fragment_lengths=[len(f) for f in fragments],
+                combined=True,
+            ))
+            continue
+        for idx, fragment in enumerate(fragments):
+            result.blocks.append(ContextBlock(
+                role=role,
+                content_name=f"ctx-{digest}-{idx}",
+                events=_text_block_events(role, f"ctx-{digest}-{idx}", [fragment]),
+                fragment_lengths=[len(fragment)],
+            ))
+    return result
+
+
+class RenderedContextCache:
+    """LRU acotada y thread-safe (cada sesión corre en su propio loop/hilo)."""
+
+    def __init__(self, max_entries: int = 32) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, RenderedContext]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key_for(sources: Sequence[ContextSource]) -> Optional[Hashable]:
+        keys = []
+        for src in sources:
+            key = src.cache_key()
+            if key is None:
+                return None
+            keys.append(key)
+        return tuple(keys)
+
+    def get(self, sources: Sequence[ContextSource]) -> RenderedContext:
+        key = self.key_for(sources)
+        if key is not None:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry
+        # Render fuera del lock: lee disco
+        entry = render_context(sources)
+        with self._lock:
+            self.misses += 1
+            # Con errores no se cachea: el próximo intento vuelve a leer
+            if key is not None and not entry.errors:
+                self._entries[key] = entry
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return entry
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+                "hit_rate": round(self.hits / total, 3) if total else 0.0,
+            }
+
+
+_shared_cache = RenderedContextCache()
+
+
+def get_context_cache() -> RenderedContextCache:
+    return _shared_cache
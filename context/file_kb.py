@@ -1,7 +1,8 @@
 # context/file_kb.py
+import os
 from pathlib import Path
 import json
-from typing import Any, Dict
+from typing import Any, Dict, Hashable, Optional
 from .base import ContextSource
 
 try:
@@ -77,3 +78,10 @@ class FileKBSource(ContextSource):
         if not body:
             return ""
         return f"##REFERENCE_DOCS##\n{body}\n##END_REFERENCE_DOCS##".strip()
+
+    def cache_key(self) -> Optional[Hashable]:
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return ("file_kb", self.role, os.path.abspath(self.path), st.st_mtime_ns, st.st_size)
@@ -1,7 +1,8 @@
 # context/file_prompt.py
+import os
 from pathlib import Path
 import re
-from typing import Dict
+from typing import Dict, Hashable, Optional
 from .base import ContextSource
 
 _PLACEHOLDER_RE = re.compile(r"\{\{([A-Z0-9_]+)\}\}")
@@ -25,3 +26,11 @@ class FilePromptSource(ContextSource):
             raise FileNotFoundError(f"Prompt file no existe: {self.path}")
         raw = p.read_text(encoding="utf-8")
         return _apply_vars(raw, self.vars)
+
+    def cache_key(self) -> Optional[Hashable]:
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return ("file_prompt", self.role, os.path.abspath(self.path), st.st_mtime_ns, st.st_size,
+                tuple(sorted((k, str(v)) for k, v in self.vars.items())))
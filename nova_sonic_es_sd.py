@@ -9,8 +9,9 @@ import json
 import time
 import uuid
 import os
+from collections import deque
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Deque, Dict, List, Optional, Set, Tuple
 
 try:
     # Prefer the modern namespace exposed by reactivex>=4
@@ -31,8 +32,6 @@ try:
         BidirectionalInputPayloadPart,
         InvokeModelWithBidirectionalStreamInputChunk
     )
-    from aws_sdk_bedrock_runtime.config import Config
-    from smithy_aws_core.identity.environment import EnvironmentCredentialsResolver
 except ImportError as e:
     raise ImportError(
         f"AWS SDK not installed: {e}. "
@@ -40,24 +39,74 @@ except ImportError as e:
     )
 
 from processors.base import DataProcessor
+from processors.tool_handlers import GUARDAR_LEAD_DESCRIPTION, GUARDAR_LEAD_SCHEMA
+from processors.tool_registry import ToolRegistry, ToolResultCache
 from processors.tool_use_processor import ToolUseProcessor
 
+from streaming.audio_frames import OutputAudioChunk, extract_audio_output
+from streaming.clients import get_shared_client, refresh_credentials
+from streaming.engine import ENGINE_FULL, SessionEngine
+from streaming.inference import InferenceProfile, get_inference_stats
+from streaming.injection import InjectionQueue
+from streaming.outbound import OutboundScheduler, SendPriority
+from streaming.pacing import AudioPacer
+from streaming.regions import get_region_selector
+from streaming.retry import CircuitOpenError, ErrorKind, classify_error, get_retry_coordinator
+from streaming.timers import DeadlineTimer
+from streaming.tool_runner import run_tool_call, tool_timeout_result
+from streaming.usage import SessionBudget, UsageLedger
+
 from context.bootstrap import load_context_sources
+from context.cache import get_context_cache
 from context.base import ContextSource
 from context.file_prompt import FilePromptSource
 from context.file_kb import FileKBSource
 
-from config.constants import TOKEN_COST_INPUT, TOKEN_COST_OUTPUT, calculate_token_cost
+from config.constants import (
+    AUDIO_COALESCE_MAX_MS,
+    AUDIO_PACING_LOOKAHEAD_MS,
+    AUDIO_PACING_MODE,
+    INJECTION_WINDOW_MS,
+    PROMPT_SWITCH_MODE,
+    STREAM_ROLLOVER_SECONDS,
+    RECONNECT_AUDIO_BUFFER_MS,
+    RECONNECT_TRANSCRIPT_TURNS,
+    SILENCE_PEAK_THRESHOLD,
+    STALL_RESPONSE_TIMEOUT_SECONDS,
+    STALL_UPLINK_TIMEOUT_SECONDS,
+    TOOL_TIMEOUT_SECONDS,
+)
 
 INPUT_SAMPLE_RATE = 16000
 OUTPUT_SAMPLE_RATE = 24000
 CHANNELS = 1
 PCM_SAMPLE_WIDTH = 2  # 16-bit PCM
+_INPUT_BYTES_PER_SECOND = INPUT_SAMPLE_RATE * CHANNELS * PCM_SAMPLE_WIDTH
+_OUTPUT_BYTES_PER_SECOND = OUTPUT_SAMPLE_RATE * CHANNELS * PCM_SAMPLE_WIDTH
 DEBUG = os.getenv("NOVA_SONIC_DEBUG", "false").lower() in {"1", "true", "yes", "y"}
 
-# Configuración de reintentos
+# Reintentos por sesión; la demora (backoff con jitter) y el presupuesto compartido
+# los decide el coordinador del worker (streaming/retry.py)
 MAX_RETRY_ATTEMPTS = 3
-RETRY_DELAYS = [1.0, 2.0, 4.0]  # Backoff exponencial en segundos
+# Largo máximo por turno del historial re-inyectado al reconectar
+TRANSCRIPT_TURN_MAX_CHARS = 400
+# Segmentos SPECULATIVE pendientes de reconciliar con su FINAL
+SPECULATIVE_MAX_PENDING = 8
+# Espera antes de reintentar un rollover de stream fallido
+ROLLOVER_RETRY_SECONDS = 20.0
+# Tras un cambio de prompt en el mismo stream, un error del servidor en esta ventana
+# se atribuye al cambio y se resuelve reconectando (nunca como error fatal)
+PROMPT_SWITCH_PROBATION_SECONDS = 2.0
+# El uplink cuenta como activo si hubo voz del usuario en esta ventana
+STALL_UPLINK_ACTIVE_SECONDS = 2.0
+# Tipos de stall del watchdog de lectura
+STALL_KINDS = ("response", "uplink")
+# Reconexiones por stall seguidas sin ningún evento entre medio antes de pausar el watchdog
+STALL_MAX_CONSECUTIVE_RECOVERIES = 2
+
+
+class StreamStallError(RuntimeError):
+    """El stream dejó de entregar eventos sin lanzar error (conexión medio abierta)."""
 
 
 def debug_print(message: str) -> None:
@@ -65,34 +114,6 @@ def debug_print(message: str) -> None:
         print(f"[nova-sonic] {message}")
 
 
-def is_transient_error(error: Exception) -> bool:
-    """
-    Determina si un error es transitorio y puede ser reintentado.
-    
-    Args:
-        error: La excepción capturada
-        
-    Returns:
-        True si el error es retryable, False si es permanente
-    """
-    error_str = str(error).lower()
-    
-    # Errores transitorios comunes de AWS Bedrock
-    transient_patterns = [
-        "unexpected error",
-        "try your request again",
-        "throttl",
-        "timeout",
-        "temporarily unavailable",
-        "service unavailable",
-        "internal error",
-        "rate exceeded",
-        "too many requests"
-    ]
-    
-    return any(pattern in error_str for pattern in transient_patterns)
-
-
 def discover_context_sources(
     context_config: Optional[str] = None,
     explicit_prompt: Optional[str] = None,
@@ -137,6 +158,28 @@ def discover_context_sources(
     return sources
 
 
+def _pcm_peak(audio_bytes: bytes) -> int:
+    """Pico aproximado de un chunk PCM 16-bit (muestrea 1 de cada 4 muestras)."""
+    usable = len(audio_bytes) - (len(audio_bytes) % PCM_SAMPLE_WIDTH)
+    if not usable:
+        return 0
+    samples = memoryview(audio_bytes)[:usable].cast("h")[::4]
+    return max(max(samples), -min(samples))
+
+
+def _text_diff(old: str, new: str) -> Tuple[int, str]:
+    """Diff mínimo para la UI: cuántas unidades UTF-16 conservar de ``old`` y qué agregar.
+
+    El navegador indexa strings en UTF-16, por eso ``keep`` no se cuenta en code points.
+    """
+    prefix = 0
+    limit = min(len(old), len(new))
+    while prefix < limit and old[prefix] == new[prefix]:
+        prefix += 1
+    keep = len(old[:prefix].encode("utf-16-le")) // 2
+    return keep, new[prefix:]
+
+
 class NovaAgent:
     """Preserved for legacy callers."""
 
@@ -153,89 +196,19 @@ class NovaAgent:
         raise NotImplementedError("NovaAgent no expone procesamiento directo en esta versión.")
 
 
-def _parse_usage_metrics(metrics: Dict[str, Any], session_totals: Dict[str, int]) -> Optional[Dict[str, Any]]:
-    """
-    Función centralizada para parsear métricas de uso (performanceMetrics o usageEvent).
-    
-    Args:
-        metrics: Diccionario con métricas del evento
-        session_totals: Dict mutable con 'input' y 'output' para acumular tokens
-    
-    Returns:
-        Dict con payload de uso formateado, o None si no se puede parsear
-    """
-    # Intentar extraer contadores de manera flexible
-    input_tokens = (
-        metrics.get("inputTokenCount")
-        or metrics.get("inputTextTokenCount")
-        or metrics.get("inputTokens")
-        or 0
-    )
-    output_tokens = (
-        metrics.get("outputTokenCount")
-        or metrics.get("outputTextTokenCount")
-        or metrics.get("outputTokens")
-        or 0
-    )
-    
-    # Convertir a int y acumular en totales de sesión
-    input_tokens = int(input_tokens)
-    output_tokens = int(output_tokens)
-    
-    if input_tokens == 0 and output_tokens == 0:
-        return None  # Evento sin datos útiles
-    
-    session_totals["input"] += input_tokens
-    session_totals["output"] += output_tokens
-    
-    total_tokens = session_totals["input"] + session_totals["output"]
-    total_cost = calculate_token_cost(session_totals["input"], session_totals["output"])
-    
-    return {
-        "inputTokens": session_totals["input"],
-        "outputTokens": session_totals["output"],
-        "totalTokens": total_tokens,
-        "estimatedCostUsd": round(total_cost, 6)
-    }
-
-
-class BedrockStreamManager:
+class BedrockStreamManager(SessionEngine):
     """Coordinates the bidirectional Nova Sonic stream."""
 
-    _DEFAULT_TOOL_SCHEMA = json.dumps(
-        {
-            "type": "object",
-            "properties": {
-                "nombre_completo": {"type": "string"},
-                "dni": {"type": "string"},  # Validación relajada - limpiaremos en processor
-                "telefono": {"type": "string"},  # Validación relajada - limpiaremos en processor
-                "email": {"type": "string"},  # Validación relajada - limpiaremos en processor
-                "programa_interes": {"type": "string"},
-                "modalidad_preferida": {"type": "string"},
-                "horario_preferido": {"type": "string"},
-                "consentimiento": {"type": "string"}
-            },
-            "required": [
-                "nombre_completo",
-                "telefono",
-                "email",
-                "programa_interes",
-                "modalidad_preferida",
-                "consentimiento"
-            ]
-        }
-    )
+    engine_kind = ENGINE_FULL
+    supports_injection = True
+    supports_context_switch = True
 
+    # Herramienta legacy para YAMLs sin sección 'tools' (ver processors/tool_registry.py)
     DEFAULT_TOOL_SPEC: Dict[str, Any] = {
         "toolSpec": {
             "name": "guardar_lead",
-            "description": (
-                "Guarda los datos del prospecto cuando tienes TODOS los campos requeridos: "
-                "nombre completo, DNI (8 dígitos exactos), teléfono (9 dígitos exactos), email, programa, "
-                "modalidad, horario y consentimiento. VERIFICA que el teléfono tenga EXACTAMENTE 9 dígitos "
-                "antes de llamar esta herramienta. Si tiene 8, pide el dígito faltante al usuario."
-            ),
-            "inputSchema": {"json": _DEFAULT_TOOL_SCHEMA},
+            "description": GUARDAR_LEAD_DESCRIPTION,
+            "inputSchema": {"json": json.dumps(GUARDAR_LEAD_SCHEMA)},
         }
     }
 
@@ -250,6 +223,12 @@ class BedrockStreamManager:
         prompt_name: Optional[str] = None,
         tools: Optional[List[Dict[str, Any]]] = None,
         debug_callback: Optional[Callable[[str], None]] = None,
+        audio_coalesce_max_ms: int = AUDIO_COALESCE_MAX_MS,
+        audio_pacing: Optional[Dict[str, Any]] = None,
+        tool_timeouts: Optional[Dict[str, float]] = None,
+        tool_registry: Optional[ToolRegistry] = None,
+        budget: Optional[Dict[str, Any]] = None,
+        inference: Optional[Dict[str, Any]] = None,
     ) -> None:
         if not context_sources:
             raise ValueError("Debes proporcionar al menos un ContextSource")
@@ -261,20 +240,39 @@ class BedrockStreamManager:
         self.session_id = str(uuid.uuid4())
         self.context_sources = context_sources
         self.processor: DataProcessor = processor or ToolUseProcessor()
-        self.tool_specs = tools or [self.DEFAULT_TOOL_SPEC]
+        # Herramientas del prompt: lista explícita > registro del YAML > guardar_lead legacy
+        self._tool_registry = tool_registry
+        if tools is not None:
+            self.tool_specs = tools
+        elif tool_registry is not None:
+            self.tool_specs = tool_registry.specs
+        else:
+            self.tool_specs = [self.DEFAULT_TOOL_SPEC]
 
         self.bedrock_client: Optional[BedrockRuntimeClient] = None
         self.stream_response = None
         self.is_active = False
 
         self.output_subject: Subject = Subject()
-        self.audio_output_queue: asyncio.Queue[bytes] = asyncio.Queue()
+        self.audio_output_queue: asyncio.Queue[OutputAudioChunk] = asyncio.Queue()
         self.audio_input_queue: asyncio.Queue[Optional[bytes]] = asyncio.Queue()
 
         self._reader_task: Optional[asyncio.Task] = None
         self._audio_task: Optional[asyncio.Task] = None
-        self._send_lock = asyncio.Lock()
-        self._audio_send_clock: Optional[float] = None
+        # Sender único con prioridades (ciclo de vida > tools > texto > audio)
+        self._outbound = OutboundScheduler(self._write_chunk)
+        # Pacing del uplink (off/realtime/burst), configurable por prompt
+        self._pacer = AudioPacer.from_config(
+            audio_pacing,
+            bytes_per_second=INPUT_SAMPLE_RATE * CHANNELS * PCM_SAMPLE_WIDTH,
+            default_mode=AUDIO_PACING_MODE,
+            default_lookahead_ms=AUDIO_PACING_LOOKAHEAD_MS,
+        )
+        # Coalescing de backlog: máximo de bytes PCM por audioInput (par para no partir muestras)
+        bytes_per_ms = INPUT_SAMPLE_RATE * CHANNELS * PCM_SAMPLE_WIDTH / 1000.0
+        max_bytes = int(max(0, audio_coalesce_max_ms) * bytes_per_ms)
+        self._audio_coalesce_max_bytes = max_bytes - (max_bytes % PCM_SAMPLE_WIDTH)
+        self._audio_carry: Optional[bytes] = None
         self._last_payload_sent: Optional[str] = None
         self._debug_callback = debug_callback
         self.audio_content_name: Optional[str] = None
@@ -284,30 +282,135 @@ class BedrockStreamManager:
         self.display_assistant_text = True
 
         self._pending_tool_use: Optional[Dict[str, Any]] = None
+        # Tool calls en vuelo (tareas aparte: el loop de lectura sigue recibiendo audio/texto)
+        self._tool_tasks: Set[asyncio.Task] = set()
+        self._tool_timeouts: Dict[str, float] = {
+            **(tool_registry.timeouts() if tool_registry else {}),
+            **(tool_timeouts or {}),
+        }
+        # Caché de resultados con política 'session' (la 'shared' vive en el registro)
+        self._tool_cache = ToolResultCache()
         self.suppress_audio_until_content_end = False
         self.barge_in = False
+        # Secuencia de chunks TTS: el cliente corta hasta cutoffSeq en un barge-in
+        self._output_seq = 0
+        self._flushed_seq = 0
+        # Texto SPECULATIVE ya enviado a la UI que espera su FINAL (orden FIFO)
+        self._speculative_segments: Deque[Tuple[str, str, float]] = deque(maxlen=SPECULATIVE_MAX_PENDING)
+        self._speculative_count = 0
         
-        # Flag para esperar promptEnd antes de enviar audio
-        self._prompt_ready = asyncio.Event()
+        # Inicio de la llamada (apertura o entrega del pool) hasta el primer audio aceptado
+        self._call_started_at: Optional[float] = None  # time.perf_counter()
+        # Mientras se escribe el handshake, un error del lector lo propaga quien lo envía
+        self._handshaking = False
         self._last_text_by_role = {"USER": None, "ASSISTANT": None}  # type: Dict[str, Optional[str]]
         self._last_emitted_role = None  # type: Optional[str]
         
         # Timing tracking para debug de latencia
         self._last_user_audio_end = None  # type: Optional[float]
         self._last_assistant_response_start = None  # type: Optional[float]
+        # Fin de turno cuya latencia ya se contabilizó en las métricas del perfil
+        self._response_latency_recorded_for = None  # type: Optional[float]
         
         # OPTIMIZACIÓN: Sistema de detección de pausas para enviar contentEnd automático
-        self._last_audio_chunk_received = None  # type: Optional[float]
+        self._last_audio_chunk_received = None  # type: Optional[float]  # reloj loop.time()
         self._silence_timeout = 0.8  # 800ms sin audio = usuario terminó de hablar
         self._turn_active = False  # Si hay un turno de usuario en progreso
-        self._silence_monitor_task: Optional[asyncio.Task] = None
+        # Timer de plazo (loop.call_later) reprogramado por cada chunk: sin polling
+        self._silence_timer = DeadlineTimer(self._on_silence_deadline)
         
-        # Acumuladores de uso (tokens) por sesión para costo total
-        self._usage_totals = {"input": 0, "output": 0}  # type: Dict[str, int]
+        # Uso de tokens por turno/categoría y presupuesto de la sesión
+        self._usage = UsageLedger()
+        self._budget = SessionBudget.from_config(budget)
+        # Instrucciones de coach/sistema: se fusionan durante una ventana corta y
+        # salen como un solo bloque de texto (ver streaming/injection.py)
+        self._injections = InjectionQueue()
+        self._injection_window = max(0, INJECTION_WINDOW_MS) / 1000.0
+        self._injection_timer = DeadlineTimer(self._on_injection_deadline)
+        self._injection_task: Optional[asyncio.Task] = None
+        # inferenceConfiguration del sessionStart (sección 'inference' del YAML)
+        self._inference = InferenceProfile.from_config(inference)
+        # Cambio de prompt pendiente: se aplica con un rollover en la siguiente pausa
+        self._pending_context_switch: Optional[
+            Tuple[List[ContextSource], Optional[ToolRegistry], str, Optional[InferenceProfile], Optional[str]]
+        ] = None
         
         # Sistema de reintentos para errores transitorios
         self._retry_count = 0
         self._is_reconnecting = False
+        # Continuidad tras reconexión: turnos recientes y audio captado durante el corte
+        self._transcript: Deque[Tuple[str, str]] = deque(maxlen=max(0, RECONNECT_TRANSCRIPT_TURNS))
+        self._gap_audio: Deque[bytes] = deque()
+        self._gap_audio_bytes = 0
+        self._gap_audio_max_bytes = int(max(0, RECONNECT_AUDIO_BUFFER_MS) * bytes_per_ms)
+        # Rollover proactivo antes del límite de vida de la conexión
+        self._stream_opened_at: Optional[float] = None  # time.monotonic()
+        self._rollover_after = STREAM_ROLLOVER_SECONDS
+        self._rollover_task: Optional[asyncio.Task] = None
+        self._next_rollover_attempt = 0.0
+        # Cambio de prompt sin stream nuevo; se desactiva si el servidor lo rechaza una vez
+        self._in_stream_switch_enabled = PROMPT_SWITCH_MODE == "in_stream"
+        self._prompt_switch_probation_until = 0.0
+        # Respuesta de audio del asistente en curso (no se cambia de prompt a mitad)
+        self._assistant_turn_open = False
+        # Watchdog de lectura (reloj time.monotonic): último evento entrante, última
+        # voz subida, desde cuándo hay voz sin ningún evento de vuelta y desde
+        # cuándo se espera una respuesta del modelo
+        self._last_inbound_at: Optional[float] = None
+        self._last_speech_at: Optional[float] = None
+        self._speech_unanswered_since: Optional[float] = None
+        self._awaiting_response_since: Optional[float] = None
+        self._stall_response_timeout = max(0.0, STALL_RESPONSE_TIMEOUT_SECONDS)
+        self._stall_uplink_timeout = max(0.0, STALL_UPLINK_TIMEOUT_SECONDS)
+        self._stall_timer = DeadlineTimer(self._on_stall_deadline)
+        self._stall_task: Optional[asyncio.Task] = None
+        self._stall_streak = 0
+        self._stall_streak_inbound_at: Optional[float] = None
+        self._stall_paused = False
+
+        # Métricas del stream (el adaptador las publica como stream_metrics al cerrar)
+        self._stream_metrics: Dict[str, Any] = {
+            "uplink_chunks_in": 0,
+            "uplink_events_out": 0,
+            "uplink_coalesced_events": 0,
+            "uplink_max_chunks_per_event": 0,
+            "first_response_latency_ms": None,
+            "stream_errors": 0,
+            "throttle_errors": 0,
+            "errors_by_kind": {kind.value: 0 for kind in ErrorKind},
+            "retries_denied": 0,
+            "reconnects": 0,
+            "last_reconnect_ms": None,
+            "reconnect_replayed_bytes": 0,
+            "reconnect_dropped_bytes": 0,
+            "rollovers": 0,
+            "rollover_failures": 0,
+            "last_rollover_prime_ms": None,
+            "last_rollover_handover_ms": None,
+            "barge_ins": 0,
+            "barge_in_dropped_chunks": 0,
+            "last_barge_in_flush_ms": None,
+            "speculative_segments": 0,
+            "speculative_revisions": 0,
+            "last_speculative_lead_ms": None,
+            "tool_calls": 0,
+            "tool_errors": 0,
+            "tool_timeouts": 0,
+            "tool_cache_hits": 0,
+            "last_tool_ms": None,
+            "context_switches": 0,
+            "prompt_switches_in_stream": 0,
+            "prompt_switch_fallbacks": 0,
+            "last_prompt_switch_ms": None,
+            "handshake_ms": None,
+            "first_audio_accepted_ms": None,
+            "read_stalls": 0,
+            "read_stalls_by_kind": dict.fromkeys(STALL_KINDS, 0),
+            "last_stall_kind": None,
+            "last_stall_detect_ms": None,
+            "stalls_unrecovered": 0,
+            "region_failovers": 0,
+        }
 
     def _debug(self, message: str) -> None:
         if self._debug_callback:
@@ -317,45 +420,162 @@ class BedrockStreamManager:
                 pass
         debug_print(message)
 
-    async def initialize_stream(self) -> "BedrockStreamManager":
-        client = self._ensure_client()
-        request = InvokeModelWithBidirectionalStreamOperationInput(model_id=self.model_id)
-        self.stream_response = await client.invoke_model_with_bidirectional_stream(request)
-
-        self.is_active = True
-        await self._send_event(self._build_session_start_event())
-        # OPTIMIZACIÓN: Sleeps eliminados - AWS SDK maneja backpressure automáticamente
-        await self._send_event(self._build_prompt_start_event())
-        await self._send_context_sources()
-        # Algunos modelos no emiten promptEnd automáticamente; habilitamos audio después de enviar el contexto
-        if not self._prompt_ready.is_set():
-            self._debug("ℹ️ Contexto entregado, habilitando audio")
-            self._prompt_ready.set()
+    def rebind(
+        self,
+        *,
+        processor: Optional[DataProcessor] = None,
+        debug_callback: Optional[Callable[[str], None]] = None,
+    ) -> None:
+        """Asigna processor/logger de la sesión que recibe un stream pre-calentado."""
+        if processor is not None:
+            self.processor = processor
+            self._tool_cache.clear()
+        if debug_callback is not None:
+            self._debug_callback = debug_callback
+        # Para la sesión que lo recibe, la llamada empieza en la entrega
+        self._call_started_at = time.perf_counter()
+        self._stream_metrics["first_audio_accepted_ms"] = None
+
+    def subscribe(self, on_next, on_error=None):
+        """Suscribe a los eventos no-audio del Subject (interfaz SessionEngine)."""
+        return self.output_subject.subscribe(on_next=on_next, on_error=on_error)
+
+    def get_stream_metrics(self) -> Dict[str, Any]:
+        """Devuelve una copia de las métricas acumuladas del stream."""
+        metrics = dict(self._stream_metrics)
+        metrics["engine"] = self.engine_kind
+        metrics["region"] = self.region
+        metrics["read_stalls_by_kind"] = dict(metrics["read_stalls_by_kind"])
+        metrics["errors_by_kind"] = dict(metrics["errors_by_kind"])
+        events_out = metrics.get("uplink_events_out") or 0
+        metrics["uplink_coalescing_ratio"] = (
+            round(metrics["uplink_chunks_in"] / events_out, 3) if events_out else 0.0
+        )
+        # Demora en cola por clase de envío (p. ej. cuánto espera un toolResult)
+        metrics["outbound_queue"] = self._outbound.get_metrics()
+        # Modo de pacing activo para comparar latencia/errores entre configs (A/B)
+        metrics["pacing"] = self._pacer.get_metrics()
+        metrics["silence_timer_wakeups"] = self._silence_timer.wakeups
+        metrics["context_cache"] = get_context_cache().get_metrics()
+        # Estado del circuit breaker y del presupuesto de reintentos de la región
+        metrics["retry_coordinator"] = get_retry_coordinator(self.region).get_metrics()
+        metrics["regions"] = get_region_selector().get_metrics()
+        # Perfil de inferencia de la sesión y agregados por perfil del worker (tuning por prompt)
+        metrics["inference"] = self._inference.describe()
+        metrics["inference_profiles"] = get_inference_stats().get_metrics()
+        metrics["injections"] = self._injections.get_metrics()
+        metrics["usage"] = {
+            "tokens": self._usage.total_tokens,
+            "cost_usd": self._usage.cost_usd,
+            "breakdown": dict(self._usage.totals),
+            "turns": len(self._usage.turns),
+            "usage_events": self._usage.events,
+            "budget": self._budget.get_metrics() if self._budget.enabled else None,
+        }
+        if self._stream_opened_at is not None:
+            metrics["stream_age_s"] = round(time.monotonic() - self._stream_opened_at, 1)
+        return metrics
+
+    async def initialize_stream(self, *, open_audio: bool = False) -> "BedrockStreamManager":
+        """Abre el stream y envía el handshake completo en una sola ráfaga.
+
+        El lector arranca antes de escribir, así un rechazo del servidor se ve
+        durante el handshake y no al primer audio. Con ``open_audio`` el
+        contentStart de audio va en la misma ráfaga (el protocolo solo exige
+        que siga al prompt y al contexto); el PCM que llegue antes queda en
+        ``audio_input_queue`` hasta que ese contentStart esté escrito.
+        """
+        started = time.perf_counter()
+        self._call_started_at = started
+        coordinator = get_retry_coordinator(self.region)
+        try:
+            self.stream_response = await self._open_stream()
+            self._stream_opened_at = time.monotonic()
+            self._awaiting_response_since = None
 
-        self._reader_task = asyncio.create_task(self._read_loop())
-        
-        # OPTIMIZACIÓN: Iniciar monitor de silencios para auto-enviar contentEnd
-        self._silence_monitor_task = asyncio.create_task(self._monitor_silence())
-        
+            self.is_active = True
+            self._reader_task = asyncio.create_task(self._read_loop())
+            events = self._handshake_events()
+            if open_audio:
+                events.append(self._open_audio_content())
+            await self._send_handshake(events)
+        except Exception as exc:
+            self.is_active = False
+            if self._reader_task and not self._reader_task.done():
+                self._reader_task.cancel()
+            coordinator.record_failure(classify_error(exc))
+            raise
+        coordinator.record_success()
+        handshake_ms = (time.perf_counter() - started) * 1000.0
+        self._stream_metrics["handshake_ms"] = round(handshake_ms, 1)
+        self._debug(f"🤝 Handshake enviado en {handshake_ms:.0f} ms ({len(events)} eventos)")
+        if open_audio:
+            self._ensure_audio_task_started()
         return self
 
     async def send_audio_content_start_event(self) -> None:
-        """Envía contentStart para audio. Debe llamarse después de recibir promptEnd."""
+        """Abre el contenido de audio del usuario (no-op si ya se abrió en el handshake)."""
         if not self.is_active:
             raise RuntimeError("La sesión todavía no está activa")
-        
-        # Esperar a que el modelo confirme que está listo (promptEnd recibido)
-        self._debug("⏳ Esperando confirmación del modelo (promptEnd)...")
-        try:
-            await asyncio.wait_for(self._prompt_ready.wait(), timeout=10)
-        except asyncio.TimeoutError:
-            raise RuntimeError("Timeout esperando promptEnd del modelo")
-        
-        self._debug("✅ Modelo listo, enviando contentStart para audio")
+        if self.audio_content_name:
+            self._ensure_audio_task_started()
+            return
+        await self._send_serialized(self._open_audio_content(), SendPriority.LIFECYCLE)
+        self._ensure_audio_task_started()
+
+    def _open_audio_content(self) -> bytes:
+        """Asigna un contentName de audio nuevo y devuelve su contentStart serializado."""
         content_name = f"audio-{uuid.uuid4().hex}"
-        self._audio_send_clock = None
+        self._pacer.reset()
         self.audio_content_name = content_name
-        event = {
+        self._debug(f"🎙️ Abriendo audio {content_name}")
+        return json.dumps(self._build_audio_content_start_event(content_name)).encode("utf-8")
+
+    def _handshake_events(
+        self,
+        extra_system: Optional[str] = None,
+        with_history: bool = False,
+        with_session: bool = True,
+    ) -> List[bytes]:
+        """sessionStart, promptStart, contexto y (opcional) el historial, ya serializados."""
+        events = [json.dumps(self._build_session_start_event()).encode("utf-8")] if with_session else []
+        events.append(json.dumps(self._build_prompt_start_event()).encode("utf-8"))
+        events.extend(self._context_events(extra_system=extra_system))
+        if with_history:
+            for role, text in list(self._transcript):
+                events.extend(self._text_block_bytes(text, role))
+        return events
+
+    async def _send_handshake(self, events: List[bytes]) -> None:
+        """Encola todos los eventos de una vez: el sender los escribe seguidos, sin
+        esperar cada escritura antes de encolar la siguiente."""
+        if not self.stream_response:
+            raise RuntimeError("El stream bidireccional no está inicializado")
+        self._last_payload_sent = events[-1][:160].decode("utf-8", "replace")
+        writes = asyncio.gather(*[
+            self._outbound.submit_nowait(data, SendPriority.LIFECYCLE) for data in events
+        ])
+        reader = self._reader_task
+        self._handshaking = True
+        try:
+            if reader is None:
+                await writes
+                return
+            done, _ = await asyncio.wait({writes, reader}, return_when=asyncio.FIRST_COMPLETED)
+            if reader not in done:
+                writes.result()
+                return
+            # El servidor rechazó el stream antes de terminar el handshake; se informa
+            # el error del lector (la causa) y se descarta el de las escrituras
+            writes.add_done_callback(lambda f: f.cancelled() or f.exception())
+            writes.cancel()
+            exc = None if reader.cancelled() else reader.exception()
+            raise exc or RuntimeError("El stream se cerró durante el handshake")
+        finally:
+            self._handshaking = False
+
+    def _build_audio_content_start_event(self, content_name: str) -> Dict[str, Any]:
+        return {
             "event": {
                 "contentStart": {
                     "promptName": self.prompt_name,
@@ -374,18 +594,36 @@ class BedrockStreamManager:
                 }
             }
         }
-        await self._send_event(event)
-        self._ensure_audio_task_started()
 
     def add_audio_chunk(self, audio_bytes: bytes) -> None:
         if not self.is_active or not audio_bytes:
             return
         
-        # OPTIMIZACIÓN: Registrar timestamp de último audio recibido
-        self._last_audio_chunk_received = time.time()
+        # OPTIMIZACIÓN: Registrar timestamp de último audio y mover el plazo de fin de turno
+        self._last_audio_chunk_received = self._silence_timer.time()
+        self._silence_timer.reschedule_at(self._last_audio_chunk_received + self._silence_timeout)
         if not self._turn_active:
             self._turn_active = True
             self._debug("🎤 Turno de usuario iniciado")
+
+        self._usage.note_user_audio(len(audio_bytes) / _INPUT_BYTES_PER_SECOND)
+        if self._stall_paused and self._last_inbound_at != self._stall_streak_inbound_at:
+            self._stall_paused = False  # volvieron a llegar eventos
+        # Voz = pico >= NOVA_SONIC_SILENCE_PEAK, el mismo umbral del detector de silencio
+        if self._stall_uplink_timeout and _pcm_peak(audio_bytes) >= SILENCE_PEAK_THRESHOLD:
+            # Solo la voz espera algo de vuelta: un micrófono abierto en silencio no es un stall
+            now = time.monotonic()
+            self._last_speech_at = now
+            since = self._speech_unanswered_since
+            if since is None or (self._stall_reference() or now) >= since:
+                self._speech_unanswered_since = since = now
+            if not self._stall_timer.armed and not self._is_reconnecting and not self._stall_paused:
+                self._arm_stall_check(since, self._stall_uplink_timeout)
+
+        if self._is_reconnecting:
+            # Stream caído: retener el audio para reenviarlo al reconectar
+            self._buffer_gap_audio(audio_bytes)
+            return
         
         try:
             self.audio_input_queue.put_nowait(audio_bytes)
@@ -395,12 +633,66 @@ class BedrockStreamManager:
     async def send_system_message(self, text: str, role: str = "SYSTEM") -> None:
         if not text:
             return
+        # Se atribuye como tokens de coach cuando llegue el usageEvent
+        self._usage.note_coach_text(text)
         await self._send_text_block(text, role=role)
 
+    def queue_system_message(
+        self,
+        text: str,
+        *,
+        role: str = "SYSTEM",
+        key: Optional[str] = None,
+        envelope: Tuple[str, str] = ("", ""),
+    ) -> None:
+        """Encola una instrucción para el próximo bloque inyectado (llamar desde el loop).
+
+        Lo que llegue dentro de ``INJECTION_WINDOW_MS`` sale en un solo
+        contentStart/textInput/contentEnd por rol; un texto con la misma ``key``
+        que otro aún pendiente lo reemplaza. ``envelope`` envuelve el bloque
+        fusionado una sola vez (p. ej. las marcas [NO-VOZ] del coach).
+        """
+        if not self.is_active:
+            return
+        if self._injections.add(text, role=role, key=key, envelope=envelope):
+            self._debug(f"📝 Instrucción pendiente reemplazada ({key})")
+        # La ventana se abre con el primer texto pendiente y no se extiende
+        if len(self._injections) and not self._injection_timer.armed:
+            self._injection_timer.reschedule(self._injection_window)
+
+    def _on_injection_deadline(self) -> None:
+        if not self.is_active or not len(self._injections):
+            return
+        if self._injection_task and not self._injection_task.done():
+            return  # el envío en curso re-arma la ventana al terminar
+        if self._is_reconnecting or self._handshaking:
+            # Sin stream utilizable: se reintenta cuando el nuevo prompt esté abierto
+            self._injection_timer.reschedule(max(self._injection_window, 0.1))
+            return
+        self._injection_task = asyncio.create_task(self._flush_injections())
+
+    async def _flush_injections(self) -> None:
+        for block in self._injections.drain():
+            try:
+                await self.send_system_message(block.text, role=block.role)
+            except Exception as exc:
+                self._debug(f"⚠️ No se pudo inyectar el bloque de instrucciones: {exc}")
+                continue
+            self._injections.record_sent(block)
+            if block.count > 1:
+                self._debug(f"📝 {block.count} instrucciones fusionadas en un bloque (~{block.estimated_tokens} tokens)")
+        # Lo encolado mientras se enviaba espera su propia ventana
+        if self.is_active and len(self._injections) and not self._injection_timer.armed:
+            self._injection_timer.reschedule(self._injection_window)
+
     async def _attempt_reconnection(self, delay: float) -> None:
         """
-        Intenta reconectar el stream de Bedrock después de un error transitorio.
-        
+        Reabre el stream de Bedrock tras un error transitorio conservando la conversación.
+
+        Re-envía sesión, prompt y contexto (desde la caché) más una nota de
+        continuidad con los datos ya capturados y los turnos recientes como
+        historial; reabre el contenido de audio y reenvía el audio del corte.
+
         Args:
             delay: Segundos a esperar antes de reconectar (backoff exponencial)
         """
@@ -409,58 +701,466 @@ class BedrockStreamManager:
         
         # Esperar el delay de backoff
         await asyncio.sleep(delay)
-        
+        started = time.perf_counter()
+
+        # Lector de un intento previo fallido a medias (nunca el que ejecuta esta reconexión)
+        reader = self._reader_task
+        if reader and reader is not asyncio.current_task() and not reader.done():
+            reader.cancel()
+            await self._await_task(reader)
+
+        # El drain de audio escribe en el stream caído: se detiene y se relanza al final
+        audio_was_open = self.audio_content_name is not None
+        if self._audio_task and not self._audio_task.done():
+            self._audio_task.cancel()
+            await self._await_task(self._audio_task)
+        self.audio_content_name = None
+        self.suppress_audio_until_content_end = False
+        self._pending_tool_use = None
+        self._assistant_turn_open = False
+        # El stream nuevo no enviará el FINAL de lo provisional del stream caído
+        self._close_speculative_segments("reconnect")
+        # Un cambio de contexto pendiente se aplica en el stream que se reabre
+        switch = self._pending_context_switch
+        if switch:
+            self._pending_context_switch = None
+            self._apply_context(switch[0], switch[1], switch[3])
+            self._note_context_switch("reconnect", switch)
+
+        # Cerrar stream anterior si existe
+        if self.stream_response:
+            try:
+                await self.stream_response.input_stream.close()
+            except Exception:
+                pass
+            self.stream_response = None
+
+        # Crear nuevo stream
+        self._debug("🔌 Creando nuevo stream bidireccional...")
+        self.stream_response = await self._open_stream()
+        self._stream_opened_at = time.monotonic()
+        self._awaiting_response_since = None
+
+        # Nuevo lector antes del handshake; el actual (que ejecuta esta reconexión) termina al volver
+        self._reader_task = asyncio.create_task(self._read_loop())
+
+        self._debug("📤 Re-enviando sesión, prompt y contexto con resumen de continuidad...")
+        events = self._handshake_events(extra_system=self._build_carry_over_note(), with_history=True)
+        if audio_was_open:
+            events.append(self._open_audio_content())
+        await self._send_handshake(events)
+        if audio_was_open:
+            self._ensure_audio_task_started()
+        replayed = self._replay_gap_audio()
+        self._is_reconnecting = False
+
+        elapsed_ms = round((time.perf_counter() - started) * 1000.0, 1)
+        self._stream_metrics["reconnects"] += 1
+        self._stream_metrics["last_reconnect_ms"] = elapsed_ms
+        self._debug(f"✅ Stream reconectado en {elapsed_ms} ms (audio reenviado: {replayed} bytes)")
+
+    def request_context_switch(
+        self,
+        context_sources: List[ContextSource],
+        *,
+        tool_registry: Optional[ToolRegistry] = None,
+        inference: Optional[InferenceProfile] = None,
+        reason: str = "",
+        label: Optional[str] = None,
+    ) -> None:
+        """Cambia el prompt/contexto de la sesión en la siguiente pausa del asistente.
+
+        Por defecto se aplica en el mismo stream (promptEnd + promptStart nuevo con
+        el contexto, la nota de continuidad y el historial); si cambia el perfil de
+        inferencia, que viaja en sessionStart (None = se mantiene), se rota a un
+        stream nuevo. Debe llamarse desde el loop de la sesión. ``label`` (p. ej. la
+        ruta del YAML) vuelve en el evento promptSwitched cuando el cambio se aplica.
+        """
+        if not context_sources:
+            raise ValueError("Debes proporcionar al menos un ContextSource")
+        self._pending_context_switch = (context_sources, tool_registry, reason, inference, label)
+        self._next_rollover_attempt = 0.0
+        self._debug(f"🔀 Cambio de contexto programado para la próxima pausa ({reason or 'sin motivo'})")
+        if self.is_active and not self._turn_active and not self._assistant_turn_open:
+            # Nadie está hablando: no hace falta esperar al próximo fin de turno
+            self._maybe_schedule_rollover()
+
+    def _apply_context(
+        self,
+        context_sources: List[ContextSource],
+        tool_registry: Optional[ToolRegistry],
+        inference: Optional[InferenceProfile] = None,
+    ) -> None:
+        if inference is not None:
+            self._inference = inference
+        self.context_sources = context_sources
+        self._tool_registry = tool_registry
+        self.tool_specs = tool_registry.specs if tool_registry is not None else [self.DEFAULT_TOOL_SPEC]
+        self._tool_timeouts = tool_registry.timeouts() if tool_registry is not None else {}
+
+    def _maybe_schedule_rollover(self) -> None:
+        switch_pending = self._pending_context_switch is not None
+        if (self._rollover_after <= 0 and not switch_pending) or self._stream_opened_at is None:
+            return
+        if self._rollover_task and not self._rollover_task.done():
+            return
+        if not self.is_active or self._is_reconnecting or self._pending_tool_use or self._tool_tasks:
+            return
+        now = time.monotonic()
+        age = now - self._stream_opened_at
+        if now < self._next_rollover_attempt:
+            return
+        if switch_pending and self._can_switch_in_stream():
+            self._rollover_task = asyncio.create_task(self._switch_prompt_in_stream())
+            return
+        if not switch_pending and age < self._rollover_after:
+            return
+        self._rollover_task = asyncio.create_task(self._rollover_stream(age))
+
+    def _can_switch_in_stream(self) -> bool:
+        switch = self._pending_context_switch
+        if not switch or not self._in_stream_switch_enabled:
+            return False
+        inference = switch[3]
+        return inference is None or inference == self._inference
+
+    async def _switch_prompt_in_stream(self) -> None:
+        """Aplica el cambio de contexto pendiente sin abrir otro stream.
+
+        Cierra el audio y el prompt vigentes y abre un promptName nuevo con su
+        contexto, herramientas, la nota de continuidad y el historial, más un
+        contentStart de audio nuevo, todo en una ráfaga. El cliente, el lector y
+        la cola del micrófono siguen vivos: el audio que llega mientras tanto
+        espera en ``audio_input_queue``.
+        """
+        switch = self._pending_context_switch
+        if not switch or not self.is_active or self._is_reconnecting:
+            return  # queda pendiente (la reconexión lo aplica en el stream nuevo)
+        self._pending_context_switch = None
+        started = time.perf_counter()
+        self._debug(f"🔀 Cambiando de prompt en el mismo stream ({switch[2] or 'sin motivo'})")
+
+        # El drain arma cada audioInput con el promptName vigente: se detiene antes del promptEnd
+        if self._audio_task and not self._audio_task.done():
+            self._audio_task.cancel()
+            await self._await_task(self._audio_task)
+        audio_was_open = self.audio_content_name is not None
+        events: List[bytes] = []
+        if audio_was_open:
+            events.append(json.dumps({
+                "event": {"contentEnd": {"promptName": self.prompt_name, "contentName": self.audio_content_name}}
+            }).encode("utf-8"))
+        events.append(json.dumps({"event": {"promptEnd": {"promptName": self.prompt_name}}}).encode("utf-8"))
+        self.audio_content_name = None
+        self._close_speculative_segments("prompt_switch")
+
+        self._apply_context(switch[0], switch[1], switch[3])
+        self.prompt_name = f"prompt-{uuid.uuid4().hex}"
+        note = self._build_carry_over_note("se cambió la configuración del asistente durante la llamada")
+        events.extend(self._handshake_events(extra_system=note, with_history=True, with_session=False))
+        if audio_was_open:
+            events.append(self._open_audio_content())
+        self._prompt_switch_probation_until = time.monotonic() + PROMPT_SWITCH_PROBATION_SECONDS
         try:
-            # Cancelar tareas existentes
-            if self._reader_task and not self._reader_task.done():
-                self._reader_task.cancel()
-                try:
-                    await self._reader_task
-                except asyncio.CancelledError:
-                    pass
-            
-            # Cerrar stream anterior si existe
-            if self.stream_response:
-                try:
-                    await self.stream_response.input_stream.close()
-                except Exception:
-                    pass
-                self.stream_response = None
-            
-            # Crear nuevo stream
-            self._debug("🔌 Creando nuevo stream bidireccional...")
-            client = self._ensure_client()
-            request = InvokeModelWithBidirectionalStreamOperationInput(model_id=self.model_id)
-            self.stream_response = await client.invoke_model_with_bidirectional_stream(request)
-            
-            # Re-enviar eventos de inicialización
-            self._debug("📤 Re-enviando sesión y prompt...")
-            await self._send_event(self._build_session_start_event())
-            await self._send_event(self._build_prompt_start_event())
-            
-            # Re-enviar contexto
-            self._debug("📚 Re-enviando fuentes de contexto...")
-            await self._send_context_sources()
-            
-            # Reactivar el stream
-            self.is_active = True
-            
-            # Resetear flag de prompt ready (esperaremos nuevo promptEnd)
-            self._prompt_ready.clear()
-            
-            # Reiniciar reader task
-            self._reader_task = asyncio.create_task(self._read_loop())
-            
-            self._debug("✅ Stream reconectado exitosamente")
-            self._is_reconnecting = False
-            
+            await self._send_handshake(events)
         except Exception as exc:
-            self._is_reconnecting = False
-            self._debug(f"❌ Error durante reconexión: {exc}")
-            raise
+            # El servidor no aceptó un segundo prompt en la sesión: el contexto nuevo
+            # ya está aplicado, así que reconectar completa el cambio
+            self._in_stream_switch_enabled = False
+            self._stream_metrics["prompt_switch_fallbacks"] += 1
+            self._debug(f"⚠️ Cambio de prompt en el stream rechazado, se aplica reconectando: {exc}")
+            if await self._recover_stream(exc):
+                self._note_context_switch("reconnect", switch)
+            else:
+                self.is_active = False
+            return
+        if audio_was_open:
+            self._ensure_audio_task_started()
+        elapsed_ms = (time.perf_counter() - started) * 1000.0
+        self._stream_metrics["prompt_switches_in_stream"] += 1
+        self._stream_metrics["last_prompt_switch_ms"] = round(elapsed_ms, 1)
+        self._note_context_switch("in_stream", switch, elapsed_ms)
+
+    def _note_context_switch(self, mode: str, switch: tuple, elapsed_ms: Optional[float] = None) -> None:
+        reason = switch[2]
+        self._stream_metrics["context_switches"] += 1
+        self._debug(f"✅ Prompt cambiado ({mode}, {reason or 'sin motivo'})")
+        self.output_subject.on_next({
+            "event": {
+                "promptSwitched": {
+                    "mode": mode,
+                    "reason": reason,
+                    "label": switch[4],
+                    "promptName": self.prompt_name,
+                    "inference": self._inference.name,
+                    "elapsedMs": round(elapsed_ms, 1) if elapsed_ms is not None else None,
+                }
+            }
+        })
+
+    # ------------------------------------------------------------ watchdog
+    def _stall_reference(self) -> Optional[float]:
+        """Último evento entrante o apertura del stream vigente (lo más reciente)."""
+        opened = self._stream_opened_at
+        last = self._last_inbound_at
+        if last is None or (opened is not None and opened > last):
+            return opened
+        return last
+
+    def _expect_response(self) -> None:
+        """El modelo debería contestar (fin de turno del usuario o toolResult enviado)."""
+        if not self._stall_response_timeout:
+            return
+        now = time.monotonic()
+        self._awaiting_response_since = now
+        self._arm_stall_check(now, self._stall_response_timeout)
+
+    def _arm_stall_check(self, since: Optional[float], timeout: float) -> None:
+        """Programa una revisión en ``since + timeout`` si es antes que la vigente."""
+        if since is None:
+            return
+        when = self._stall_timer.time() + max(0.0, since + timeout - time.monotonic())
+        current = self._stall_timer.deadline
+        if current is None or when < current:
+            self._stall_timer.reschedule_at(when)
+
+    def _classify_stall(self, now: float) -> Tuple[Optional[str], Optional[float]]:
+        """Devuelve (tipo de stall, None) o (None, próximo instante a revisar)."""
+        last_inbound = self._stall_reference() or now
+        next_check: Optional[float] = None
+        since = self._awaiting_response_since
+        if since is not None and self._stall_response_timeout:
+            if last_inbound >= since:
+                self._awaiting_response_since = None  # ya llegó algo
+            elif now - since >= self._stall_response_timeout:
+                return "response", None
+            else:
+                next_check = since + self._stall_response_timeout
+        speech_since = self._speech_unanswered_since
+        if self._stall_uplink_timeout and speech_since is not None:
+            if last_inbound >= speech_since:
+                self._speech_unanswered_since = None  # el modelo respondió a la voz
+            elif self._last_speech_at is not None and now - self._last_speech_at <= STALL_UPLINK_ACTIVE_SECONDS:
+                if now - speech_since >= self._stall_uplink_timeout:
+                    return "uplink", None
+                due = speech_since + self._stall_uplink_timeout
+                next_check = due if next_check is None else min(next_check, due)
+        return None, next_check
+
+    def _on_stall_deadline(self) -> None:
+        if not self.is_active or self._is_reconnecting or self._stall_paused:
+            return
+        if self._stall_task and not self._stall_task.done():
+            return
+        now = time.monotonic()
+        # Con un tool en vuelo o un rollover cebando, el silencio entrante es esperable
+        if self._tool_tasks or self._pending_tool_use or (self._rollover_task and not self._rollover_task.done()):
+            self._stall_timer.reschedule(max(self._stall_response_timeout, 1.0))
+            return
+        kind, next_check = self._classify_stall(now)
+        if kind is None:
+            if next_check is not None:
+                self._stall_timer.reschedule(next_check - now)
+            return
+        idle_ms = (now - (self._stall_reference() or now)) * 1000.0
+        metrics = self._stream_metrics
+        metrics["read_stalls"] += 1
+        metrics["read_stalls_by_kind"][kind] += 1
+        metrics["last_stall_kind"] = kind
+        metrics["last_stall_detect_ms"] = round(idle_ms, 1)
+        # Si ni los streams nuevos entregan eventos, reconectar no ayuda: se pausa
+        # hasta que llegue algo (el servicio sigue silencioso o el umbral es muy bajo)
+        if self._stall_streak and self._stall_streak_inbound_at == self._last_inbound_at:
+            self._stall_streak += 1
+        else:
+            self._stall_streak = 1
+            self._stall_streak_inbound_at = self._last_inbound_at
+        if self._stall_streak > STALL_MAX_CONSECUTIVE_RECOVERIES:
+            metrics["stalls_unrecovered"] += 1
+            self._stall_paused = True
+            self._debug(f"⚠️ Stall ({kind}) tras {STALL_MAX_CONSECUTIVE_RECOVERIES} reconexiones sin eventos: watchdog en pausa")
+            return
+        self._debug(f"🧊 Stream sin eventos hace {idle_ms:.0f} ms ({kind}): reconectando de forma proactiva")
+        self._stall_task = asyncio.create_task(self._recover_from_stall(kind, idle_ms))
+
+    async def _recover_from_stall(self, kind: str, idle_ms: float) -> None:
+        # El lector sigue esperando en receive(): se desvincula antes de cancelarlo
+        # para que su cierre no marque la sesión como inactiva
+        reader = self._reader_task
+        self._reader_task = None
+        if reader and not reader.done():
+            reader.cancel()
+            await self._await_task(reader)
+        if not await self._recover_stream(StreamStallError(f"Stream sin eventos hace {idle_ms / 1000.0:.1f}s ({kind})")):
+            # No se pudo reconectar: no hay lector dueño que cierre la sesión
+            self.is_active = False
+
+    async def _rollover_stream(self, age: float) -> None:
+        """
+        Reemplaza el stream antes de su límite de vida sin corte audible.
+
+        El stream nuevo se abre y se ceba en paralelo (sesión, prompt, contexto,
+        nota de continuidad, historial y el mismo contentName de audio) mientras
+        el viejo sigue atendiendo; luego el cambio es una asignación sin awaits,
+        así el audio en cola sale por el stream nuevo con el mismo contentName.
+        """
+        switch = self._pending_context_switch
+        previous_context = (
+            self.context_sources, self._tool_registry, self.tool_specs, self._tool_timeouts, self._inference
+        )
+        if switch:
+            self._debug(f"🔀 Rotando stream para aplicar el contexto nuevo ({switch[2] or 'sin motivo'})")
+            self._apply_context(switch[0], switch[1], switch[3])
+        else:
+            self._debug(f"♻️ Stream con {age:.0f}s: preparando reemplazo antes del límite de conexión")
+        started = time.perf_counter()
+        old_stream = self.stream_response
+        audio_content_name = self.audio_content_name
+        new_stream = None
+        try:
+            new_stream = await self._open_stream()
+            priming = self._handshake_events(extra_system=self._build_carry_over_note(), with_history=True)
+            if audio_content_name:
+                priming.append(
+                    json.dumps(self._build_audio_content_start_event(audio_content_name)).encode("utf-8")
+                )
+            for data in priming:
+                await self._write_to(new_stream, data)
+        except Exception as exc:
+            self._stream_metrics["rollover_failures"] += 1
+            self._next_rollover_attempt = time.monotonic() + ROLLOVER_RETRY_SECONDS
+            self._debug(f"⚠️ Rollover de stream falló, se mantiene el actual: {exc}")
+            self._restore_context(previous_context)
+            await self._close_stream_quietly(new_stream)
+            return
+
+        # La sesión pudo cerrarse, reconectarse o abrir otro audio mientras se cebaba
+        if (
+            not self.is_active
+            or self._is_reconnecting
+            or self.stream_response is not old_stream
+            or self.audio_content_name != audio_content_name
+        ):
+            self._debug("ℹ️ Rollover descartado: el estado del stream cambió durante el cebado")
+            self._restore_context(previous_context)
+            await self._close_stream_quietly(new_stream)
+            return
+
+        prime_ms = (time.perf_counter() - started) * 1000.0
+        switch_started = time.perf_counter()
+        # Cambio atómico: writer y lector pasan al stream nuevo
+        old_reader = self._reader_task
+        self.stream_response = new_stream
+        self._stream_opened_at = time.monotonic()
+        self._awaiting_response_since = None
+        self._reader_task = asyncio.create_task(self._read_loop())
+        if old_reader and not old_reader.done():
+            old_reader.cancel()
+        handover_ms = (time.perf_counter() - switch_started) * 1000.0
+
+        metrics = self._stream_metrics
+        metrics["rollovers"] += 1
+        if switch and self._pending_context_switch is switch:
+            self._pending_context_switch = None
+            self._note_context_switch("rollover", switch, prime_ms + handover_ms)
+        metrics["last_rollover_prime_ms"] = round(prime_ms, 1)
+        metrics["last_rollover_handover_ms"] = round(handover_ms, 3)
+        self._debug(
+            f"✅ Stream rotado (cebado {prime_ms:.0f} ms en paralelo, cambio {handover_ms:.2f} ms)"
+        )
+
+        # Cierre ordenado del stream viejo
+        await self._await_task(old_reader)
+        retire = []
+        if audio_content_name:
+            retire.append({"event": {"contentEnd": {"promptName": self.prompt_name, "contentName": audio_content_name}}})
+        retire.append({"event": {"promptEnd": {"promptName": self.prompt_name}}})
+        retire.append({"event": {"sessionEnd": {}}})
+        try:
+            for event in retire:
+                await self._write_to(old_stream, json.dumps(event).encode("utf-8"))
+        except Exception:
+            pass
+        await self._close_stream_quietly(old_stream)
+
+    def _restore_context(self, previous: Tuple[Any, Any, Any, Any, Any]) -> None:
+        (
+            self.context_sources,
+            self._tool_registry,
+            self.tool_specs,
+            self._tool_timeouts,
+            self._inference,
+        ) = previous
+
+    @staticmethod
+    async def _close_stream_quietly(stream: Any) -> None:
+        if stream is None:
+            return
+        try:
+            await stream.input_stream.close()
+        except Exception:
+            pass
+
+    def _record_transcript(self, role: str, text: str) -> None:
+        if self._transcript.maxlen == 0:
+            return
+        # Turnos consecutivos del mismo rol se fusionan (el modelo emite por frases)
+        if self._transcript and self._transcript[-1][0] == role:
+            _, previous = self._transcript.pop()
+            text = f"{previous} {text}"
+        self._transcript.append((role, text[-TRANSCRIPT_TURN_MAX_CHARS:]))
+
+    def _build_carry_over_note(self, cause: str = "la llamada se reconectó por un corte técnico") -> Optional[str]:
+        try:
+            lead = self.processor.snapshot_lead() or {}
+        except Exception:
+            lead = {}
+        captured = [
+            f"{key}: {str(value)[:120]}"
+            for key, value in lead.items()
+            if value not in (None, "", [], {})
+        ]
+        if not captured and not self._transcript:
+            return None
+        lines = [
+            f"CONTINUIDAD: {cause}. Continúa exactamente donde quedó la conversación, "
+            "sin saludar de nuevo ni volver a pedir datos ya obtenidos."
+        ]
+        if captured:
+            lines.append("Datos ya capturados: " + "; ".join(captured))
+        return "\n".join(lines)
+
+    def _buffer_gap_audio(self, audio_bytes: bytes) -> None:
+        self._gap_audio.append(audio_bytes)
+        self._gap_audio_bytes += len(audio_bytes)
+        # Acotado: si el corte se alarga se descarta lo más antiguo
+        while self._gap_audio_bytes > self._gap_audio_max_bytes and self._gap_audio:
+            dropped = self._gap_audio.popleft()
+            self._gap_audio_bytes -= len(dropped)
+            self._stream_metrics["reconnect_dropped_bytes"] += len(dropped)
+
+    def _discard_gap_audio(self) -> None:
+        self._stream_metrics["reconnect_dropped_bytes"] += self._gap_audio_bytes
+        self._gap_audio.clear()
+        self._gap_audio_bytes = 0
+
+    def _replay_gap_audio(self) -> int:
+        """Pasa el audio retenido a la cola de envío (antes que cualquier chunk nuevo)."""
+        if not self._gap_audio:
+            return 0
+        if not self.audio_content_name:
+            self._discard_gap_audio()
+            return 0
+        replayed = self._gap_audio_bytes
+        while self._gap_audio:
+            self.audio_input_queue.put_nowait(self._gap_audio.popleft())
+        self._gap_audio_bytes = 0
+        self._stream_metrics["reconnect_replayed_bytes"] += replayed
+        return replayed
 
     async def close(self) -> None:
         if not self.is_active:
+            self._outbound.cancel()
             return
 
         self.is_active = False
@@ -473,8 +1173,20 @@ class BedrockStreamManager:
             self._audio_task.cancel()
         if self._reader_task:
             self._reader_task.cancel()
-        if self._silence_monitor_task:
-            self._silence_monitor_task.cancel()
+        if self._rollover_task:
+            self._rollover_task.cancel()
+        if self._stall_task:
+            self._stall_task.cancel()
+        tool_tasks = list(self._tool_tasks)
+        for task in tool_tasks:
+            task.cancel()
+        self._silence_timer.cancel()
+        self._stall_timer.cancel()
+        self._injection_timer.cancel()
+        if self._injections.discard():
+            self._debug("📝 Instrucciones pendientes descartadas al cerrar la sesión")
+        if self._injection_task:
+            self._injection_task.cancel()
 
         try:
             await self.send_audio_content_end_event()
@@ -488,10 +1200,15 @@ class BedrockStreamManager:
             await self._send_session_end_event()
         except Exception:
             pass
+        await self._outbound.close()
 
         await self._await_task(self._audio_task)
         await self._await_task(self._reader_task)
-        await self._await_task(self._silence_monitor_task)
+        await self._await_task(self._rollover_task)
+        await self._await_task(self._stall_task)
+        await self._await_task(self._injection_task)
+        for task in tool_tasks:
+            await self._await_task(task)
 
         if self.stream_response:
             try:
@@ -503,42 +1220,53 @@ class BedrockStreamManager:
         if inspect.isawaitable(result):
             await result
 
+        self._debug(f"📊 Métricas del stream: {self.get_stream_metrics()}")
         self.output_subject.on_completed()
         self.audio_content_name = None
 
     def _ensure_client(self) -> BedrockRuntimeClient:
         if not self.bedrock_client:
-            # Auto-detect credentials: IAM role (App Runner/ECS) o environment vars (local/Railway)
-            # Si AWS_ACCESS_KEY_ID existe, usar EnvironmentCredentialsResolver
-            # Si no, dejar que el SDK detecte IAM role automáticamente
-            config_params = {
-                "endpoint_uri": f"https://bedrock-runtime.{self.region}.amazonaws.com",
-                "region": self.region,
-            }
-            
-            # Solo especificar resolver si hay variables de entorno explícitas
-            if os.getenv("AWS_ACCESS_KEY_ID"):
-                config_params["aws_credentials_identity_resolver"] = EnvironmentCredentialsResolver()
-            # Si no hay AWS_ACCESS_KEY_ID, el SDK usa la cadena por defecto:
-            # 1. Environment variables
-            # 2. EC2 instance metadata (IAM role)
-            # 3. ECS task role
-            # 4. App Runner service role
-            
-            config = Config(**config_params)
-            self.bedrock_client = BedrockRuntimeClient(config=config)
+            # Cliente por región y loop: las reconexiones y rollovers de esta sesión
+            # reutilizan sus conexiones HTTP/2; las credenciales se cachean por worker
+            self.bedrock_client = get_shared_client(self.region)
         return self.bedrock_client
 
+    async def _open_stream(self):
+        """Abre un stream bidireccional y reporta su latencia al selector de regiones."""
+        client = self._ensure_client()
+        request = InvokeModelWithBidirectionalStreamOperationInput(model_id=self.model_id)
+        started = time.perf_counter()
+        try:
+            stream = await client.invoke_model_with_bidirectional_stream(request)
+        except Exception as exc:
+            if classify_error(exc) is ErrorKind.AUTH:
+                # Credenciales cacheadas vencidas o rotadas: la próxima apertura las relee
+                refresh_credentials(self.region)
+            raise
+        get_region_selector().record_open(self.region, (time.perf_counter() - started) * 1000.0)
+        return stream
+
+    def _failover_region(self) -> bool:
+        """Con el circuito de la región abierto, mueve la sesión a otra región sana."""
+        selector = get_region_selector()
+        if len(selector.regions) < 2 or selector.is_healthy(self.region):
+            return False
+        try:
+            region = selector.choose(exclude=(self.region,))
+        except CircuitOpenError:
+            return False
+        self._debug(f"🌎 Failover de región: {self.region} → {region} (circuito abierto)")
+        self.region = region
+        self.bedrock_client = None
+        self._stream_metrics["region_failovers"] += 1
+        return True
+
     def _build_session_start_event(self) -> Dict[str, Any]:
         return {
             "event": {
                 "sessionStart": {
                     "sessionId": self.session_id,
-                    "inferenceConfiguration": {
-                        "maxTokens": 1024,
-                        "topP": 0.9,
-                        "temperature": 0.7
-                    }
+                    "inferenceConfiguration": self._inference.session_config()
                 }
             }
         }
@@ -568,119 +1296,96 @@ class BedrockStreamManager:
             prompt["event"]["promptStart"]["toolConfiguration"] = {"tools": self.tool_specs}
         return prompt
 
-    async def _send_context_sources(self) -> None:
-        grouped: Dict[str, List[str]] = {}
-        for src in self.context_sources:
-            role = getattr(src, "role", "SYSTEM") or "SYSTEM"
-            try:
-                rendered = src.render()
-            except Exception as exc:
-                self._debug(f"Context source error: {exc}")
-                continue
-            if not rendered:
-                continue
-            text = rendered.strip()
-            if not text:
-                continue
-            grouped.setdefault(role.upper(), []).append(text)
-
-        for role, fragments in grouped.items():
-            if not fragments:
-                continue
-            if role == "SYSTEM" and len(fragments) > 1:
-                await self._send_combined_text_block(role, fragments)
+    def _context_events(self, extra_system: Optional[str] = None) -> List[bytes]:
+        # Render + serialización cacheados por contenido (rutas, mtimes, vars):
+        # sesiones nuevas, reconexiones y rollovers envían los bytes directamente
+        rendered = get_context_cache().get(self.context_sources)
+        for error in rendered.errors:
+            self._debug(f"Context source error: {error}")
+
+        out: List[bytes] = []
+        for block, events in rendered.events_for(self.prompt_name):
+            label = "contexto combinado" if block.combined else "contexto"
+            for length in block.fragment_lengths:
+                self._debug(f"📚 Enviando {label} ({block.role}) len={length}")
+            if extra_system and block.role == "SYSTEM":
+                # Fragmento extra (p. ej. nota de continuidad) dentro del mismo bloque SYSTEM
+                extra = {
+                    "event": {
+                        "textInput": {
+                            "promptName": self.prompt_name,
+                            "contentName": block.content_name,
+                            "content": extra_system,
+                        }
+                    }
+                }
+                out.extend(events[:-1])
+                out.append(json.dumps(extra).encode("utf-8"))
+                out.append(events[-1])
+                extra_system = None
             else:
-                for fragment in fragments:
-                    self._debug(f"📚 Enviando contexto ({role}) len={len(fragment)}")
-                    await self._send_text_block(fragment, role=role)
-                    await asyncio.sleep(0.05)
+                out.extend(events)
+
+        if extra_system:
+            out.extend(self._text_block_bytes(extra_system, "SYSTEM"))
+        return out
+
+    def _text_block_bytes(self, text: str, role: str) -> List[bytes]:
+        return [json.dumps(event).encode("utf-8") for event in self._build_text_block_events(text, role)]
 
-    async def _send_combined_text_block(self, role: str, fragments: List[str]) -> None:
+    def _build_text_block_events(self, text: str, role: str) -> List[Dict[str, Any]]:
         content_name = f"text-{uuid.uuid4().hex}"
-        start = {
-            "event": {
-                "contentStart": {
-                    "promptName": self.prompt_name,
-                    "contentName": content_name,
-                    "role": role,
-                    "type": "TEXT",
-                    "interactive": False,
-                    "textInputConfiguration": {"mediaType": "text/plain"},
-                }
-            }
-        }
-        end = {
-            "event": {
-                "contentEnd": {
-                    "promptName": self.prompt_name,
-                    "contentName": content_name,
+        return [
+            {
+                "event": {
+                    "contentStart": {
+                        "promptName": self.prompt_name,
+                        "contentName": content_name,
+                        "role": role,
+                        "type": "TEXT",
+                        "interactive": False,
+                        "textInputConfiguration": {"mediaType": "text/plain"}
+                    }
                 }
-            }
-        }
-
-        await self._send_event(start)
-        # OPTIMIZACIÓN: Sleep eliminado - no necesario entre eventos
-        for fragment in fragments:
-            self._debug(f"📚 Enviando contexto combinado ({role}) len={len(fragment)}")
-            body = {
+            },
+            {
                 "event": {
                     "textInput": {
                         "promptName": self.prompt_name,
                         "contentName": content_name,
-                        "content": fragment,
+                        "content": text
                     }
                 }
-            }
-            await self._send_event(body)
-            # OPTIMIZACIÓN: Sleep eliminado - no necesario entre eventos
-        await self._send_event(end)
-        # OPTIMIZACIÓN: Sleep eliminado - no necesario entre eventos
-
-    async def _send_text_block(self, text: str, role: str) -> None:
-        content_name = f"text-{uuid.uuid4().hex}"
-        start = {
-            "event": {
-                "contentStart": {
-                    "promptName": self.prompt_name,
-                    "contentName": content_name,
-                    "role": role,
-                    "type": "TEXT",
-                    "interactive": False,
-                    "textInputConfiguration": {"mediaType": "text/plain"}
-                }
-            }
-        }
-        body = {
-            "event": {
-                "textInput": {
-                    "promptName": self.prompt_name,
-                    "contentName": content_name,
-                    "content": text
-                }
-            }
-        }
-        end = {
-            "event": {
-                "contentEnd": {
-                    "promptName": self.prompt_name,
-                    "contentName": content_name
+            },
+            {
+                "event": {
+                    "contentEnd": {
+                        "promptName": self.prompt_name,
+                        "contentName": content_name
+                    }
                 }
-            }
-        }
-        await self._send_event(start)
-        # OPTIMIZACIÓN: Sleep eliminado - no necesario entre eventos
-        await self._send_event(body)
-        # OPTIMIZACIÓN: Sleep eliminado - no necesario entre eventos
-        await self._send_event(end)
+            },
+        ]
+
+    async def _send_text_block(
+        self,
+        text: str,
+        role: str,
+        priority: SendPriority = SendPriority.TEXT,
+    ) -> None:
+        for event in self._build_text_block_events(text, role):
+            # OPTIMIZACIÓN: Sleep eliminado - no necesario entre eventos
+            await self._send_event(event, priority=priority)
 
-    async def _send_event(self, payload: Dict[str, Any]) -> None:
+    async def _send_event(
+        self,
+        payload: Dict[str, Any],
+        priority: SendPriority = SendPriority.LIFECYCLE,
+    ) -> None:
         if not self.stream_response:
             raise RuntimeError("El stream bidireccional no está inicializado")
         data = json.dumps(payload)  # Removed ensure_ascii=True para mejor compatibilidad
         self._last_payload_sent = data
-        chunk = InvokeModelWithBidirectionalStreamInputChunk(
-            value=BidirectionalInputPayloadPart(bytes_=data.encode("utf-8"))
-        )
         event_keys = list(payload.get("event", {}).keys()) if isinstance(payload, dict) else []
         
         # Solo loggear eventos importantes, no audio chunks para reducir ruido
@@ -688,21 +1393,90 @@ class BedrockStreamManager:
             preview = data[:160]
             self._debug(f"→ Evento enviado ({event_keys}): {preview}")
         
-        async with self._send_lock:
-            await self.stream_response.input_stream.send(chunk)
+        # El sender único decide el orden; aquí solo esperamos a que salga
+        await self._outbound.submit(data.encode("utf-8"), priority)
+
+    async def _send_serialized(self, data: bytes, priority: SendPriority) -> None:
+        """Envía un evento ya serializado (p. ej. desde la caché de contexto)."""
+        if not self.stream_response:
+            raise RuntimeError("El stream bidireccional no está inicializado")
+        self._last_payload_sent = data[:160].decode("utf-8", "replace")
+        await self._outbound.submit(data, priority)
+
+    async def _write_chunk(self, data: bytes) -> None:
+        """Writer del planificador de salida: escribe en el stream vigente."""
+        if not self.stream_response:
+            raise RuntimeError("El stream bidireccional no está inicializado")
+        await self._write_to(self.stream_response, data)
+
+    @staticmethod
+    async def _write_to(stream: Any, data: bytes) -> None:
+        chunk = InvokeModelWithBidirectionalStreamInputChunk(
+            value=BidirectionalInputPayloadPart(bytes_=data)
+        )
+        await stream.input_stream.send(chunk)
 
     async def _drain_audio_queue(self) -> None:
         try:
             while True:
-                chunk = await self.audio_input_queue.get()
+                if self._audio_carry is not None:
+                    chunk, self._audio_carry = self._audio_carry, None
+                else:
+                    chunk = await self.audio_input_queue.get()
                 if chunk is None:
                     break
-                await self._send_audio_chunk(chunk)
+                chunk, merged, reached_end = self._coalesce_backlog(chunk)
                 await self._pace_audio_stream(len(chunk))
+                await self._send_audio_chunk(chunk)
+                self._record_uplink_event(merged)
+                if reached_end:
+                    break
         except asyncio.CancelledError:
             pass
         finally:
-            self._audio_send_clock = None
+            self._pacer.reset()
+            self._audio_carry = None
+
+    def _coalesce_backlog(self, first: bytes) -> Tuple[bytes, int, bool]:
+        """Fusiona el backlog de la cola en un solo chunk de hasta ``_audio_coalesce_max_bytes``.
+
+        Sin backlog devuelve el chunk tal cual (frames pequeños, sin copias).
+        Retorna ``(chunk, chunks_fusionados, fin_de_cola)``.
+        """
+        limit = self._audio_coalesce_max_bytes
+        if limit <= 0 or self.audio_input_queue.empty() or len(first) >= limit:
+            return first, 1, False
+
+        parts = [first]
+        total = len(first)
+        reached_end = False
+        while total < limit:
+            try:
+                nxt = self.audio_input_queue.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+            if nxt is None:
+                reached_end = True
+                break
+            if total + len(nxt) > limit:
+                # No cabe: se envía en la siguiente iteración
+                self._audio_carry = nxt
+                break
+            parts.append(nxt)
+            total += len(nxt)
+
+        if len(parts) == 1:
+            return first, 1, reached_end
+        return b"".join(parts), len(parts), reached_end
+
+    def _record_uplink_event(self, merged_chunks: int) -> None:
+        metrics = self._stream_metrics
+        metrics["uplink_chunks_in"] += merged_chunks
+        metrics["uplink_events_out"] += 1
+        if merged_chunks > 1:
+            metrics["uplink_coalesced_events"] += 1
+            if merged_chunks > metrics["uplink_max_chunks_per_event"]:
+                metrics["uplink_max_chunks_per_event"] = merged_chunks
 
     async def _send_audio_chunk(self, audio_bytes: bytes) -> None:
         if not audio_bytes or not getattr(self, "audio_content_name", None):
@@ -719,65 +1493,44 @@ class BedrockStreamManager:
         }
         # No loggear cada audio chunk - genera ruido excesivo
         # self._debug(f"→ Audio chunk {len(audio_bytes)} bytes (b64 len {len(blob)})")
-        await self._send_event(event)
+        await self._send_event(event, priority=SendPriority.AUDIO)
+        if self._call_started_at is not None:
+            elapsed_ms = (time.perf_counter() - self._call_started_at) * 1000.0
+            self._call_started_at = None
+            self._stream_metrics["first_audio_accepted_ms"] = round(elapsed_ms, 1)
+            self._debug(f"🎙️ Primer audio aceptado a {elapsed_ms:.0f} ms del inicio de la llamada")
+            # Sesión real (no un stream del pool sin usar) para las métricas del perfil
+            get_inference_stats().record_session(self._inference)
 
     async def _pace_audio_stream(self, byte_count: int) -> None:
-        # OPTIMIZACIÓN: Pacing desactivado - audio ya llega en tiempo real desde MediaRecorder
-        # Nova Sonic puede procesar más rápido que tiempo real para reducir latencia
-        # El navegador controla el timing con timeslice de MediaRecorder
-        return
-        
-        # Código original comentado (causaba +100ms por chunk):
-        # bytes_per_second = INPUT_SAMPLE_RATE * CHANNELS * PCM_SAMPLE_WIDTH
-        # if bytes_per_second <= 0 or byte_count <= 0:
-        #     return
-        # duration = byte_count / bytes_per_second
-        # now = time.monotonic()
-        # target = self._audio_send_clock or now
-        # if target < now:
-        #     target = now
-        # target += duration
-        # self._audio_send_clock = target
-        # delay = target - time.monotonic()
-        # if delay > 0:
-        #     await asyncio.sleep(min(delay, 0.1))
-
-    async def _monitor_silence(self) -> None:
-        """Monitor de silencios: envía contentEnd automático después de 800ms sin audio."""
+        # Token bucket con reloj monotónico: solo duerme si el audio se adelanta
+        # al tiempo real más el lookahead permitido (nunca un sleep fijo por chunk)
+        await self._pacer.pace(byte_count)
+
+    def _on_silence_deadline(self) -> None:
+        """Vence el plazo de silencio: fin de turno automático tras ``_silence_timeout`` sin audio."""
+        if not self.is_active or not self._turn_active or self._last_audio_chunk_received is None:
+            return
+        silence_duration = self._silence_timer.time() - self._last_audio_chunk_received
+        self._turn_active = False
+        self._debug(f"🔇 Silencio detectado ({silence_duration:.2f}s), enviando señal de fin de turno")
+
+        # Enviar señal interna de fin de turno (simular contentEnd del usuario)
+        # Esto permite que el modelo empiece a procesar sin esperar indefinidamente
         try:
-            while self.is_active:
-                await asyncio.sleep(0.1)  # Check cada 100ms
-                
-                if not self._turn_active or not self._last_audio_chunk_received:
-                    continue
-                
-                silence_duration = time.time() - self._last_audio_chunk_received
-                
-                # Si llevamos más de 800ms sin audio, asumir que usuario terminó
-                if silence_duration > self._silence_timeout:
-                    self._turn_active = False
-                    self._debug(f"🔇 Silencio detectado ({silence_duration:.2f}s), enviando señal de fin de turno")
-                    
-                    # Enviar señal interna de fin de turno (simular contentEnd del usuario)
-                    # Esto permite que el modelo empiece a procesar sin esperar indefinidamente
-                    try:
-                        # Marcar timestamp para medir latencia
-                        self._last_user_audio_end = time.time()
-                        self._debug("📍 Fin de turno detectado automáticamente")
-                        
-                        # Llamar a on_content_end del processor
-                        self.processor.on_content_end()
-                        
-                        # Resetear last_audio_chunk para evitar múltiples triggers
-                        self._last_audio_chunk_received = None
-                        
-                    except Exception as exc:
-                        self._debug(f"⚠️ Error enviando señal de fin de turno: {exc}")
-                        
-        except asyncio.CancelledError:
-            pass
+            # Marcar timestamp para medir latencia
+            self._last_user_audio_end = time.time()
+            self._debug("📍 Fin de turno detectado automáticamente")
+            self._expect_response()
+
+            # Llamar a on_content_end del processor
+            self.processor.on_content_end()
+
+            # Resetear last_audio_chunk para evitar múltiples triggers
+            self._last_audio_chunk_received = None
+
         except Exception as exc:
-            self._debug(f"⚠️ Error en monitor de silencios: {exc}")
+            self._debug(f"⚠️ Error enviando señal de fin de turno: {exc}")
 
     # ------------------------------- tuning
     def set_silence_timeout(self, seconds: float) -> None:
@@ -794,105 +1547,177 @@ class BedrockStreamManager:
         if abs(self._silence_timeout - seconds) >= 0.05:
             self._silence_timeout = seconds
             self._debug(f"🛠️ Silence timeout ajustado a {self._silence_timeout:.2f}s")
+            # Recalcular el plazo del turno en curso con el nuevo timeout
+            if self._turn_active and self._last_audio_chunk_received is not None:
+                self._silence_timer.reschedule_at(self._last_audio_chunk_received + seconds)
 
     async def _read_loop(self) -> None:
         try:
-            while self.is_active and self.stream_response:
+            # Un único receptor por vida del stream (el lector queda ligado a su stream)
+            stream = self.stream_response
+            if not stream:
+                return
+            receiver = (await stream.await_output())[1]
+            while self.is_active:
                 try:
-                    output = await self.stream_response.await_output()
-                    message = await output[1].receive()
+                    message = await receiver.receive()
                 except StopAsyncIteration:
                     break
                 if not message or not message.value or not message.value.bytes_:
                     continue
-                raw = message.value.bytes_.decode("utf-8")
-                try:
-                    payload = json.loads(raw)
-                except json.JSONDecodeError:
-                    self.output_subject.on_next({"raw": raw})
-                    continue
-                await self._handle_model_payload(payload)
+                await self._dispatch_inbound(message.value.bytes_)
         except asyncio.CancelledError:
             pass
         except Exception as exc:
             error_msg = str(exc)
+            kind = classify_error(exc)
+            self._stream_metrics["stream_errors"] += 1
+            self._stream_metrics["errors_by_kind"][kind.value] += 1
+            if kind is ErrorKind.THROTTLING:
+                self._stream_metrics["throttle_errors"] += 1
+            elif kind is ErrorKind.AUTH:
+                refresh_credentials(self.region)
+            if self._handshaking and self._reader_task is asyncio.current_task():
+                self._debug(f"❌ Stream rechazado durante el handshake: {error_msg}")
+                raise
             self._debug(
                 f"Falla leyendo stream: {error_msg} | último evento enviado: {self._last_payload_sent[:120] if self._last_payload_sent else 'N/A'}"
             )
             
+            if time.monotonic() < self._prompt_switch_probation_until:
+                # Rechazo del promptStart del cambio en el mismo stream: se reconecta con el
+                # contexto nuevo y los próximos cambios rotan el stream
+                self._prompt_switch_probation_until = 0.0
+                self._in_stream_switch_enabled = False
+                self._stream_metrics["prompt_switch_fallbacks"] += 1
+                retryable = True
+            else:
+                retryable = kind.retryable
             # Verificar si es un error transitorio y si podemos reintentar
-            if is_transient_error(exc) and self._retry_count < MAX_RETRY_ATTEMPTS:
-                self._retry_count += 1
-                delay = RETRY_DELAYS[min(self._retry_count - 1, len(RETRY_DELAYS) - 1)]
-                
-                self._debug(f"🔄 Error transitorio detectado. Reintento {self._retry_count}/{MAX_RETRY_ATTEMPTS} en {delay}s")
-                
-                # Emitir evento de reconexión al frontend
-                self.output_subject.on_next({
-                    "event": {
-                        "streamReconnecting": {
-                            "attempt": self._retry_count,
-                            "maxAttempts": MAX_RETRY_ATTEMPTS,
-                            "delaySeconds": delay,
-                            "reason": error_msg
-                        }
-                    }
-                })
-                
-                # Intentar reconexión
-                try:
-                    await self._attempt_reconnection(delay)
-                    self._debug(f"✅ Reconexión exitosa (intento {self._retry_count})")
-                    
-                    # Emitir evento de reconexión exitosa
-                    self.output_subject.on_next({
-                        "event": {
-                            "streamReconnected": {
-                                "attempt": self._retry_count
-                            }
-                        }
-                    })
-                    
-                    # Resetear contador de reintentos tras éxito
-                    self._retry_count = 0
-                    return  # Salir del loop actual, se reiniciará automáticamente
-                    
-                except Exception as retry_exc:
-                    self._debug(f"❌ Fallo reintento {self._retry_count}: {retry_exc}")
-                    
-                    # Si aún quedan intentos, el loop continuará
-                    if self._retry_count < MAX_RETRY_ATTEMPTS:
-                        return  # Reintentar de nuevo
-                    else:
-                        # Sin más reintentos, propagar error
-                        self._debug(f"💀 Agotados {MAX_RETRY_ATTEMPTS} reintentos. Error permanente.")
-                        self.output_subject.on_next({
-                            "event": {
-                                "streamError": {
-                                    "fatal": True,
-                                    "reason": f"Fallo después de {MAX_RETRY_ATTEMPTS} reintentos: {error_msg}"
-                                }
-                            }
-                        })
-                        self.output_subject.on_error(exc)
+            if retryable and self._retry_count < MAX_RETRY_ATTEMPTS:
+                await self._recover_stream(exc)
             else:
                 # Error no retryable o se agotaron reintentos
                 if self._retry_count >= MAX_RETRY_ATTEMPTS:
                     self._debug(f"💀 Sin más reintentos disponibles")
                 else:
-                    self._debug(f"❌ Error no retryable: {error_msg}")
+                    self._debug(f"❌ Error no retryable ({kind.value}): {error_msg}")
+                get_retry_coordinator(self.region).record_failure(kind)
                 
                 self.output_subject.on_next({
                     "event": {
                         "streamError": {
                             "fatal": True,
-                            "reason": error_msg
+                            "reason": error_msg,
+                            "kind": kind.value
                         }
                     }
                 })
                 self.output_subject.on_error(exc)
         finally:
-            self.is_active = False
+            # Tras una reconexión exitosa el nuevo lector es el dueño del stream;
+            # un fallo en el handshake lo resuelve quien lo está enviando
+            if self._reader_task is asyncio.current_task() and not self._handshaking:
+                self.is_active = False
+
+    async def _recover_stream(self, exc: Exception) -> bool:
+        """Reintenta la reconexión con el backoff del coordinador del worker.
+
+        Devuelve True si el stream quedó reconectado; si se agotan los intentos
+        (o el presupuesto compartido de reintentos) emite streamError fatal.
+        """
+        error_msg = str(exc)
+        kind = classify_error(exc)
+        coordinator = get_retry_coordinator(self.region)
+        coordinator.record_failure(kind)
+        give_up = f"Fallo después de {MAX_RETRY_ATTEMPTS} reintentos"
+        # Desde ya el audio entrante se retiene para reenviarlo
+        self._is_reconnecting = True
+        while self.is_active and self._retry_count < MAX_RETRY_ATTEMPTS:
+            # Reintentar contra una región con el circuito abierto solo espera el enfriamiento
+            if self._failover_region():
+                coordinator = get_retry_coordinator(self.region)
+            delay = coordinator.acquire_retry(kind, self._retry_count + 1)
+            if delay is None:
+                self._stream_metrics["retries_denied"] += 1
+                give_up = "Presupuesto de reintentos del worker agotado"
+                self._debug(f"⛔ Reintento denegado: presupuesto de reintentos agotado ({kind.value})")
+                break
+            self._retry_count += 1
+            
+            self._debug(
+                f"🔄 Error transitorio ({kind.value}). Reintento {self._retry_count}/{MAX_RETRY_ATTEMPTS} en {delay:.2f}s"
+            )
+            
+            # Emitir evento de reconexión al frontend
+            self.output_subject.on_next({
+                "event": {
+                    "streamReconnecting": {
+                        "attempt": self._retry_count,
+                        "maxAttempts": MAX_RETRY_ATTEMPTS,
+                        "delaySeconds": round(delay, 2),
+                        "reason": error_msg,
+                        "kind": kind.value
+                    }
+                }
+            })
+            
+            try:
+                await self._attempt_reconnection(delay)
+            except Exception as retry_exc:
+                kind = classify_error(retry_exc)
+                coordinator.record_failure(kind)
+                self._debug(f"❌ Fallo reintento {self._retry_count} ({kind.value}): {retry_exc}")
+                if not kind.retryable:
+                    give_up = f"Error no retryable al reconectar ({kind.value})"
+                    error_msg = str(retry_exc)
+                    break
+                continue
+
+            coordinator.record_success()
+            self._debug(f"✅ Reconexión exitosa (intento {self._retry_count})")
+            self.output_subject.on_next({
+                "event": {
+                    "streamReconnected": {
+                        "attempt": self._retry_count
+                    }
+                }
+            })
+            # Resetear contador de reintentos tras éxito
+            self._retry_count = 0
+            return True
+
+        self._is_reconnecting = False
+        self._discard_gap_audio()
+        if not self.is_active:
+            return False
+        self._debug(f"💀 {give_up}. Error permanente.")
+        self.output_subject.on_next({
+            "event": {
+                "streamError": {
+                    "fatal": True,
+                    "reason": f"{give_up}: {error_msg}",
+                    "kind": kind.value
+                }
+            }
+        })
+        self.output_subject.on_error(exc)
+        return False
+
+    async def _dispatch_inbound(self, raw: bytes) -> None:
+        """Router de eventos entrantes: audioOutput por la vía rápida, el resto por tabla."""
+        self._last_inbound_at = time.monotonic()
+        audio_b64 = extract_audio_output(raw)
+        if audio_b64 is not None:
+            # Vía rápida: sin json.loads completo, sin log genérico ni broadcast al Subject
+            self._on_audio_output_b64(audio_b64)
+            return
+        try:
+            payload = json.loads(raw)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            self.output_subject.on_next({"raw": raw.decode("utf-8", "replace")})
+            return
+        await self._handle_model_payload(payload)
 
     async def _handle_model_payload(self, payload: Dict[str, Any]) -> None:
         if "error" in payload:
@@ -915,135 +1740,308 @@ class BedrockStreamManager:
             self.output_subject.on_next(payload)
             return
 
-        # Logear claves de eventos para depuración de métricas/uso
-        try:
+        # Logear claves de eventos para depuración de métricas/uso (solo con NOVA_SONIC_DEBUG:
+        # el adapter siempre pasa un callback y esto corre en cada evento)
+        if DEBUG:
             self._debug(f"🧩 Evento recibido: keys={list(event.keys())}")
-        except Exception:
-            pass
 
-        if "promptEnd" in event:
-            # El modelo confirma que el prompt está listo
-            self._debug("✅ Recibido promptEnd - modelo listo para audio")
-            self._prompt_ready.set()
+        broadcast = True
+        for key, body in event.items():
+            if key == "audioOutput":
+                self._on_audio_output_b64(body.get("content"))
+                continue
+            handler = self._EVENT_HANDLERS.get(key)
+            if handler is None:
+                continue
+            result = handler(self, body)
+            if inspect.isawaitable(result):
+                result = await result
+            if result is False:
+                broadcast = False
 
-        elif "contentStart" in event:
-            content = event["contentStart"]
-            self._current_role = content.get("role", self._current_role)
-            self._current_content_type = content.get("type")
-            
-            # Log de inicio de respuesta del asistente
-            if self._current_role == "ASSISTANT" and self._last_user_audio_end:
-                latency = time.time() - self._last_user_audio_end
-                self._debug(f"⏱️ LATENCIA: {latency:.2f}s desde fin audio usuario hasta contentStart asistente")
-                self._last_assistant_response_start = time.time()
-                
-                # OPTIMIZACIÓN: Resetear estado de turno cuando asistente responde
-                self._turn_active = False
-            
-            additional = content.get("additionalModelFields")
-            if isinstance(additional, str):
-                try:
-                    fields = json.loads(additional)
-                    stage = fields.get("generationStage")
-                    self.display_assistant_text = stage not in {"SPECULATIVE", "DRAFT"}
-                except json.JSONDecodeError:
-                    pass
-
-        elif "contentEnd" in event:
-            content = event["contentEnd"]
-            content_type = content.get("type")
-            
-            # Log de fin de audio del usuario
-            if content_type == "AUDIO" and self._current_role == "USER":
-                self._last_user_audio_end = time.time()
-                self._debug("📍 Usuario terminó de hablar (contentEnd AUDIO)")
+        if broadcast:
+            self.output_subject.on_next(payload)
+
+    def _on_prompt_end(self, body: Dict[str, Any]) -> None:
+        # Informativo: el audio ya no espera este evento (se abre en el handshake)
+        self._debug("✅ Recibido promptEnd")
+
+    def _on_content_start(self, content: Dict[str, Any]) -> None:
+        self._current_role = content.get("role", self._current_role)
+        self._current_content_type = content.get("type")
+        
+        # Log de inicio de respuesta del asistente
+        if self._current_role == "ASSISTANT" and self._current_content_type == "AUDIO":
+            self._assistant_turn_open = True
+        if self._current_role == "ASSISTANT" and self._last_user_audio_end:
+            latency = time.time() - self._last_user_audio_end
+            self._debug(f"⏱️ LATENCIA: {latency:.2f}s desde fin audio usuario hasta contentStart asistente")
+            if self._stream_metrics["first_response_latency_ms"] is None:
+                self._stream_metrics["first_response_latency_ms"] = round(latency * 1000.0, 1)
+            if self._response_latency_recorded_for != self._last_user_audio_end:
+                self._response_latency_recorded_for = self._last_user_audio_end
+                get_inference_stats().record_response(self._inference, latency * 1000.0)
+                get_region_selector().record_first_event(self.region, latency * 1000.0)
+            self._last_assistant_response_start = time.time()
             
-            if content_type == "AUDIO":
-                self.processor.on_content_end()
-            if content_type == "TOOL":
-                await self._execute_pending_tool()
-            self.suppress_audio_until_content_end = False
-
-        elif "textOutput" in event:
-            text = event["textOutput"].get("content", "")
-            if not text:
-                self.output_subject.on_next(payload)
-                return
-            normalized = self._normalize_text(text)
-            # Filtrar mensajes de control que vienen como JSON embebido (p.ej. {"interrupted": true})
-            ctrl = normalized.strip()
-            if (ctrl.startswith("{") and ctrl.endswith("}")):
-                try:
-                    ctrl_obj = json.loads(ctrl)
-                    if any(k in ctrl_obj for k in ("interrupted", "bargeIn", "stopped", "segment")):
-                        self._debug("⏭️ Mensaje de control (JSON) omitido en transcript")
-                        return
-                except Exception:
-                    pass
-            # También filtrar strings de control simples
-            if "\"interrupted\"" in ctrl or ctrl.lower() == "interrupted":
-                self._debug("⏭️ Señal 'interrupted' omitida en transcript")
-                return
+            # OPTIMIZACIÓN: Resetear estado de turno cuando asistente responde
+            self._turn_active = False
+        
+        additional = content.get("additionalModelFields")
+        if isinstance(additional, str):
+            try:
+                fields = json.loads(additional)
+                stage = fields.get("generationStage")
+                self.display_assistant_text = stage not in {"SPECULATIVE", "DRAFT"}
+            except json.JSONDecodeError:
+                pass
+
+    def _on_content_end(self, content: Dict[str, Any]) -> None:
+        content_type = content.get("type")
+        
+        # Log de fin de audio del usuario
+        if content_type == "AUDIO" and self._current_role == "USER":
+            self._last_user_audio_end = time.time()
+            self._debug("📍 Usuario terminó de hablar (contentEnd AUDIO)")
+        
+        if content_type == "AUDIO":
+            self.processor.on_content_end()
             if self._current_role == "ASSISTANT":
-                # Filtro más robusto: comparar con último texto ASSISTANT sin importar rol intermedio
-                last_assistant = self._last_text_by_role.get("ASSISTANT")
-                if normalized and last_assistant and normalized == last_assistant:
-                    self._debug("🔁 Texto del asistente repetido, se omite")
-                    return
-                if self.processor.maybe_capture_action(text):
-                    self.suppress_audio_until_content_end = True
-                    self.barge_in = True
-                else:
-                    self.processor.on_assistant_text(text)
-                    if normalized:
-                        self._last_text_by_role["ASSISTANT"] = normalized
-                        self._last_emitted_role = "ASSISTANT"
-            elif self._current_role == "USER":
-                # Filtro más robusto: comparar con último texto USER sin importar rol intermedio
-                last_user = self._last_text_by_role.get("USER")
-                if normalized and last_user and normalized == last_user:
-                    self._debug("🔁 Texto del usuario repetido, se omite")
-                    return
-                self.processor.on_user_text(text)
+                self._assistant_turn_open = False
+        if self._current_role == "ASSISTANT" and content.get("stopReason") == "INTERRUPTED":
+            self._flush_playback("contentEnd INTERRUPTED")
+        if content_type == "TOOL":
+            self._start_pending_tool()
+        self.suppress_audio_until_content_end = False
+        # Pausa natural (el asistente terminó su turno): cierre contable y rollover si toca
+        if (
+            content_type == "AUDIO"
+            and self._current_role == "ASSISTANT"
+            and content.get("stopReason") == "END_TURN"
+        ):
+            turn_index = self._usage.turn_index
+            turn = self._usage.close_turn()
+            injected = self._injections.close_turn(turn_index)
+            if injected:
+                self._debug(f"📝 Turno {turn_index}: {injected['blocks']} bloque(s) inyectado(s), ~{injected['tokens']} tokens")
+            if turn:
+                self._debug(f"💰 Turno {turn['index']}: {turn['totalTokens']} tokens, ${turn['costUsd']:.4f}")
+                get_inference_stats().record_turn(self._inference, turn)
+            self._publish_usage()
+            self._maybe_schedule_rollover()
+
+    def _on_text_output(self, body: Dict[str, Any]) -> Optional[bool]:
+        text = body.get("content", "")
+        if not text:
+            return None
+        normalized = self._normalize_text(text)
+        # Filtrar mensajes de control que vienen como JSON embebido (p.ej. {"interrupted": true})
+        ctrl = normalized.strip()
+        if (ctrl.startswith("{") and ctrl.endswith("}")):
+            try:
+                ctrl_obj = json.loads(ctrl)
+                if any(k in ctrl_obj for k in ("interrupted", "bargeIn", "stopped", "segment")):
+                    self._debug("⏭️ Mensaje de control (JSON) omitido en transcript")
+                    if ctrl_obj.get("interrupted") or ctrl_obj.get("bargeIn"):
+                        self._flush_playback("interrupted")
+                    return False
+            except Exception:
+                pass
+        # También filtrar strings de control simples
+        if "\"interrupted\"" in ctrl or ctrl.lower() == "interrupted":
+            self._debug("⏭️ Señal 'interrupted' omitida en transcript")
+            self._flush_playback("interrupted")
+            return False
+        if self._current_role == "ASSISTANT":
+            if not self.display_assistant_text:
+                # SPECULATIVE/DRAFT: a la UI ya mismo como provisional; el FINAL lo reconcilia
+                if normalized and not self.suppress_audio_until_content_end:
+                    self._emit_speculative_text(normalized)
+                return False
+            # Filtro más robusto: comparar con último texto ASSISTANT sin importar rol intermedio
+            last_assistant = self._last_text_by_role.get("ASSISTANT")
+            if normalized and last_assistant and normalized == last_assistant:
+                self._debug("🔁 Texto del asistente repetido, se omite")
+                return False
+            if self.processor.maybe_capture_action(text):
+                self.suppress_audio_until_content_end = True
+                self.barge_in = True
+            else:
                 if normalized:
-                    self._last_text_by_role["USER"] = normalized
-                    self._last_emitted_role = "USER"
-
-        elif "audioOutput" in event:
-            if not self.suppress_audio_until_content_end:
-                audio_b64 = event["audioOutput"].get("content")
-                if audio_b64:
-                    # Log del primer chunk de audio de respuesta
-                    if self._last_assistant_response_start:
-                        tts_latency = time.time() - self._last_assistant_response_start
-                        self._debug(f"⏱️ TTS: {tts_latency:.2f}s desde contentStart hasta primer audioOutput")
-                        self._last_assistant_response_start = None  # Solo log una vez
-                    
-                    audio_bytes = base64.b64decode(audio_b64)
-                    await self.audio_output_queue.put(audio_bytes)
-
-        elif "toolUse" in event:
-            self._pending_tool_use = event["toolUse"]
-
-        elif "performanceMetrics" in event:
-            # Capturar métricas de uso (tokens y costos) usando función centralizada
-            metrics = event["performanceMetrics"]
-            self._debug(f"📊 Métricas recibidas: {metrics}")
-            
-            usage_payload = _parse_usage_metrics(metrics, self._usage_totals)
-            if usage_payload and hasattr(self.processor, 'on_usage_update'):
-                self.processor.on_usage_update(usage_payload)
-
-        elif "usageEvent" in event:
-            # Variante nueva de métricas de uso - usar la misma función centralizada
-            metrics = event["usageEvent"]
-            self._debug(f"📊 usageEvent: {metrics}")
-            
-            usage_payload = _parse_usage_metrics(metrics, self._usage_totals)
-            if usage_payload and hasattr(self.processor, 'on_usage_update'):
-                self.processor.on_usage_update(usage_payload)
+                    # Antes que el processor: así el adaptador sabe que la UI ya tiene este texto
+                    self._reconcile_speculative_text(normalized)
+                self.processor.on_assistant_text(text)
+                if normalized:
+                    self._last_text_by_role["ASSISTANT"] = normalized
+                    self._last_emitted_role = "ASSISTANT"
+                    self._record_transcript("ASSISTANT", normalized)
+        elif self._current_role == "USER":
+            # Filtro más robusto: comparar con último texto USER sin importar rol intermedio
+            last_user = self._last_text_by_role.get("USER")
+            if normalized and last_user and normalized == last_user:
+                self._debug("🔁 Texto del usuario repetido, se omite")
+                return False
+            self.processor.on_user_text(text)
+            if normalized:
+                self._last_text_by_role["USER"] = normalized
+                self._last_emitted_role = "USER"
+                self._record_transcript("USER", normalized)
+        return None
+
+    def _on_audio_output_b64(self, audio_b64: Optional[str]) -> None:
+        if self.suppress_audio_until_content_end or not audio_b64:
+            return
+        # Log del primer chunk de audio de respuesta
+        if self._last_assistant_response_start:
+            tts_latency = time.time() - self._last_assistant_response_start
+            self._debug(f"⏱️ TTS: {tts_latency:.2f}s desde contentStart hasta primer audioOutput")
+            self._last_assistant_response_start = None  # Solo log una vez
+        
+        # Passthrough: el base64 original llega al navegador sin decodificar
+        self._usage.note_assistant_audio(len(audio_b64) * 0.75 / _OUTPUT_BYTES_PER_SECOND)
+        self._output_seq += 1
+        self.audio_output_queue.put_nowait(OutputAudioChunk(audio_b64, self._output_seq))
+
+    def _on_tool_use(self, body: Dict[str, Any]) -> None:
+        self._pending_tool_use = body
+
+    def _on_usage_metrics(self, metrics: Dict[str, Any]) -> None:
+        # Uso de tokens (performanceMetrics y su variante nueva usageEvent) atribuido por turno
+        self._debug(f"📊 Métricas recibidas: {metrics}")
+        if self._usage.record(metrics):
+            self._publish_usage()
+
+    def _publish_usage(self) -> None:
+        payload = self._usage.payload()
+        if self._budget.enabled:
+            payload["budget"] = self._budget.get_metrics()
+        if hasattr(self.processor, 'on_usage_update'):
+            self.processor.on_usage_update(payload)
+        # El presupuesto se evalúa con la proyección (incluye la estimación por audio)
+        tokens, cost = self._usage.projected()
+        level = self._budget.check(cost, tokens)
+        if level:
+            self._emit_budget_alert(level, cost, tokens)
+
+    def _emit_budget_alert(self, level: str, cost: float, tokens: int) -> None:
+        budget = self._budget
+        self._debug(
+            f"💰 Presupuesto {'agotado' if level == 'exceeded' else 'por agotarse'}: "
+            f"${cost:.4f} / {tokens} tokens (acción: {budget.action})"
+        )
+        self.output_subject.on_next({
+            "event": {
+                "budgetAlert": {
+                    "level": level,
+                    "action": budget.action,
+                    "fallbackPrompt": budget.fallback_prompt,
+                    "costUsd": cost,
+                    "tokens": tokens,
+                    "ratio": round(budget.usage_ratio(cost, tokens), 3),
+                    "maxCostUsd": budget.max_cost_usd,
+                    "maxTokens": budget.max_tokens,
+                }
+            }
+        })
+
+    _EVENT_HANDLERS: Dict[str, Callable[..., Any]] = {
+        "promptEnd": _on_prompt_end,
+        "contentStart": _on_content_start,
+        "contentEnd": _on_content_end,
+        "textOutput": _on_text_output,
+        "toolUse": _on_tool_use,
+        "performanceMetrics": _on_usage_metrics,
+        "usageEvent": _on_usage_metrics,
+    }
 
-        self.output_subject.on_next(payload)
+    def _flush_playback(self, reason: str) -> None:
+        """Barge-in: descarta el TTS en cola y avisa al cliente hasta qué secuencia cortar."""
+        # Lo provisional que no se llegó a decir no tendrá FINAL
+        self._close_speculative_segments(reason)
+        # interrupted y contentEnd INTERRUPTED llegan juntos: un solo flush por interrupción
+        if self._output_seq == self._flushed_seq:
+            return
+        started = time.perf_counter()
+        dropped = 0
+        while True:
+            try:
+                self.audio_output_queue.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+            dropped += 1
+        # Lo que aún llegue del contenido interrumpido se descarta hasta su contentEnd
+        self.suppress_audio_until_content_end = True
+        self._flushed_seq = self._output_seq
+        flush_ms = round((time.perf_counter() - started) * 1000.0, 3)
+
+        metrics = self._stream_metrics
+        metrics["barge_ins"] += 1
+        metrics["barge_in_dropped_chunks"] += dropped
+        metrics["last_barge_in_flush_ms"] = flush_ms
+        self._debug(f"✋ Barge-in ({reason}): {dropped} chunks TTS descartados, corte en seq {self._output_seq}")
+        self.output_subject.on_next({
+            "event": {
+                "playbackFlush": {
+                    "cutoffSeq": self._output_seq,
+                    "droppedChunks": dropped,
+                    "reason": reason,
+                    "serverFlushMs": flush_ms,
+                    "serverTsMs": int(time.time() * 1000),
+                }
+            }
+        })
+
+    def _emit_speculative_text(self, text: str) -> None:
+        self._speculative_count += 1
+        segment_id = f"seg-{self._speculative_count}"
+        self._speculative_segments.append((segment_id, text, time.perf_counter()))
+        self._stream_metrics["speculative_segments"] += 1
+        self.output_subject.on_next({
+            "event": {
+                "assistantTextPartial": {
+                    "segmentId": segment_id,
+                    "text": text,
+                    "final": False,
+                }
+            }
+        })
+
+    def _reconcile_speculative_text(self, final_text: str) -> None:
+        """Cierra el segmento provisional más antiguo con un diff contra el texto FINAL."""
+        if not self._speculative_segments:
+            return
+        segment_id, provisional, emitted_at = self._speculative_segments.popleft()
+        keep, tail = _text_diff(provisional, final_text)
+        lead_ms = round((time.perf_counter() - emitted_at) * 1000.0, 1)
+        metrics = self._stream_metrics
+        metrics["last_speculative_lead_ms"] = lead_ms
+        if provisional != final_text:
+            metrics["speculative_revisions"] += 1
+        self.output_subject.on_next({
+            "event": {
+                "assistantTextPartial": {
+                    "segmentId": segment_id,
+                    "final": True,
+                    "diff": {"keep": keep, "text": tail},
+                    "finalText": final_text,
+                    "leadMs": lead_ms,
+                }
+            }
+        })
+
+    def _close_speculative_segments(self, reason: str) -> None:
+        while self._speculative_segments:
+            segment_id, _, _ = self._speculative_segments.popleft()
+            self.output_subject.on_next({
+                "event": {
+                    "assistantTextPartial": {
+                        "segmentId": segment_id,
+                        "final": True,
+                        "interrupted": True,
+                        "reason": reason,
+                    }
+                }
+            })
 
     @staticmethod
     def _normalize_text(text: str) -> str:
@@ -1052,7 +2050,7 @@ class BedrockStreamManager:
             return ""
         return " ".join(stripped.split())
 
-    async def _execute_pending_tool(self) -> None:
+    def _start_pending_tool(self) -> None:
         if not self._pending_tool_use:
             return
         tool_use = self._pending_tool_use
@@ -1073,17 +2071,56 @@ class BedrockStreamManager:
         else:
             tool_input = tool_input_raw
 
-        self._debug(f"🔧 Ejecutando tool: {tool_name} con input: {tool_input}")
+        task = asyncio.create_task(self._execute_tool(tool_name, tool_input, tool_use_id))
+        self._tool_tasks.add(task)
+        task.add_done_callback(self._tool_tasks.discard)
+
+    def _tool_timeout_for(self, tool_name: Optional[str]) -> float:
+        return self._tool_timeouts.get(tool_name or "", TOOL_TIMEOUT_SECONDS)
 
+    async def _execute_tool(
+        self,
+        tool_name: Optional[str],
+        tool_input: Dict[str, Any],
+        tool_use_id: Optional[str],
+    ) -> None:
+        # El resultado solo vale para el stream que pidió el tool (no tras reconectar/rotar)
+        stream = self.stream_response
+        timeout = self._tool_timeout_for(tool_name)
+        self._debug(f"🔧 Ejecutando tool: {tool_name} con input: {tool_input} (plazo {timeout:g}s)")
+        self._stream_metrics["tool_calls"] += 1
+        started = time.perf_counter()
+
+        tool = self._tool_registry.get(tool_name) if self._tool_registry else None
         try:
-            result = self.processor.handle_tool_use(tool_name, tool_input)
-            if inspect.isawaitable(result):
-                result = await result
+            if tool is not None:
+                result, cache_hit = await self._tool_registry.invoke(
+                    tool, tool_input, self.processor,
+                    session_cache=self._tool_cache, timeout=timeout,
+                )
+                if cache_hit:
+                    self._stream_metrics["tool_cache_hits"] += 1
+                    self._debug(f"♻️ Resultado de {tool_name} servido desde caché ({tool.cache})")
+            else:
+                result = await run_tool_call(
+                    self.processor.handle_tool_use, tool_name, tool_input, timeout=timeout
+                )
             self._debug(f"✅ Tool ejecutado exitosamente: {result}")
+        except asyncio.TimeoutError:
+            self._stream_metrics["tool_timeouts"] += 1
+            self._debug(f"⏰ Tool {tool_name} excedió el plazo de {timeout:g}s")
+            result = tool_timeout_result(tool_name, timeout)
         except Exception as exc:
+            self._stream_metrics["tool_errors"] += 1
             self._debug(f"❌ Error ejecutando tool: {exc}")
             result = {"status": "error", "message": str(exc)}
+        self._stream_metrics["last_tool_ms"] = round((time.perf_counter() - started) * 1000.0, 1)
 
+        if not self.is_active:
+            return
+        if self.stream_response is not stream:
+            self._debug(f"⏭️ Resultado de {tool_name} descartado: el stream cambió durante la ejecución")
+            return
         await self._send_tool_result(tool_use_id, result)
 
     async def _send_tool_result(self, tool_use_id: Optional[str], result: Any) -> None:
@@ -1126,9 +2163,10 @@ class BedrockStreamManager:
                 }
             }
         }
-        await self._send_event(start)
-        await self._send_event(body)
-        await self._send_event(end)
+        await self._send_event(start, priority=SendPriority.TOOL_RESULT)
+        await self._send_event(body, priority=SendPriority.TOOL_RESULT)
+        await self._send_event(end, priority=SendPriority.TOOL_RESULT)
+        self._expect_response()
 
     async def send_audio_content_end_event(self) -> None:
         if not getattr(self, "audio_content_name", None):
@@ -4,6 +4,12 @@ This module wraps the official AWS sample flow so the web adapter can reuse
 it without copying logic across files. It keeps the handshake sequence close to
 https://github.com/aws-samples/amazon-nova-samples/ while exposing simple
 callbacks for text and audio events.
+
+It is also the ``lean`` session engine (see ``streaming/engine.py``): a prompt
+config with ``engine: lean`` runs on it instead of ``BedrockStreamManager``.
+No Subject, silence monitor, processor hooks or reconnection; events go to
+plain callbacks and TTS audio to ``audio_output_queue`` when ``on_audio`` is
+not set.
 """
 
 from __future__ import annotations
@@ -11,9 +17,10 @@ from __future__ import annotations
 import asyncio
 import base64
 import json
+import time
 import uuid
 from dataclasses import dataclass
-from typing import Callable, Iterable, Optional
+from typing import Any, Callable, Dict, Iterable, List, Optional
 
 from aws_sdk_bedrock_runtime.client import (
     BedrockRuntimeClient,
@@ -23,8 +30,16 @@ from aws_sdk_bedrock_runtime.models import (
     BidirectionalInputPayloadPart,
     InvokeModelWithBidirectionalStreamInputChunk,
 )
-from aws_sdk_bedrock_runtime.config import Config
-from smithy_aws_core.identity.environment import EnvironmentCredentialsResolver
+
+from config.constants import AUDIO_COALESCE_MAX_MS, PCM_SAMPLE_WIDTH
+from context.base import ContextSource
+from context.cache import get_context_cache
+from streaming.audio_frames import OutputAudioChunk, extract_audio_output
+from streaming.clients import get_shared_client, refresh_credentials
+from streaming.engine import ENGINE_LEAN, CallbackSubscription, SessionEngine
+from streaming.inference import InferenceProfile
+from streaming.regions import get_region_selector
+from streaming.retry import ErrorKind, classify_error, get_retry_coordinator
 
 
 @dataclass
@@ -39,9 +54,11 @@ UsageHandler = Callable[[dict], None]
 DebugHandler = Callable[[str], None]
 
 
-class NovaSonicRealtimeSession:
+class NovaSonicRealtimeSession(SessionEngine):
     """Minimal wrapper around the official Nova Sonic streaming flow."""
 
+    engine_kind = ENGINE_LEAN
+
     DEFAULT_SYSTEM_PROMPT = (
         "## Task Summary\n"
         "Eres una asesora virtual hispanohablante. Tu función es responder de forma\n"
@@ -96,18 +113,23 @@ class NovaSonicRealtimeSession:
         self,
         *,
         voice_id: str,
-        context_messages: Iterable[ContextMessage],
+        context_messages: Iterable[ContextMessage] = (),
+        context_sources: Optional[List[ContextSource]] = None,
         model_id: str = "amazon.nova-sonic-v1:0",
         region: str = "us-east-1",
         on_text: Optional[TextHandler] = None,
         on_audio: Optional[AudioHandler] = None,
         on_usage: Optional[UsageHandler] = None,
         on_debug: Optional[DebugHandler] = None,
+        inference: Optional[InferenceProfile] = None,
     ) -> None:
         self.model_id = model_id
+        self.inference = inference or InferenceProfile()
         self.region = region
         self.voice_id = voice_id
         self.context_messages = list(context_messages)
+        # ContextSources del YAML: se envían los eventos ya serializados de la caché compartida
+        self.context_sources = list(context_sources or [])
 
         self.on_text = on_text
         self.on_audio = on_audio
@@ -124,6 +146,31 @@ class NovaSonicRealtimeSession:
         self._is_active = False
         self._audio_started = False
         self._current_role: Optional[str] = None
+        self._speculative = False
+
+        # Interfaz SessionEngine: TTS en cola (si no hay on_audio) y eventos a callbacks
+        self.audio_output_queue: "asyncio.Queue[OutputAudioChunk]" = asyncio.Queue()
+        self._listeners: List[Any] = []
+        self._audio_seq = 0
+        self._uplink: Optional["asyncio.Queue[Optional[bytes]]"] = None
+        self._uplink_task: Optional[asyncio.Task] = None
+        # Backlog del micrófono fusionado en un audioInput (16 kHz mono, muestras enteras)
+        max_bytes = int(max(0, AUDIO_COALESCE_MAX_MS) * 16000 * PCM_SAMPLE_WIDTH / 1000)
+        self._uplink_max_bytes = max_bytes - (max_bytes % PCM_SAMPLE_WIDTH)
+        self._user_audio_end: Optional[float] = None  # último transcript USER (perf_counter)
+        self._metrics: Dict[str, Any] = {
+            "handshake_ms": None,
+            "first_response_latency_ms": None,
+            "uplink_chunks_in": 0,
+            "uplink_events_out": 0,
+            "downlink_chunks": 0,
+            "text_events": 0,
+            "stream_errors": 0,
+        }
+
+    @property
+    def is_active(self) -> bool:
+        return self._is_active
 
     # ------------------------------------------------------------------ utils
     def _log(self, message: str) -> None:
@@ -136,23 +183,26 @@ class NovaSonicRealtimeSession:
     def _ensure_client(self) -> None:
         if self._client:
             return
-        config = Config(
-            endpoint_uri=f"https://bedrock-runtime.{self.region}.amazonaws.com",
-            region=self.region,
-            aws_credentials_identity_resolver=EnvironmentCredentialsResolver(),
-        )
-        self._client = BedrockRuntimeClient(config=config)
+        self._client = get_shared_client(self.region)
 
     async def _send_event(self, payload: dict) -> None:
+        await self._send_bytes(json.dumps(payload, ensure_ascii=False).encode("utf-8"))
+
+    async def _send_bytes(self, data: bytes) -> None:
         if not self._stream:
             raise RuntimeError("Stream has not been initialised yet")
         event = InvokeModelWithBidirectionalStreamInputChunk(
-            value=BidirectionalInputPayloadPart(
-                bytes_=json.dumps(payload, ensure_ascii=False).encode("utf-8")
-            )
+            value=BidirectionalInputPayloadPart(bytes_=data)
         )
         await self._stream.input_stream.send(event)
 
+    def _broadcast(self, envelope: Dict[str, Any]) -> None:
+        for on_next, _ in list(self._listeners):
+            try:
+                on_next(envelope)
+            except Exception:
+                pass
+
     # ---------------------------------------------------------------- lifecycle
     async def start(self) -> None:
         if self._is_active:
@@ -161,10 +211,22 @@ class NovaSonicRealtimeSession:
         self._ensure_client()
         assert self._client is not None
 
+        started = time.perf_counter()
+        coordinator = get_retry_coordinator(self.region)
         self._log("Solicitando stream bidireccional...")
-        self._stream = await self._client.invoke_model_with_bidirectional_stream(
-            InvokeModelWithBidirectionalStreamOperationInput(model_id=self.model_id)
-        )
+        try:
+            self._stream = await self._client.invoke_model_with_bidirectional_stream(
+                InvokeModelWithBidirectionalStreamOperationInput(model_id=self.model_id)
+            )
+        except Exception as exc:
+            kind = classify_error(exc)
+            if kind is ErrorKind.AUTH:
+                # Credenciales cacheadas vencidas o rotadas: la próxima apertura las relee
+                refresh_credentials(self.region)
+            coordinator.record_failure(kind)
+            raise
+        coordinator.record_success()
+        get_region_selector().record_open(self.region, (time.perf_counter() - started) * 1000.0)
         self._log("Stream bidireccional recibido")
         self._is_active = True
         self._log("Stream inicializado")
@@ -174,11 +236,7 @@ class NovaSonicRealtimeSession:
             {
                 "event": {
                     "sessionStart": {
-                        "inferenceConfiguration": {
-                            "maxTokens": 1024,
-                            "topP": 0.9,
-                            "temperature": 0.7,
-                        }
+                        "inferenceConfiguration": self.inference.session_config()
                     }
                 }
             }
@@ -207,11 +265,20 @@ class NovaSonicRealtimeSession:
 
         self._log("Inyectando bloques de contexto")
         await self._send_context_blocks()
+        self._metrics["handshake_ms"] = round((time.perf_counter() - started) * 1000.0, 1)
 
         self._response_task = asyncio.create_task(self._process_responses())
         self._log("Procesamiento de respuestas iniciado")
 
     async def _send_context_blocks(self) -> None:
+        if self.context_sources:
+            rendered = get_context_cache().get(self.context_sources)
+            for error in rendered.errors:
+                self._log(f"Context source error: {error}")
+            for _, events in rendered.events_for(self._prompt_name):
+                for data in events:
+                    await self._send_bytes(data)
+            return
         messages = self.context_messages or [
             ContextMessage(role="SYSTEM", content=self.DEFAULT_SYSTEM_PROMPT)
         ]
@@ -284,6 +351,7 @@ class NovaSonicRealtimeSession:
         if not self._is_active or not self._audio_started:
             return
         blob = base64.b64encode(pcm_chunk).decode("utf-8")
+        self._metrics["uplink_events_out"] += 1
         await self._send_event(
             {
                 "event": {
@@ -312,10 +380,86 @@ class NovaSonicRealtimeSession:
         self._audio_started = False
         self._log("Audio content_end enviado")
 
+    # ------------------------------------------------------ SessionEngine API
+    async def initialize_stream(self, *, open_audio: bool = False) -> "NovaSonicRealtimeSession":
+        await self.start()
+        if open_audio:
+            await self.start_audio()
+        return self
+
+    async def send_audio_content_start_event(self) -> None:
+        if not self._is_active:
+            raise RuntimeError("La sesión todavía no está activa")
+        await self.start_audio()
+
+    def add_audio_chunk(self, audio_bytes: bytes) -> None:
+        """Encola el PCM; una única tarea lo escribe en orden."""
+        if not self._is_active or not audio_bytes:
+            return
+        if self._uplink is None:
+            self._uplink = asyncio.Queue()
+            self._uplink_task = asyncio.create_task(self._drain_uplink())
+        self._metrics["uplink_chunks_in"] += 1
+        self._uplink.put_nowait(audio_bytes)
+
+    async def _drain_uplink(self) -> None:
+        assert self._uplink is not None
+        carry: Optional[bytes] = None
+        while self._is_active:
+            chunk = carry if carry is not None else await self._uplink.get()
+            carry = None
+            if chunk is None:
+                return
+            parts = [chunk]
+            total = len(chunk)
+            stop = False
+            while total < self._uplink_max_bytes and not self._uplink.empty():
+                nxt = self._uplink.get_nowait()
+                if nxt is None:
+                    stop = True
+                    break
+                if total + len(nxt) > self._uplink_max_bytes:
+                    carry = nxt
+                    break
+                parts.append(nxt)
+                total += len(nxt)
+            try:
+                await self.send_audio_chunk(parts[0] if len(parts) == 1 else b"".join(parts))
+            except Exception as exc:
+                self._metrics["stream_errors"] += 1
+                self._log(f"Error enviando audio: {exc}")
+                return
+            if stop:
+                return
+
+    def subscribe(self, on_next, on_error=None) -> CallbackSubscription:
+        entry = (on_next, on_error)
+        self._listeners.append(entry)
+        return CallbackSubscription(self._listeners, entry)
+
+    def rebind(self, *, processor: Any = None, debug_callback: Optional[DebugHandler] = None) -> None:
+        # Sin processor: solo cambia el logger de la sesión que recibe el stream
+        if debug_callback is not None:
+            self.on_debug = debug_callback
+
+    def get_stream_metrics(self) -> Dict[str, Any]:
+        metrics = dict(self._metrics)
+        metrics["engine"] = self.engine_kind
+        metrics["region"] = self.region
+        metrics["inference"] = self.inference.describe()
+        return metrics
+
     async def close(self) -> None:
         if not self._is_active:
             return
 
+        if self._uplink_task and not self._uplink_task.done():
+            self._uplink.put_nowait(None)
+            try:
+                await self._uplink_task
+            except Exception:
+                pass
+
         try:
             await self.stop_audio()
         except Exception:
@@ -360,47 +504,98 @@ class NovaSonicRealtimeSession:
                 if not payload or not payload.bytes_:
                     continue
 
-                body = payload.bytes_.decode("utf-8")
-                try:
-                    envelope = json.loads(body)
-                except json.JSONDecodeError:
-                    self._log(f"Evento no JSON: {body[:120]}")
+                # audioOutput domina el tráfico: se extrae el base64 sin json.loads
+                content = extract_audio_output(payload.bytes_)
+                if content is None:
+                    body = payload.bytes_.decode("utf-8")
+                    try:
+                        envelope = json.loads(body)
+                    except json.JSONDecodeError:
+                        self._log(f"Evento no JSON: {body[:120]}")
+                        continue
+                    event = envelope.get("event", {})
+                    if "audioOutput" in event:
+                        content = event["audioOutput"].get("content")
+                if content is not None:
+                    if content:
+                        self._on_audio_output(content)
                     continue
 
-                event = envelope.get("event", {})
-
                 if "contentStart" in event:
-                    self._current_role = event["contentStart"].get("role")
+                    content_start = event["contentStart"]
+                    self._current_role = content_start.get("role")
+                    self._speculative = self._is_speculative(content_start)
+                    if self._current_role == "ASSISTANT" and self._user_audio_end is not None:
+                        latency_ms = round((time.perf_counter() - self._user_audio_end) * 1000.0, 1)
+                        self._user_audio_end = None
+                        if self._metrics["first_response_latency_ms"] is None:
+                            self._metrics["first_response_latency_ms"] = latency_ms
+                        get_region_selector().record_first_event(self.region, latency_ms)
                 elif "textOutput" in event:
+                    if self._speculative:
+                        continue  # solo texto FINAL (el SPECULATIVE se repite después)
+                    self._metrics["text_events"] += 1
                     text = event["textOutput"].get("content", "")
                     role = event["textOutput"].get("role") or self._current_role or "ASSISTANT"
+                    event["textOutput"]["role"] = role.upper()
+                    if role.upper() == "USER":
+                        # Transcript del usuario: Nova ya cerró su turno por VAD
+                        self._user_audio_end = time.perf_counter()
                     if text and self.on_text:
                         try:
                             self.on_text(role.upper(), text)
                         except Exception:
                             pass
-                elif "audioOutput" in event:
-                    content = event["audioOutput"].get("content")
-                    if content and self.on_audio:
+                elif "usage" in event or "usageEvent" in event:
+                    if self.on_usage:
                         try:
-                            self.on_audio(base64.b64decode(content))
+                            self.on_usage(event.get("usage") or event.get("usageEvent"))
                         except Exception:
                             pass
-                elif "usage" in event and self.on_usage:
-                    try:
-                        self.on_usage(event["usage"])
-                    except Exception:
-                        pass
                 elif "contentEnd" in event:
                     self._current_role = None
+                    self._speculative = False
                 elif "error" in event:
+                    self._metrics["stream_errors"] += 1
                     self._log(f"Evento de error: {event['error']}")
+                self._broadcast(envelope)
         except asyncio.CancelledError:
             raise
         except Exception as exc:
+            self._metrics["stream_errors"] += 1
             self._log(f"Error procesando respuestas: {exc}")
+            for _, on_error in list(self._listeners):
+                if on_error:
+                    try:
+                        on_error(exc)
+                    except Exception:
+                        pass
         finally:
             self._is_active = False
+            if self._uplink is not None:
+                self._uplink.put_nowait(None)
+
+    def _on_audio_output(self, content: str) -> None:
+        self._metrics["downlink_chunks"] += 1
+        if self.on_audio:
+            try:
+                self.on_audio(base64.b64decode(content))
+            except Exception:
+                pass
+            return
+        self._audio_seq += 1
+        self.audio_output_queue.put_nowait(OutputAudioChunk(content, self._audio_seq))
+
+    @staticmethod
+    def _is_speculative(content_start: Dict[str, Any]) -> bool:
+        additional = content_start.get("additionalModelFields")
+        if not isinstance(additional, str):
+            return False
+        try:
+            stage = json.loads(additional).get("generationStage")
+        except (json.JSONDecodeError, AttributeError):
+            return False
+        return stage in {"SPECULATIVE", "DRAFT"}
 
 
 __all__ = ["ContextMessage", "NovaSonicRealtimeSession"]
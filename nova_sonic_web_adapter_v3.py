@@ -14,7 +14,7 @@ import tempfile
 import threading
 import time
 from pathlib import Path
-from typing import Callable, Optional
+from typing import Any, Callable, Optional
 from collections import deque
 
 _FFMPEG_EXE = "ffmpeg"
@@ -383,9 +383,105 @@ class _StreamingAudioDecoder:
             self._reader_thread.join(timeout=1)
 
 
-from nova_sonic_es_sd import BedrockStreamManager, discover_context_sources
+from nova_sonic_es_sd import discover_context_sources
 from processors.base import DataProcessor
+from processors.tool_registry import load_tool_registry
 from processors.tool_use_processor import ToolUseProcessor
+from config import (
+    DOWNLINK_OPUS_BITRATE,
+    DOWNLINK_OPUS_FRAME_MS,
+    OUTPUT_SAMPLE_RATE,
+    STREAM_POOL_SIZE,
+    STREAM_POOL_PROMPTS,
+    STREAM_POOL_VOICES,
+    STREAM_POOL_MAX_IDLE_SECONDS,
+    STARTUP_AUDIO_BUFFER_MS,
+    get_prompt_config_path,
+)
+from streaming.engine import (
+    ENGINE_FULL,
+    SessionEngine,
+    create_session_engine,
+    load_engine_kind,
+    resolve_engine_kind,
+)
+from streaming.opus_downlink import OPUS_AVAILABLE, DownlinkMeter, OpusDownlinkEncoder
+from streaming.inference import load_inference_profile
+from streaming.regions import default_region, get_region_selector
+from streaming.retry import ErrorKind, get_retry_coordinator
+from streaming.stream_pool import StreamPool
+
+# Sin TTS nuevo durante este tiempo se cierra el último frame Opus parcial
+_OPUS_FLUSH_IDLE_SECONDS = 0.1
+
+# Instrucción interna cuando se agota el presupuesto con action=wrap_up
+_BUDGET_WRAP_UP_INSTRUCTION = (
+    "Se alcanzó el tiempo disponible para esta llamada. Confirma brevemente los datos ya "
+    "capturados, avisa que un asesor continuará el contacto y despídete con cordialidad."
+)
+# El coach se inyecta como texto del asistente que no debe pronunciarse
+_COACH_ENVELOPE = ("[NO-VOZ][COACH]", "[/COACH][/NO-VOZ]")
+# Claves de reemplazo en la cola de inyección: una instrucción de flujo más nueva
+# (datos faltantes) deja obsoleta a la pendiente. El cierre por presupuesto va
+# sin clave: nada lo reemplaza y SessionBudget solo lo dispara una vez
+_COACH_KEY_FLOW = "coach:flujo"
+_COACH_KEY_PAIRS = "coach:pares"
+
+
+# Pool de streams pre-calentados (uno por worker, creado bajo demanda)
+_STREAM_POOL: Optional[StreamPool] = None
+_STREAM_POOL_LOCK = threading.Lock()
+
+
+async def _prime_pooled_manager(key) -> SessionEngine:
+    """Abre un stream y envía sesión, prompt y contexto; queda listo para abrir audio."""
+    from context.bootstrap import load_context_settings, load_context_sources
+
+    # Con el circuito de todas las regiones abierto el pool no abre streams (reintenta más tarde)
+    region = get_region_selector().choose()
+    config_path, voice = key
+    settings = load_context_settings(config_path)
+    kind = resolve_engine_kind(settings)
+    manager = create_session_engine(
+        kind,
+        context_sources=load_context_sources(config_path),
+        region=region,
+        voice_id=voice,
+        settings=settings,
+        tool_registry=load_tool_registry(config_path) if kind == ENGINE_FULL else None,
+    )
+    await manager.initialize_stream()
+    return manager
+
+
+async def _close_pooled_manager(manager: SessionEngine) -> None:
+    await manager.close()
+
+
+def get_stream_pool() -> Optional[StreamPool]:
+    """Devuelve el pool del worker (lo arranca la primera vez) o None si está desactivado."""
+    global _STREAM_POOL
+    if STREAM_POOL_SIZE <= 0:
+        return None
+    with _STREAM_POOL_LOCK:
+        if _STREAM_POOL is None:
+            keys = [
+                (get_prompt_config_path(prompt), voice)
+                for prompt in STREAM_POOL_PROMPTS
+                for voice in STREAM_POOL_VOICES
+            ]
+            pool = StreamPool(
+                _prime_pooled_manager,
+                closer=_close_pooled_manager,
+                size=STREAM_POOL_SIZE,
+                max_idle_seconds=STREAM_POOL_MAX_IDLE_SECONDS,
+                # Un stream cebado en una región cuyo circuito se abrió no se entrega
+                is_usable=lambda manager: get_region_selector().is_healthy(manager.region),
+                logger=lambda message: print(f"[NovaSonic] {message}"),
+            )
+            pool.start(keys)
+            _STREAM_POOL = pool
+        return _STREAM_POOL
 
 
 class _WebAdapterProcessor(DataProcessor):
@@ -398,7 +494,7 @@ class _WebAdapterProcessor(DataProcessor):
         on_assistant_text: Optional[Callable[[str], None]],
         on_lead_snapshot: Optional[Callable[[dict], None]],
         on_session_summary: Optional[Callable[[dict], None]],
-        send_coach: Optional[Callable[[str], None]] = None,
+        send_coach: Optional[Callable[[str, Optional[str]], None]] = None,
         on_usage_update: Optional[Callable[[dict], None]] = None,
         adjust_silence_timeout: Optional[Callable[[float], None]] = None,
     ) -> None:
@@ -419,6 +515,8 @@ class _WebAdapterProcessor(DataProcessor):
         self._last_user_text = None  # type: Optional[str]
         self._last_assistant_text = None  # type: Optional[str]
         self._last_emitted_role = None  # type: Optional[str]
+        # Textos FINAL que la UI ya recibió por nova_response_partial (no se reenvían)
+        self._streamed_texts = deque(maxlen=8)
         # Mantener historial reciente para deduplicación temporal
         self._recent_assistant = deque(maxlen=20)  # list of (timestamp, normalized_text)
         self._greeted_once = False
@@ -462,10 +560,20 @@ class _WebAdapterProcessor(DataProcessor):
         self._current_silence_timeout = target
         self._adjust_silence_timeout(target)
     
+    def note_streamed_text(self, text: str) -> None:
+        """Marca un texto FINAL como ya entregado a la UI vía segmento provisional."""
+        normalized = (text or "").strip()
+        if normalized:
+            self._streamed_texts.append(normalized)
+
     def handle_tool_use(self, tool_name: str, tool_input: dict) -> dict:
         """Delega tool use al processor interno."""
         return self._delegate.handle_tool_use(tool_name, tool_input)
 
+    def record_lead(self, tool_input: dict) -> dict:
+        """Delega el handler builtin 'guardar_lead' al processor interno."""
+        return self._delegate.record_lead(tool_input)
+
     def _emit_snapshot(self, reason: str, force: bool = False) -> None:
         if not self._on_lead_snapshot:
             return
@@ -545,6 +653,13 @@ class _WebAdapterProcessor(DataProcessor):
             pass
         if self._on_assistant_text:
             normalized = text.strip()
+            if normalized in self._streamed_texts:
+                # La UI ya lo mostró como provisional y lo reconcilió con el FINAL
+                self._streamed_texts.remove(normalized)
+                self._last_assistant_text = normalized
+                self._last_emitted_role = "ASSISTANT"
+                self._remember_assistant(normalized)
+                return
             if normalized:
                 lower = normalized.lower()
                 # Suprimir saludos repetidos tipo "Hola, soy Zhenia ..."
@@ -691,7 +806,7 @@ class _WebAdapterProcessor(DataProcessor):
             return
         self._last_coach_key = key
         try:
-            self._send_coach(message)
+            self._send_coach(message, _COACH_KEY_FLOW)
         except Exception:
             pass
 
@@ -708,7 +823,7 @@ class _WebAdapterProcessor(DataProcessor):
             "Al confirmar DNI o teléfono, pronuncia los dígitos con claridad y evita ambigüedades como ‘treinta’ o ‘setenta’ si no fueron dichas por la persona. Repite el número completo y luego pregunta “¿Correcto?”."
         )
         try:
-            self._send_coach(message)
+            self._send_coach(message, _COACH_KEY_PAIRS)
         except Exception:
             pass
 
@@ -783,19 +898,23 @@ class NovaSonicWebAdapterV3:
         kb_folder: str = "kb",
         voice: str = "lupe",
         on_transcript: Optional[Callable[[str], None]] = None,
-        on_audio_response: Optional[Callable[[str], None]] = None,
+        on_audio_response: Optional[Callable[[Any, int, str], None]] = None,
         on_debug: Optional[Callable[[str], None]] = None,
         on_assistant_text: Optional[Callable[[str], None]] = None,
         on_usage: Optional[Callable[[dict], None]] = None,
         on_lead_snapshot: Optional[Callable[[dict], None]] = None,
         on_session_summary: Optional[Callable[[dict], None]] = None,
         on_event: Optional[Callable[[dict], None]] = None,  # Nuevo: eventos de reconexión y errores
+        downlink_codec: str = "pcm",  # pcm | opus (negociado con el navegador)
+        on_assistant_partial: Optional[Callable[[dict], None]] = None,  # texto SPECULATIVE + reconciliación
     ) -> None:
         self.context_config = context_config
+        # YAML programado con switch_prompt; pasa a context_config cuando el manager lo aplica
+        self._pending_prompt_config: Optional[str] = None
         self.prompt_file = prompt_file
         self.kb_folder = kb_folder
         self.voice = voice
-        self.region = os.environ.get("AWS_REGION") or os.environ.get("AWS_DEFAULT_REGION") or "us-east-1"
+        self.region = default_region()
 
         self.on_transcript = on_transcript
         self.on_audio_response = on_audio_response
@@ -805,11 +924,24 @@ class NovaSonicWebAdapterV3:
         self.on_lead_snapshot = on_lead_snapshot
         self.on_session_summary = on_session_summary
         self.on_event = on_event  # Nuevo callback
+        self.on_assistant_partial = on_assistant_partial
+
+        # Downlink de TTS: Opus si se negoció y hay libopus; si no, PCM base64
+        self._opus_encoder: Optional[OpusDownlinkEncoder] = None
+        self._opus_unavailable = downlink_codec == "opus" and not OPUS_AVAILABLE
+        if downlink_codec == "opus" and OPUS_AVAILABLE:
+            self._opus_encoder = OpusDownlinkEncoder(
+                sample_rate=OUTPUT_SAMPLE_RATE,
+                frame_ms=DOWNLINK_OPUS_FRAME_MS,
+                bitrate=DOWNLINK_OPUS_BITRATE,
+            )
+        self.downlink_codec = "opus" if self._opus_encoder else "pcm"
+        self._downlink_meter = DownlinkMeter(self.downlink_codec, OUTPUT_SAMPLE_RATE)
 
         self.is_running = False
         self.loop: Optional[asyncio.AbstractEventLoop] = None
         self.thread: Optional[threading.Thread] = None
-        self.manager: Optional[BedrockStreamManager] = None
+        self.manager: Optional[SessionEngine] = None
         self._processor: Optional[_WebAdapterProcessor] = None
         self._audio_task: Optional[asyncio.Task] = None
         self._subscription = None
@@ -832,6 +964,13 @@ class NovaSonicWebAdapterV3:
         if self.startup_timeout < 10.0:
             self.startup_timeout = 10.0
         self._warned_not_ready = False
+        # Chunks del micrófono (WebM/Ogg sin decodificar) que llegan antes de abrir el audio
+        self._early_audio: deque = deque()
+        self._early_audio_started: Optional[float] = None
+        self._early_audio_lock = threading.Lock()
+        # Stream pre-calentado entregado por el pool (si hubo acierto)
+        self._pooled_manager: Optional[SessionEngine] = None
+        self.pool_hit = False
 
     # ---------------------------------------------------------------- helpers
     def _log(self, message: str) -> None:
@@ -919,6 +1058,13 @@ class NovaSonicWebAdapterV3:
             explicit_kb=kb_arg,
         )
 
+    def _load_context_settings(self) -> dict:
+        """Secciones extra del YAML de contexto (audio_pacing, ...). Vacío en modo legacy."""
+        if not self.context_config:
+            return {}
+        from context.bootstrap import load_context_settings
+        return load_context_settings(self.context_config)
+
     def _ensure_env_credentials(self) -> None:
         """
         Valida credenciales AWS si se especifican explícitamente.
@@ -961,10 +1107,32 @@ class NovaSonicWebAdapterV3:
     def start(self) -> None:
         if self.is_running:
             return
+        pool = get_stream_pool() if self.context_config else None
+        pooled = pool.acquire((self.context_config, self.voice)) if pool else None
+        if pooled is not None:
+            self.region = pooled.manager.region
+        else:
+            # Región de menor latencia con el circuito cerrado; si Bedrock falla en
+            # todas se rechaza la llamada sin abrir stream (CircuitOpenError)
+            self.region = get_region_selector().choose()
         self.is_running = True
         self._ready.clear()
 
+        self._pooled_manager = pooled.manager if pooled is not None else None
+        self.pool_hit = pooled is not None
+
         def runner() -> None:
+            if pooled is not None:
+                # El manager pre-calentado vive en el loop propio de su stream (uno
+                # por llamada): la sesión corre ahí y lo detiene al terminar
+                self.loop = pooled.loop
+                try:
+                    pooled.run(self._bootstrap())
+                finally:
+                    pooled.release()
+                    if self.loop is pooled.loop:
+                        self.loop = None
+                return
             loop = asyncio.new_event_loop()
             self.loop = loop
             asyncio.set_event_loop(loop)
@@ -990,19 +1158,34 @@ class NovaSonicWebAdapterV3:
     async def _bootstrap(self) -> None:
         try:
             self._log("🔄 Inicializando Nova Sonic...")
-            sources = self._build_context_sources()
-            self._log(f"✅ Contexto cargado: {len(sources)} bloques")
-
-            delegate = ToolUseProcessor()
-            self._processor = _WebAdapterProcessor(
-                delegate,
-                self.on_transcript,
-                self.on_assistant_text,
-                getattr(self, "on_lead_snapshot", None),
-                getattr(self, "on_session_summary", None),
-                self._send_coach_instruction,
-                self.on_usage,
-            )
+            pooled = self._pooled_manager
+            self._pooled_manager = None
+            if pooled is None:
+                sources = self._build_context_sources()
+                settings = self._load_context_settings()
+                engine_kind = resolve_engine_kind(settings)
+                tool_registry = (
+                    load_tool_registry(self.context_config)
+                    if self.context_config and engine_kind == ENGINE_FULL
+                    else None
+                )
+                self._log(f"✅ Contexto cargado: {len(sources)} bloques")
+                if tool_registry is not None:
+                    self._log(f"🧰 Tools del prompt: {tool_registry.names or 'ninguna'}")
+            else:
+                engine_kind = pooled.engine_kind
+
+            # El motor lean no tiene hooks de processor: el texto FINAL llega por subscribe()
+            if engine_kind == ENGINE_FULL:
+                self._processor = _WebAdapterProcessor(
+                    ToolUseProcessor(),
+                    self.on_transcript,
+                    self.on_assistant_text,
+                    getattr(self, "on_lead_snapshot", None),
+                    getattr(self, "on_session_summary", None),
+                    self._send_coach_instruction,
+                    self.on_usage,
+                )
 
             self._log(f"🌎 Región seleccionada: {self.region}")
             self._log(f"⏱️ Timeout de inicialización configurado en {self.startup_timeout:.1f}s")
@@ -1010,37 +1193,64 @@ class NovaSonicWebAdapterV3:
             # Validar credenciales antes de contactar a Bedrock
             self._ensure_env_credentials()
 
-            self.manager = BedrockStreamManager(
-                context_sources=sources,
-                processor=self._processor,
-                region=self.region,
-                voice_id=self.voice,
-                debug_callback=self._log,
+            if pooled is not None:
+                pooled.rebind(processor=self._processor, debug_callback=self._log)
+                self.manager = pooled
+            else:
+                self.manager = create_session_engine(
+                    engine_kind,
+                    context_sources=sources,
+                    region=self.region,
+                    voice_id=self.voice,
+                    settings=settings,
+                    processor=self._processor,
+                    tool_registry=tool_registry,
+                    debug_callback=self._log,
+                )
+            stream_metrics = self.manager.get_stream_metrics()
+            self._log(f"⚙️ Motor de sesión: {engine_kind}")
+            if "pacing" in stream_metrics:
+                self._log(f"🎚️ Pacing de audio: {stream_metrics['pacing']['mode']}")
+            inference = stream_metrics["inference"]
+            self._log(
+                f"🧠 Perfil de inferencia '{inference['name']}': maxTokens {inference['maxTokens']}, "
+                f"topP {inference['topP']}, temperature {inference['temperature']}"
             )
+            if self._opus_unavailable:
+                self._log("⚠️ Downlink Opus pedido pero opuslib/libopus no está instalado: se usa PCM")
+            self._log(f"🔈 Downlink de TTS: {self.downlink_codec}")
 
             # Conectar el ajuste dinámico del timeout de silencio al manager
-            try:
+            if self._processor is not None:
                 self._processor.set_adjust_silence_timeout(self.manager.set_silence_timeout)
-            except Exception:
-                pass
 
-            self._log("📡 Solicitando stream Nova Sonic...")
-            try:
-                await asyncio.wait_for(self.manager.initialize_stream(), timeout=self.startup_timeout)
-            except asyncio.TimeoutError as exc:
-                raise RuntimeError("Timeout inicializando stream Nova Sonic") from exc
-            self._log("✅ Stream inicializado, esperando confirmación del modelo...")
-            
-            # send_audio_content_start_event ahora espera internamente el promptEnd
+            if pooled is not None:
+                pool = get_stream_pool()
+                hit_rate = pool.get_metrics()["hit_rate"] if pool else 0.0
+                self._log(f"♨️ Stream pre-calentado entregado por el pool (tasa de aciertos {hit_rate:.0%})")
+            else:
+                self._log("📡 Solicitando stream Nova Sonic...")
+                try:
+                    # El contentStart de audio viaja en la misma ráfaga que el handshake
+                    await asyncio.wait_for(
+                        self.manager.initialize_stream(open_audio=True),
+                        timeout=self.startup_timeout,
+                    )
+                except asyncio.TimeoutError as exc:
+                    get_retry_coordinator(self.region).record_failure(ErrorKind.TIMEOUT)
+                    raise RuntimeError("Timeout inicializando stream Nova Sonic") from exc
+                self._log("✅ Stream inicializado")
+
+            # No-op si el audio ya se abrió en el handshake (stream propio)
             await self.manager.send_audio_content_start_event()
-            
-            self._ready.set()
+
+            buffered = await self._flush_early_audio()
             self._warned_not_ready = False
-            self._log("🎬 Sesión lista: enviando audio continuo")
+            self._log(f"🎬 Sesión lista: enviando audio continuo ({buffered} chunks previos al arranque)")
 
-            self._subscription = self.manager.output_subject.subscribe(
-                on_next=self._handle_event,
-                on_error=lambda exc: self._log(f"❌ Evento de error: {exc}"),
+            self._subscription = self.manager.subscribe(
+                self._handle_event,
+                lambda exc: self._log(f"❌ Evento de error: {exc}"),
             )
 
             self._audio_task = asyncio.create_task(self._drain_audio())
@@ -1072,6 +1282,7 @@ class NovaSonicWebAdapterV3:
                     await self.manager.close()
                 except Exception as close_exc:
                     self._log(f"⚠️ Error cerrando sesión: {close_exc}")
+                self._emit_stream_metrics(self.manager)
                 self.manager = None
             self._processor = None
             if self._decoder:
@@ -1082,51 +1293,184 @@ class NovaSonicWebAdapterV3:
                 self._decoder = None
                 self._decoder_format = None
 
-    def _send_coach_instruction(self, text: str) -> None:
-        if not text or not self.is_running:
+    def _send_coach_instruction(self, text: str, key: Optional[str] = None) -> None:
+        if not text or not text.strip() or not self.is_running:
             return
         manager = self.manager
         loop = self.loop
         if not manager or not loop:
             return
+        if not manager.supports_injection:
+            self._log(f"ℹ️ El motor '{manager.engine_kind}' no admite instrucciones del coach: se omite")
+            return
         preview = text if len(text) <= 160 else f"{text[:157]}..."
         self._log(f"📝 Coach interno: {preview}")
-
-        payload = text.strip()
-        if payload:
-            payload = f"[NO-VOZ][COACH]{payload}[/COACH][/NO-VOZ]"
-        else:
-            return
-
-        async def _inject() -> None:
-            await manager.send_system_message(payload, role="ASSISTANT")
-
-        future = asyncio.run_coroutine_threadsafe(_inject(), loop)
-
-        def _report(result_future: asyncio.Future) -> None:
-            exc = result_future.exception()
-            if exc:
-                self._log(f"⚠️ No se pudo inyectar coach: {exc}")
-
-        future.add_done_callback(_report)
+        # El manager fusiona lo que llegue en la misma ventana en un solo bloque
+        try:
+            loop.call_soon_threadsafe(
+                lambda: manager.queue_system_message(text, role="ASSISTANT", key=key, envelope=_COACH_ENVELOPE)
+            )
+        except RuntimeError as exc:
+            self._log(f"⚠️ No se pudo inyectar coach: {exc}")
 
     async def _drain_audio(self) -> None:
         manager = self.manager
         if not manager:
             return
+        encoder = self._opus_encoder
+        last_seq = 0
         try:
             while self.is_running and manager.is_active:
-                pcm_bytes = await manager.audio_output_queue.get()
+                if encoder and encoder.pending_bytes:
+                    try:
+                        chunk = await asyncio.wait_for(
+                            manager.audio_output_queue.get(), timeout=_OPUS_FLUSH_IDLE_SECONDS
+                        )
+                    except asyncio.TimeoutError:
+                        # Fin de la ráfaga de TTS: cerrar el frame parcial
+                        self._emit_opus_packets(encoder.flush(), last_seq, 0, 0.0)
+                        continue
+                else:
+                    chunk = await manager.audio_output_queue.get()
                 if not self.on_audio_response:
                     continue
+                last_seq = chunk.seq
                 try:
-                    audio_b64 = base64.b64encode(pcm_bytes).decode("utf-8")
-                    self.on_audio_response(audio_b64)
+                    if encoder:
+                        started = time.perf_counter()
+                        packets = encoder.encode(chunk.pcm)
+                        encode_ms = (time.perf_counter() - started) * 1000.0
+                        self._emit_opus_packets(packets, chunk.seq, len(chunk.pcm), encode_ms)
+                    else:
+                        # Se reenvía el base64 de Nova tal cual (sin decode + re-encode)
+                        self._downlink_meter.record(chunk.pcm_size, len(chunk.b64))
+                        self.on_audio_response(chunk.b64, chunk.seq, "pcm")
                 except Exception as exc:
                     self._log(f"⚠️ Error remitindo audio: {exc}")
         except asyncio.CancelledError:
             pass
 
+    def _emit_opus_packets(self, packets: list, seq: int, pcm_bytes: int, encode_ms: float) -> None:
+        frames = [base64.b64encode(packet).decode("ascii") for packet in packets]
+        self._downlink_meter.record(pcm_bytes, sum(len(frame) for frame in frames), encode_ms)
+        if frames and self.on_audio_response:
+            self.on_audio_response(frames, seq, "opus")
+
+    def _emit_stream_metrics(self, manager: SessionEngine) -> None:
+        """Publica al frontend las métricas del stream (coalescing del uplink, etc.)."""
+        if not self.on_event:
+            return
+        try:
+            metrics = manager.get_stream_metrics()
+        except Exception:
+            return
+        # Bytes/s del downlink y latencia de encode (Opus) de la sesión
+        metrics["downlink"] = self._downlink_meter.get_metrics()
+        try:
+            self.on_event({
+                "type": "stream_metrics",
+                "metrics": metrics
+            })
+        except Exception:
+            pass
+
+    def _handle_budget_alert(self, alert: dict) -> None:
+        """Aviso o agotamiento del presupuesto de la sesión (corre en el loop del manager)."""
+        level = alert.get("level")
+        action = alert.get("action")
+        self._log(
+            f"💰 Presupuesto {'agotado' if level == 'exceeded' else 'por agotarse'}: "
+            f"${alert.get('costUsd', 0):.4f}, {alert.get('tokens', 0)} tokens (acción: {action})"
+        )
+        if level == "exceeded":
+            if action == "wrap_up":
+                self._send_coach_instruction(_BUDGET_WRAP_UP_INSTRUCTION)
+            elif action == "switch_prompt":
+                self._switch_prompt_config(alert.get("fallbackPrompt"), reason="presupuesto")
+        if self.on_event:
+            try:
+                self.on_event({
+                    "type": "budget_alert",
+                    "level": level,
+                    "action": action,
+                    "costUsd": alert.get("costUsd"),
+                    "tokens": alert.get("tokens"),
+                    "ratio": alert.get("ratio"),
+                    "maxCostUsd": alert.get("maxCostUsd"),
+                    "maxTokens": alert.get("maxTokens"),
+                })
+            except Exception:
+                pass
+
+    def switch_prompt(self, prompt_name: str, *, reason: str = "selección del usuario") -> bool:
+        """Cambia el prompt de la llamada en curso (seguro desde otro hilo, p. ej. Socket.IO).
+
+        El stream, el decoder y la captura siguen vivos; devuelve False si no hay sesión activa.
+        """
+        loop = self.loop
+        if not self.is_running or not self.manager or not loop or loop.is_closed():
+            return False
+        loop.call_soon_threadsafe(lambda: self._switch_prompt_config(prompt_name, reason=reason))
+        return True
+
+    def _switch_prompt_config(self, prompt_name: Optional[str], *, reason: str) -> None:
+        """Programa el cambio a otro YAML de contexto (se aplica en la próxima pausa)."""
+        if not prompt_name or not self.manager:
+            return
+        config_path = get_prompt_config_path(prompt_name)
+        if config_path == (self._pending_prompt_config or self.context_config):
+            # Si hay otro cambio pendiente, volver al prompt vigente sí se programa (gana el último)
+            self._log(f"ℹ️ La sesión ya usa (o tiene programado) el prompt '{prompt_name}'")
+            return
+        if not self.manager.supports_context_switch:
+            self._log(
+                f"ℹ️ El motor '{self.manager.engine_kind}' no admite cambiar de prompt en llamada: "
+                f"'{prompt_name}' no se aplicó"
+            )
+            return
+        from context.bootstrap import load_context_sources
+        try:
+            sources = load_context_sources(config_path)
+            registry = load_tool_registry(config_path)
+            inference = load_inference_profile(config_path)
+            engine_kind = load_engine_kind(config_path)
+        except Exception as exc:
+            self._log(f"⚠️ No se pudo cargar el prompt '{prompt_name}': {exc}")
+            return
+        if engine_kind != self.manager.engine_kind:
+            self._log(f"ℹ️ El prompt '{prompt_name}' usa el motor {engine_kind}: se aplicará en la próxima llamada")
+            return
+        self.manager.request_context_switch(
+            sources, tool_registry=registry, inference=inference, reason=reason, label=config_path
+        )
+        # context_config cambia con el evento promptSwitched, no aquí: si el cambio falla, sigue el vigente
+        self._pending_prompt_config = config_path
+        self._log(f"🔀 Prompt '{prompt_name}' programado ({reason})")
+
+    def _forward_assistant_partial(self, partial: dict) -> None:
+        """Texto provisional del asistente y su reconciliación con el FINAL (diff pequeño)."""
+        if not self.on_assistant_partial:
+            return
+        payload = {
+            "segment_id": partial.get("segmentId"),
+            "final": bool(partial.get("final")),
+            "timestamp": datetime.datetime.now().isoformat(),
+        }
+        if not payload["final"]:
+            payload["text"] = partial.get("text", "")
+        elif partial.get("interrupted"):
+            payload["interrupted"] = True
+            payload["reason"] = partial.get("reason")
+        else:
+            payload["diff"] = partial.get("diff") or {"keep": 0, "text": partial.get("finalText", "")}
+            payload["lead_ms"] = partial.get("leadMs")
+            if self._processor:
+                self._processor.note_streamed_text(partial.get("finalText", ""))
+        try:
+            self.on_assistant_partial(payload)
+        except Exception:
+            pass
+
     def _handle_event(self, payload: dict) -> None:
         event = payload.get("event") if isinstance(payload, dict) else None
         if not event:
@@ -1173,6 +1517,63 @@ class NovaSonicWebAdapterV3:
                     pass
             return
         
+        if "promptSwitched" in event:
+            switched = event["promptSwitched"]
+            applied = switched.get("label")
+            if applied:
+                self.context_config = applied
+                if applied == self._pending_prompt_config:
+                    self._pending_prompt_config = None
+            elapsed = switched.get("elapsedMs")
+            self._log(
+                f"🔀 Prompt aplicado ({switched.get('mode')}"
+                + (f", {elapsed:.0f} ms" if elapsed is not None else "")
+                + f"): {switched.get('reason') or 'sin motivo'}"
+            )
+            if self.on_event:
+                try:
+                    self.on_event({
+                        "type": "prompt_switched",
+                        "mode": switched.get("mode"),
+                        "reason": switched.get("reason"),
+                        "prompt": self.context_config,
+                        "inference": switched.get("inference"),
+                        "elapsedMs": elapsed,
+                    })
+                except Exception:
+                    pass
+            return
+
+        if "playbackFlush" in event:
+            flush = event["playbackFlush"]
+            self._log(
+                f"✋ Barge-in: corte de reproducción en seq {flush.get('cutoffSeq')} "
+                f"({flush.get('droppedChunks', 0)} chunks descartados en servidor)"
+            )
+            if self._opus_encoder:
+                self._opus_encoder.reset()
+            if self.on_event:
+                try:
+                    self.on_event({
+                        "type": "playback_flush",
+                        "cutoff_seq": flush.get("cutoffSeq", 0),
+                        "dropped_chunks": flush.get("droppedChunks", 0),
+                        "reason": flush.get("reason"),
+                        "server_flush_ms": flush.get("serverFlushMs"),
+                        "server_ts_ms": flush.get("serverTsMs"),
+                    })
+                except Exception:
+                    pass
+            return
+
+        if "budgetAlert" in event:
+            self._handle_budget_alert(event["budgetAlert"])
+            return
+
+        if "assistantTextPartial" in event:
+            self._forward_assistant_partial(event["assistantTextPartial"])
+            return
+
         if "streamError" in event:
             error_info = event["streamError"]
             is_fatal = error_info.get("fatal", False)
@@ -1189,53 +1590,38 @@ class NovaSonicWebAdapterV3:
                     self.on_event({
                         "type": "stream_error",
                         "fatal": is_fatal,
-                        "reason": reason
+                        "reason": reason,
+                        "kind": error_info.get("kind")
                     })
                 except Exception:
                     pass
             return
         
-        # Manejo existente de eventos
+        if "textOutput" in event and self._processor is None:
+            self._forward_lean_text(event["textOutput"])
+            return
+
+        # Manejo existente de eventos (usageEvent lo contabiliza el manager y llega
+        # por _WebAdapterProcessor.on_usage_update con el desglose por turno)
         if "usage" in event and self.on_usage:
             try:
                 self.on_usage(event["usage"])
             except Exception:
                 pass
-        elif "usageEvent" in event and self.on_usage:
-            # Fallback para flujos que emiten 'usageEvent' directamente desde AWS
+        elif "error" in event:
+            self._log(f"⚠️ Evento de error del modelo: {event['error']}")
+
+    def _forward_lean_text(self, output: dict) -> None:
+        """Texto FINAL del motor lean directo a la UI (sin heurísticas de captura)."""
+        text = (output.get("content") or "").strip()
+        if not text:
+            return
+        callback = self.on_transcript if (output.get("role") or "").upper() == "USER" else self.on_assistant_text
+        if callback:
             try:
-                ue = event["usageEvent"] or {}
-                # Preferir totales si están presentes
-                input_total = ue.get("totalInputTokens")
-                output_total = ue.get("totalOutputTokens")
-                # Si no, intentar leer del bloque 'details.total'
-                if input_total is None or output_total is None:
-                    details = ue.get("details") or {}
-                    total = details.get("total") or {}
-                    input_total = (
-                        input_total if input_total is not None else
-                        (total.get("input", {}).get("textTokens") or 0) + (total.get("input", {}).get("speechTokens") or 0)
-                    )
-                    output_total = (
-                        output_total if output_total is not None else
-                        (total.get("output", {}).get("textTokens") or 0) + (total.get("output", {}).get("speechTokens") or 0)
-                    )
-                total_tokens = int((input_total or 0) + (output_total or 0))
-                # Calcular costo estimado con la misma tarifa que el manager
-                input_cost = (float(input_total or 0) / 1000.0) * 0.0006
-                output_cost = (float(output_total or 0) / 1000.0) * 0.0024
-                cost = round(float(input_cost + output_cost), 6)
-                payload_simple = {
-                    "inputTokens": int(input_total or 0),
-                    "outputTokens": int(output_total or 0),
-                    "totalTokens": int(total_tokens),
-                    "estimatedCostUsd": cost,
-                }
-                self.on_usage(payload_simple)
+                callback(text)
             except Exception:
                 pass
-        elif "error" in event:
-            self._log(f"⚠️ Evento de error del modelo: {event['error']}")
 
     @property
     def is_ready(self) -> bool:
@@ -1243,20 +1629,48 @@ class NovaSonicWebAdapterV3:
 
     # ---------------------------------------------------------------- control
     def send_audio_chunk(self, audio_bytes: bytes, mime_type: Optional[str] = None) -> None:
-        if not self.is_running or not self.loop or not self.manager:
+        if not self.is_running:
             return
-        if not self._ready.wait(timeout=5):
-            if not self._warned_not_ready:
-                self._log("⚠️ Sesión no lista para audio")
-                self._warned_not_ready = True
+        with self._early_audio_lock:
+            if not self._ready.is_set():
+                # El micrófono graba desde el clic: se retiene (en orden, con la cabecera
+                # del contenedor) hasta que el stream acepte audio
+                self._buffer_early_audio(audio_bytes, mime_type)
+                return
+        if not self.loop or not self.manager:
             return
-        self._warned_not_ready = False
 
         asyncio.run_coroutine_threadsafe(
             self._convert_and_send(audio_bytes, mime_type),
             self.loop,
         )
 
+    def _buffer_early_audio(self, audio_bytes: bytes, mime_type: Optional[str]) -> None:
+        now = time.monotonic()
+        if self._early_audio_started is None:
+            self._early_audio_started = now
+        if (now - self._early_audio_started) * 1000.0 > STARTUP_AUDIO_BUFFER_MS:
+            if not self._warned_not_ready:
+                self._log(f"⚠️ Sesión no lista tras {STARTUP_AUDIO_BUFFER_MS} ms: se descarta audio del arranque")
+                self._warned_not_ready = True
+            return
+        self._early_audio.append((audio_bytes, mime_type))
+
+    async def _flush_early_audio(self) -> int:
+        """Decodifica y envía el audio retenido y marca la sesión lista (sin huecos ni desorden)."""
+        flushed = 0
+        while True:
+            with self._early_audio_lock:
+                if not self._early_audio:
+                    self._early_audio_started = None
+                    self._ready.set()
+                    return flushed
+                pending = list(self._early_audio)
+                self._early_audio.clear()
+            for audio_bytes, mime_type in pending:
+                await self._convert_and_send(audio_bytes, mime_type)
+            flushed += len(pending)
+
     async def _convert_and_send(self, audio_bytes: bytes, mime_type: Optional[str]) -> None:
         manager = self.manager
         if not manager or not manager.is_active:
@@ -1329,10 +1743,14 @@ class NovaSonicWebAdapterV3:
             self.thread = None
         self.loop = None
         self.manager = None
+        self._pending_prompt_config = None
         self._processor = None
         self._audio_task = None
         self._subscription = None
-        self._ready.clear()
+        with self._early_audio_lock:
+            self._ready.clear()
+            self._early_audio.clear()
+            self._early_audio_started = None
         if self._decoder:
             try:
                 self._decoder.close()
@@ -0,0 +1,55 @@
+# processors/tool_handlers.py
+"""
+Handlers de herramientas incluidos en el repo y sus specs por defecto.
+
+Cada handler recibe ``(tool_input, processor)`` y devuelve el dict que vuelve
+al modelo como toolResult. En el YAML de contexto basta con ``- name: guardar_lead``
+para heredar descripción, schema y handler de ``BUILTIN_TOOLS``.
+"""
+from typing import Any, Dict
+
+GUARDAR_LEAD_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "nombre_completo": {"type": "string"},
+        "dni": {"type": "string"},  # Validación relajada - limpiaremos en processor
+        "telefono": {"type": "string"},  # Validación relajada - limpiaremos en processor
+        "email": {"type": "string"},  # Validación relajada - limpiaremos en processor
+        "programa_interes": {"type": "string"},
+        "modalidad_preferida": {"type": "string"},
+        "horario_preferido": {"type": "string"},
+        "consentimiento": {"type": "string"}
+    },
+    "required": [
+        "nombre_completo",
+        "telefono",
+        "email",
+        "programa_interes",
+        "modalidad_preferida",
+        "consentimiento"
+    ]
+}
+
+GUARDAR_LEAD_DESCRIPTION = (
+    "Guarda los datos del prospecto cuando tienes TODOS los campos requeridos: "
+    "nombre completo, DNI (8 dígitos exactos), teléfono (9 dígitos exactos), email, programa, "
+    "modalidad, horario y consentimiento. VERIFICA que el teléfono tenga EXACTAMENTE 9 dígitos "
+    "antes de llamar esta herramienta. Si tiene 8, pide el dígito faltante al usuario."
+)
+
+
+async def guardar_lead(tool_input: Dict[str, Any], processor: Any) -> Dict[str, Any]:
+    """Valida y guarda el lead en el processor de la sesión."""
+    record = getattr(processor, "record_lead", None)
+    if record is None:
+        return {"status": "error", "message": "El processor activo no soporta guardar_lead"}
+    return record(tool_input)
+
+
+BUILTIN_TOOLS: Dict[str, Dict[str, Any]] = {
+    "guardar_lead": {
+        "description": GUARDAR_LEAD_DESCRIPTION,
+        "input_schema": GUARDAR_LEAD_SCHEMA,
+        "handler": "processors.tool_handlers:guardar_lead",
+    },
+}
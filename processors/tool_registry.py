@@ -0,0 +1,226 @@
+# processors/tool_registry.py
+"""
+Registro de herramientas (tool use) declaradas por prompt en el YAML de contexto.
+
+    tools:
+      - name: guardar_lead              # builtin: hereda descripción, schema y handler
+      - name: consultar_programa
+        description: Busca un programa del catálogo por nombre
+        input_schema: {type: object, properties: {nombre: {type: string}}}
+        handler: mi_paquete.tools:consultar_programa   # (tool_input, processor) -> dict
+        cache: shared                   # none | session | shared
+        cache_ttl_s: 300
+        timeout_s: 4
+
+Los handlers ``async`` corren en el loop de la sesión; los síncronos, en el
+pool de hilos (para I/O bloqueante) mientras el loop sigue usando el processor:
+``ToolUseProcessor`` protege el lead con un lock, así que ambos pueden llamarlo.
+
+Sin sección ``tools`` se mantiene la herramienta por defecto del manager;
+``tools: []`` no envía ninguna. Los puntos de entrada se importan una sola vez
+al cargar el registro (cacheado por ruta + mtime del YAML), nunca por llamada.
+"""
+import importlib
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from streaming.tool_runner import run_tool_call
+from .tool_handlers import BUILTIN_TOOLS
+
+CACHE_POLICIES = ("none", "session", "shared")
+
+_MISS = object()
+_handlers: Dict[str, Callable[..., Any]] = {}
+_registries: Dict[str, Tuple[Tuple[int, int], Optional["ToolRegistry"]]] = {}
+_lock = threading.Lock()
+
+
+def resolve_entry_point(entry_point: str) -> Callable[..., Any]:
+    """Importa ``modulo:funcion`` (una vez por proceso) y devuelve el callable."""
+    with _lock:
+        handler = _handlers.get(entry_point)
+    if handler is not None:
+        return handler
+    module_name, sep, attr = entry_point.partition(":")
+    if not sep or not module_name or not attr:
+        raise ValueError(f"Handler de tool inválido (se espera 'modulo:funcion'): {entry_point}")
+    target: Any = importlib.import_module(module_name)
+    for part in attr.split("."):
+        target = getattr(target, part)
+    if not callable(target):
+        raise TypeError(f"El handler '{entry_point}' no es invocable")
+    with _lock:
+        _handlers[entry_point] = target
+    return target
+
+
+@dataclass
+class ToolDefinition:
+    name: str
+    description: str
+    input_schema: Dict[str, Any]
+    handler: Callable[..., Any]
+    entry_point: str
+    cache: str = "none"
+    cache_ttl_s: Optional[float] = None
+    timeout_s: Optional[float] = None
+    spec: Dict[str, Any] = field(init=False)
+
+    def __post_init__(self) -> None:
+        # toolSpec listo para promptStart (se serializa una vez, no por sesión)
+        self.spec = {
+            "toolSpec": {
+                "name": self.name,
+                "description": self.description,
+                "inputSchema": {"json": json.dumps(self.input_schema, ensure_ascii=False)},
+            }
+        }
+
+
+class ToolResultCache:
+    """Resultados de tools por (nombre, input canónico) con TTL opcional."""
+
+    def __init__(self) -> None:
+        self._entries: Dict[Tuple[str, str], Tuple[Optional[float], Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple[str, str]) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return _MISS
+            expires_at, value = entry
+            if expires_at is not None and time.monotonic() >= expires_at:
+                del self._entries[key]
+                return _MISS
+            return value
+
+    def put(self, key: Tuple[str, str], value: Any, ttl: Optional[float]) -> None:
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def _is_cacheable(result: Any) -> bool:
+    if isinstance(result, dict):
+        return result.get("status") not in ("error", "timeout")
+    return result is not None
+
+
+class ToolRegistry:
+    """Herramientas de un prompt: specs para promptStart, plazos y dispatch con caché."""
+
+    def __init__(self, tools: List[ToolDefinition]) -> None:
+        self._tools: Dict[str, ToolDefinition] = {t.name: t for t in tools}
+        self._specs = [t.spec for t in tools]
+        self._shared_cache = ToolResultCache()
+
+    @property
+    def specs(self) -> List[Dict[str, Any]]:
+        return list(self._specs)
+
+    @property
+    def names(self) -> List[str]:
+        return list(self._tools)
+
+    def __len__(self) -> int:
+        return len(self._tools)
+
+    def get(self, name: Optional[str]) -> Optional[ToolDefinition]:
+        return self._tools.get(name or "")
+
+    def timeouts(self) -> Dict[str, float]:
+        return {t.name: t.timeout_s for t in self._tools.values() if t.timeout_s is not None}
+
+    async def invoke(
+        self,
+        tool: ToolDefinition,
+        tool_input: Dict[str, Any],
+        processor: Any,
+        *,
+        session_cache: ToolResultCache,
+        timeout: Optional[float] = None,
+    ) -> Tuple[Any, bool]:
+        """Ejecuta el handler respetando la política de caché. Devuelve (resultado, hit)."""
+        cache: Optional[ToolResultCache] = None
+        if tool.cache == "session":
+            cache = session_cache
+        elif tool.cache == "shared":
+            cache = self._shared_cache
+        key = (tool.name, json.dumps(tool_input, sort_keys=True, ensure_ascii=False, default=str))
+        if cache is not None:
+            cached = cache.get(key)
+            if cached is not _MISS:
+                return cached, True
+        result = await run_tool_call(tool.handler, tool_input, processor, timeout=timeout)
+        if cache is not None and _is_cacheable(result):
+            cache.put(key, result, tool.cache_ttl_s)
+        return result, False
+
+
+def build_tool_registry(items: List[Dict[str, Any]]) -> ToolRegistry:
+    if not isinstance(items, list):
+        raise ValueError("'tools' debe ser una lista de herramientas")
+    tools: List[ToolDefinition] = []
+    for item in items:
+        if isinstance(item, str):
+            item = {"name": item}
+        name = item.get("name") if isinstance(item, dict) else None
+        if not name:
+            raise ValueError(f"Tool sin 'name': {item}")
+        merged = {**BUILTIN_TOOLS.get(name, {}), **item}
+        for required in ("description", "input_schema", "handler"):
+            if not merged.get(required):
+                raise ValueError(f"Tool '{name}' sin '{required}' (y no es un builtin)")
+        cache = str(merged.get("cache", "none")).lower()
+        if cache not in CACHE_POLICIES:
+            raise ValueError(f"Tool '{name}': cache '{cache}' inválido ({' | '.join(CACHE_POLICIES)})")
+        ttl = merged.get("cache_ttl_s")
+        timeout = merged.get("timeout_s")
+        tools.append(ToolDefinition(
+            name=name,
+            description=str(merged["description"]).strip(),
+            input_schema=merged["input_schema"],
+            handler=resolve_entry_point(merged["handler"]),
+            entry_point=merged["handler"],
+            cache=cache,
+            cache_ttl_s=float(ttl) if ttl is not None else None,
+            timeout_s=float(timeout) if timeout is not None else None,
+        ))
+    return ToolRegistry(tools)
+
+
+def load_tool_registry(config_path: str) -> Optional[ToolRegistry]:
+    """Registro del YAML de contexto, o None si no declara 'tools' (herramienta por defecto)."""
+    from context.bootstrap import load_context_settings
+
+    path = os.path.abspath(config_path)
+    stat = os.stat(path)
+    signature = (stat.st_mtime_ns, stat.st_size)
+    with _lock:
+        cached = _registries.get(path)
+    if cached and cached[0] == signature:
+        return cached[1]
+    settings = load_context_settings(config_path)
+    registry = build_tool_registry(settings["tools"] or []) if "tools" in settings else None
+    with _lock:
+        _registries[path] = (signature, registry)
+    return registry
+
+
+def preload_tool_registries(config_paths: List[str]) -> Dict[str, int]:
+    """Resuelve los handlers de todos los prompts al arrancar. Devuelve {ruta: nº de tools}."""
+    loaded: Dict[str, int] = {}
+    for config_path in dict.fromkeys(config_paths):
+        registry = load_tool_registry(config_path)
+        if registry is not None:
+            loaded[config_path] = len(registry)
+    return loaded
@@ -7,6 +7,7 @@ una herramienta 'guardar_lead' cuando tiene datos completos.
 import json
 import re
 import datetime
+import threading
 import uuid
 from pathlib import Path
 from typing import Dict, Optional
@@ -17,9 +18,15 @@ from config import DNI_LENGTH, PHONE_LENGTH, LEADS_EXPORT_FOLDER, mask_pii
 class ToolUseProcessor(DataProcessor):
     """Maneja tool_use events de Nova Sonic para guardar leads."""
 
+    # Herramientas legacy (sin sección 'tools' en el YAML) → método que las atiende
+    _TOOL_METHODS = {"guardar_lead": "record_lead"}
+
     def __init__(self):
         self.captured_lead: Optional[Dict] = None
         self.session_id: Optional[str] = None
+        # handle_tool_use corre en el pool de hilos de tools; el loop de la sesión
+        # lee el lead a la vez (snapshots, cierre de sesión)
+        self._lead_lock = threading.Lock()
 
     def on_user_text(self, text: str) -> None:
         """Observa texto del usuario (sin procesar aquí, el modelo maneja captura)."""
@@ -61,38 +68,44 @@ class ToolUseProcessor(DataProcessor):
                     "message": f"Input inválido (no es JSON válido): {str(e)}"
                 }
         
-        if tool_name == "guardar_lead":
-            try:
-                # Validar y limpiar datos (con logging de PII enmascarado)
-                lead = self._validate_lead(tool_input)
-                self.captured_lead = lead
-                
-                # Log seguro
-                safe_log = {
-                    'nombre': lead.get('nombre_completo', 'N/A')[:20] + '...' if lead.get('nombre_completo') else 'N/A',
-                    'dni': mask_pii(lead.get('dni') or '', show_last=2),
-                    'telefono': mask_pii(lead.get('telefono') or '', show_last=2),
-                    'email': lead.get('email', 'N/A'),
-                    'programa': lead.get('programa_interes', 'N/A')
-                }
-                print(f"✅ [ToolUseProcessor] Lead validado: {safe_log}")
-                
-                # Retornar confirmación al modelo
-                return {
-                    "status": "success",
-                    "message": "Lead guardado correctamente",
-                    "lead_id": str(uuid.uuid4())[:8]
-                }
-            except Exception as e:
-                print(f"❌ [ToolUseProcessor] Error validando lead: {e}")
-                return {
-                    "status": "error",
-                    "message": f"Error al procesar datos: {str(e)}"
-                }
+        method_name = self._TOOL_METHODS.get(tool_name)
+        if method_name:
+            return getattr(self, method_name)(tool_input)
         
         print(f"⚠️ [ToolUseProcessor] Herramienta desconocida: {tool_name}")
         return {"status": "error", "message": f"Herramienta desconocida: {tool_name}"}
 
+    def record_lead(self, tool_input: Dict) -> Dict:
+        """Valida y guarda el lead enviado por el modelo con 'guardar_lead'."""
+        try:
+            # Validar y limpiar datos (con logging de PII enmascarado)
+            lead = self._validate_lead(tool_input)
+            with self._lead_lock:
+                self.captured_lead = lead
+            
+            # Log seguro
+            safe_log = {
+                'nombre': lead.get('nombre_completo', 'N/A')[:20] + '...' if lead.get('nombre_completo') else 'N/A',
+                'dni': mask_pii(lead.get('dni') or '', show_last=2),
+                'telefono': mask_pii(lead.get('telefono') or '', show_last=2),
+                'email': lead.get('email', 'N/A'),
+                'programa': lead.get('programa_interes', 'N/A')
+            }
+            print(f"✅ [ToolUseProcessor] Lead validado: {safe_log}")
+            
+            # Retornar confirmación al modelo
+            return {
+                "status": "success",
+                "message": "Lead guardado correctamente",
+                "lead_id": str(uuid.uuid4())[:8]
+            }
+        except Exception as e:
+            print(f"❌ [ToolUseProcessor] Error validando lead: {e}")
+            return {
+                "status": "error",
+                "message": f"Error al procesar datos: {str(e)}"
+            }
+
     def _validate_lead(self, raw_lead: Dict) -> Dict:
         """Valida y normaliza el lead capturado por el modelo."""
         
@@ -179,11 +192,13 @@ class ToolUseProcessor(DataProcessor):
     def on_session_end(self, session_id: str) -> Optional[str]:
         """Exporta lead al final de la sesión."""
         self.session_id = session_id
-        if self.captured_lead:
-            return self._export_lead()
+        with self._lead_lock:
+            lead = dict(self.captured_lead) if self.captured_lead else None
+        if lead:
+            return self._export_lead(lead)
         return None
 
-    def _export_lead(self) -> str:
+    def _export_lead(self, lead: Dict) -> str:
         """Exporta el lead capturado a JSON en carpeta dedicada."""
         # Crear carpeta de leads si no existe
         leads_folder = Path(LEADS_EXPORT_FOLDER)
@@ -196,11 +211,11 @@ class ToolUseProcessor(DataProcessor):
         output = {
             "action": "store_and_handoff",
             "channel": "tool_use",
-            "lead": self.captured_lead,
+            "lead": lead,
             "handoff": {
                 "motivo": "alto_interes",
                 "prioridad": "alta",
-                "ventana_contacto": self.captured_lead.get("horario_preferido", "semana")
+                "ventana_contacto": lead.get("horario_preferido", "semana")
             },
             "_received_at": timestamp.isoformat() + "Z",
             "_session_id": self.session_id
@@ -211,14 +226,15 @@ class ToolUseProcessor(DataProcessor):
         
         # Log seguro sin PII completo
         safe_log = {
-            'nombre': self.captured_lead.get('nombre_completo', 'N/A')[:20],
-            'dni': mask_pii(self.captured_lead.get('dni') or ''),
-            'telefono': mask_pii(self.captured_lead.get('telefono') or '')
+            'nombre': lead.get('nombre_completo', 'N/A')[:20],
+            'dni': mask_pii(lead.get('dni') or ''),
+            'telefono': mask_pii(lead.get('telefono') or '')
         }
         print(f"\n✅ Lead exportado: {filepath.name} - {safe_log}")
         
         return str(filepath)
 
     def snapshot_lead(self) -> Dict:
-        """Devuelve el estado actual del lead."""
-        return self.captured_lead or {}
+        """Devuelve una copia del estado actual del lead."""
+        with self._lead_lock:
+            return dict(self.captured_lead) if self.captured_lead else {}
@@ -13,6 +13,9 @@ document.addEventListener('DOMContentLoaded', () => {
     let totalCost = 0;
     let audioContext;
     let playbackCursor = 0;
+    // Barge-in: fuentes programadas y secuencia hasta la que se descarta audio
+    const scheduledSources = new Set();
+    let playbackCutoffSeq = 0;
     let selectedVoice = 'es-ES-Female';
     const getNow = () => (typeof performance !== 'undefined' && performance.now ? performance.now() : Date.now());
     const MAX_DEBUG_MESSAGES = 350;
@@ -185,6 +188,8 @@ document.addEventListener('DOMContentLoaded', () => {
     ];
 
     const conversationLog = [];
+    // Segmentos provisionales (SPECULATIVE) del asistente a la espera de su FINAL
+    const provisionalSegments = new Map();
     let latestLead = null;
     let callStartTime = null;
     let durationTimer = null;
@@ -194,6 +199,7 @@ document.addEventListener('DOMContentLoaded', () => {
     let lastUserSpeechAt = null;
     let appendedAgentTimeline = false; // Evita duplicar el aviso de agente
     let metricsUpdateTimer = null;  // Timer para debounce de métricas
+    let lastReportedTurn = null;  // Último turno con desglose de uso ya registrado
 
     // Función para agregar mensajes al debugger
     function addDebugMessage(message) {
@@ -414,9 +420,12 @@ document.addEventListener('DOMContentLoaded', () => {
     }
 
     // Función para agregar transcripción
-    function addTranscript(text, isUser = false) {
+    function addTranscript(text, isUser = false, options = {}) {
         const item = document.createElement('div');
         item.className = `transcript-item ${isUser ? 'transcript-user' : 'transcript-agent'}`;
+        if (options.provisional) {
+            item.classList.add('transcript-provisional');
+        }
 
         const meta = document.createElement('div');
         meta.className = 'transcript-meta';
@@ -433,6 +442,14 @@ document.addEventListener('DOMContentLoaded', () => {
         transcript.appendChild(item);
         transcript.scrollTop = transcript.scrollHeight;
 
+        // Lo provisional entra al log recién cuando se reconcilia con el texto FINAL
+        if (!options.provisional) {
+            logConversation(text, isUser);
+        }
+        return { item, body };
+    }
+
+    function logConversation(text, isUser) {
         conversationLog.push({
             role: isUser ? 'Usuario' : getAgentName(),
             text,
@@ -441,6 +458,31 @@ document.addEventListener('DOMContentLoaded', () => {
         exportTranscriptButton.disabled = conversationLog.length === 0;
     }
 
+    function applyAssistantPartial(data) {
+        if (!data.final) {
+            const { item, body } = addTranscript(data.text, false, { provisional: true });
+            provisionalSegments.set(data.segment_id, { item, body, text: data.text });
+            return;
+        }
+        const segment = provisionalSegments.get(data.segment_id);
+        if (!segment) {
+            return;
+        }
+        provisionalSegments.delete(data.segment_id);
+        segment.item.classList.remove('transcript-provisional');
+        if (data.interrupted) {
+            segment.item.classList.add('transcript-interrupted');
+            logConversation(`${segment.text} [interrumpido]`, false);
+            return;
+        }
+        const diff = data.diff || { keep: segment.text.length, text: '' };
+        const finalText = segment.text.slice(0, diff.keep) + diff.text;
+        if (finalText !== segment.text) {
+            segment.body.textContent = finalText;
+        }
+        logConversation(finalText, false);
+    }
+
     function resetMetrics() {
         totalTokens = 0;
         totalCost = 0;
@@ -502,7 +544,17 @@ document.addEventListener('DOMContentLoaded', () => {
 
         addDebugMessage(`📊 Uso | input: ${input} • output: ${output} • speech: ${speech}`);
         if (costPayload !== null) {
-            addDebugMessage(`💰 Costo estimado: ${Number(costPayload).toFixed(4)} USD`);
+            const provisional = payload.provisional ? ' (incluye estimación de audio)' : '';
+            addDebugMessage(`💰 Costo estimado: ${Number(costPayload).toFixed(4)} USD${provisional}`);
+        }
+        const lastTurn = payload.lastTurn;
+        if (lastTurn && lastTurn.index !== lastReportedTurn) {
+            lastReportedTurn = lastTurn.index;
+            const parts = Object.entries(lastTurn.tokens || {})
+                .filter(([, value]) => value > 0)
+                .map(([category, value]) => `${category}: ${value}`)
+                .join(' • ');
+            addDebugMessage(`🧾 Turno ${lastTurn.index}: ${lastTurn.totalTokens} tokens, ${Number(lastTurn.costUsd || 0).toFixed(4)} USD (${parts})`);
         }
     }
 
@@ -518,27 +570,45 @@ document.addEventListener('DOMContentLoaded', () => {
 
     const PCM_SAMPLE_RATE = 24000; // Nova Sonic entrega PCM 16-bit a 24 kHz
 
+    // Downlink Opus: el navegador lo anuncia solo si WebCodecs puede decodificarlo
+    const OPUS_DOWNLINK_CONFIG = { codec: 'opus', sampleRate: PCM_SAMPLE_RATE, numberOfChannels: 1 };
+    let opusDownlinkSupported = false;
+    let opusDecoder = null;
+    if (typeof AudioDecoder !== 'undefined' && AudioDecoder.isConfigSupported) {
+        AudioDecoder.isConfigSupported(OPUS_DOWNLINK_CONFIG)
+            .then((result) => { opusDownlinkSupported = !!(result && result.supported); })
+            .catch(() => { opusDownlinkSupported = false; });
+    }
+
+    function base64ToBytes(base64) {
+        const binaryString = atob(base64);
+        const bytes = new Uint8Array(binaryString.length);
+        for (let i = 0; i < binaryString.length; i++) {
+            bytes[i] = binaryString.charCodeAt(i);
+        }
+        return bytes;
+    }
+
+    async function ensureAudioContext() {
+        if (!audioContext) {
+            audioContext = new (window.AudioContext || window.webkitAudioContext)();
+            playbackCursor = 0;
+        }
+        if (audioContext.state === 'suspended') {
+            await audioContext.resume();
+        }
+        return audioContext;
+    }
+
     // Función para reproducir audio
-    async function playAudioResponse(base64Audio) {
-        if (!base64Audio) {
+    async function playAudioResponse(base64Audio, seq) {
+        if (!base64Audio || isBeforeCutoff(seq)) {
             return;
         }
 
         try {
-            const binaryString = atob(base64Audio);
-            const bytes = new Uint8Array(binaryString.length);
-            for (let i = 0; i < binaryString.length; i++) {
-                bytes[i] = binaryString.charCodeAt(i);
-            }
-
-            if (!audioContext) {
-                audioContext = new (window.AudioContext || window.webkitAudioContext)();
-                playbackCursor = 0;
-            }
-
-            if (audioContext.state === 'suspended') {
-                await audioContext.resume();
-            }
+            const bytes = base64ToBytes(base64Audio);
+            await ensureAudioContext();
 
             const frameCount = Math.floor(bytes.length / 2);
             if (frameCount === 0) {
@@ -556,39 +626,134 @@ document.addEventListener('DOMContentLoaded', () => {
                 channelData[i] = signedSample / 32768;
             }
 
-            const source = audioContext.createBufferSource();
-            source.buffer = audioBuffer;
-            source.connect(audioContext.destination);
-
-            source.onended = () => {
-                const remaining = playbackCursor - audioContext.currentTime;
-                const nowMs = getNow();
-                if (remaining <= 0.05 && nowMs - playbackCompleteLogAt > 600) {
-                    addDebugMessage('✅ Reproducción de audio completada');
-                    updateCallStatus('En llamada - Escuchando...', true);
-                    playbackCompleteLogAt = nowMs;
-                }
-            };
+            schedulePlayback(audioBuffer, seq, 'PCM');
+        } catch (error) {
+            addDebugMessage({ error: 'Error al reproducir audio: ' + error.message });
+        }
+    }
+
+    function getOpusDecoder() {
+        if (opusDecoder && opusDecoder.state === 'configured') {
+            return opusDecoder;
+        }
+        opusDecoder = new AudioDecoder({
+            output: handleDecodedOpus,
+            error: (error) => addDebugMessage({ error: 'Error decodificando Opus: ' + error.message })
+        });
+        opusDecoder.configure(OPUS_DOWNLINK_CONFIG);
+        return opusDecoder;
+    }
 
-            const now = audioContext.currentTime;
-            if (!Number.isFinite(playbackCursor) || playbackCursor < now) {
-                playbackCursor = now;
+    async function playOpusFrames(frames, seq) {
+        if (!frames || !frames.length || isBeforeCutoff(seq)) {
+            return;
+        }
+        try {
+            await ensureAudioContext();
+            const decoder = getOpusDecoder();
+            frames.forEach((frame, index) => {
+                // El timestamp lleva la secuencia para aplicar el corte de barge-in a la salida
+                decoder.decode(new EncodedAudioChunk({
+                    type: 'key',
+                    timestamp: (seq || 0) * 1000 + index,
+                    data: base64ToBytes(frame)
+                }));
+            });
+        } catch (error) {
+            addDebugMessage({ error: 'Error al reproducir audio Opus: ' + error.message });
+        }
+    }
+
+    function handleDecodedOpus(audioData) {
+        try {
+            const seq = Math.floor(audioData.timestamp / 1000);
+            if (!audioContext || isBeforeCutoff(seq)) {
+                return;
             }
+            const audioBuffer = audioContext.createBuffer(1, audioData.numberOfFrames, audioData.sampleRate);
+            audioData.copyTo(audioBuffer.getChannelData(0), { planeIndex: 0, format: 'f32-planar' });
+            schedulePlayback(audioBuffer, seq, 'Opus');
+        } finally {
+            audioData.close();
+        }
+    }
 
-            const scheduledTime = playbackCursor;
-            playbackCursor += audioBuffer.duration;
+    function schedulePlayback(audioBuffer, seq, label) {
+        // Un flush pudo llegar mientras se decodificaba este chunk
+        if (isBeforeCutoff(seq)) {
+            return;
+        }
 
-            source.start(scheduledTime);
-            const chunkLogNow = getNow();
-            if (audioBuffer.duration >= 0.25 || chunkLogNow - playbackChunkLogAt > 1000) {
-                addDebugMessage(`🎵 Chunk PCM ${frameCount} frames (${(audioBuffer.duration * 1000).toFixed(1)} ms)`);
-                playbackChunkLogAt = chunkLogNow;
+        const source = audioContext.createBufferSource();
+        source.buffer = audioBuffer;
+        source.connect(audioContext.destination);
+
+        source.onended = () => {
+            scheduledSources.delete(source);
+            const remaining = playbackCursor - audioContext.currentTime;
+            const nowMs = getNow();
+            if (remaining <= 0.05 && nowMs - playbackCompleteLogAt > 600) {
+                addDebugMessage('✅ Reproducción de audio completada');
+                updateCallStatus('En llamada - Escuchando...', true);
+                playbackCompleteLogAt = nowMs;
             }
-            updateCallStatus(`${getAgentName()} hablando...`, true);
+        };
 
-        } catch (error) {
-            addDebugMessage({ error: 'Error al reproducir audio: ' + error.message });
+        const now = audioContext.currentTime;
+        if (!Number.isFinite(playbackCursor) || playbackCursor < now) {
+            playbackCursor = now;
         }
+
+        const scheduledTime = playbackCursor;
+        playbackCursor += audioBuffer.duration;
+
+        source.start(scheduledTime);
+        scheduledSources.add(source);
+        const chunkLogNow = getNow();
+        if (audioBuffer.duration >= 0.25 || chunkLogNow - playbackChunkLogAt > 1000) {
+            addDebugMessage(`🎵 Chunk ${label} ${audioBuffer.length} frames (${(audioBuffer.duration * 1000).toFixed(1)} ms)`);
+            playbackChunkLogAt = chunkLogNow;
+        }
+        updateCallStatus(`${getAgentName()} hablando...`, true);
+    }
+
+    function isBeforeCutoff(seq) {
+        return seq != null && seq <= playbackCutoffSeq;
+    }
+
+    // Detiene y olvida todas las fuentes de TTS programadas; devuelve cuántas había
+    function stopScheduledSources() {
+        const stopped = scheduledSources.size;
+        scheduledSources.forEach((source) => {
+            try {
+                source.onended = null;
+                source.stop();
+            } catch (err) {
+                // La fuente ya había terminado
+            }
+        });
+        scheduledSources.clear();
+        return stopped;
+    }
+
+    // Barge-in: detiene de inmediato todo el audio programado hasta cutoff_seq
+    function flushPlayback(event) {
+        const startedAt = getNow();
+        playbackCutoffSeq = Math.max(playbackCutoffSeq, event.cutoff_seq || 0);
+        const stopped = stopScheduledSources();
+        if (opusDecoder && opusDecoder.state === 'configured') {
+            // Descarta frames Opus aún en el decoder
+            opusDecoder.reset();
+            opusDecoder.configure(OPUS_DOWNLINK_CONFIG);
+        }
+        playbackCursor = audioContext ? audioContext.currentTime : 0;
+        const localMs = (getNow() - startedAt).toFixed(1);
+        const sinceInterrupt = event.server_ts_ms ? ` | ~${Date.now() - event.server_ts_ms} ms desde la interrupción` : '';
+        addDebugMessage(
+            `✋ Barge-in: ${stopped} buffers detenidos en ${localMs} ms ` +
+            `(servidor descartó ${event.dropped_chunks || 0} chunks en ${event.server_flush_ms ?? 'N/A'} ms${sinceInterrupt})`
+        );
+        updateCallStatus('En llamada - Escuchando...', true);
     }
 
     // Función para enviar chunks de audio continuamente
@@ -730,9 +895,13 @@ document.addEventListener('DOMContentLoaded', () => {
     function resetConversation() {
         transcript.innerHTML = '';
         conversationLog.length = 0;
+        provisionalSegments.clear();
         exportTranscriptButton.disabled = true;
         resetMetrics();
         renderMetrics();
+        // Cada llamada tiene un manager nuevo cuya secuencia de audio reinicia en 1
+        stopScheduledSources();
+        playbackCutoffSeq = 0;
         if (audioContext) {
             playbackCursor = audioContext.currentTime;
         } else {
@@ -803,7 +972,8 @@ document.addEventListener('DOMContentLoaded', () => {
         socket.emit('call_started', {
             timestamp: new Date().toISOString(),
             voice: selectedVoiceValue,
-            prompt: selectedPrompt
+            prompt: selectedPrompt,
+            downlink_codecs: opusDownlinkSupported ? ['opus', 'pcm'] : ['pcm']
         });
         
         // Iniciar el ciclo de grabación continua
@@ -857,6 +1027,7 @@ document.addEventListener('DOMContentLoaded', () => {
         } catch { /* noop */ }
         callStartTime = null;
         lastUserSpeechAt = null;
+        stopScheduledSources();
         if (audioContext) {
             playbackCursor = audioContext.currentTime;
         } else {
@@ -995,7 +1166,12 @@ document.addEventListener('DOMContentLoaded', () => {
         const selectedPrompt = promptSelect.value;
         socket.emit('prompt_select', { prompt: selectedPrompt });
         addDebugMessage(`🔄 Prompt cambiado a: ${selectedPrompt}`);
-        updateCallStatus('Reconfigurando...', false);
+        if (isCallActive) {
+            // El servidor lo aplica en la próxima pausa sin cortar la llamada (evento prompt_switched)
+            setStreamHealth('Cambiando prompt', 'warning');
+        } else {
+            updateCallStatus('Reconfigurando...', false);
+        }
     });
 
     // Cambio de voz
@@ -1048,17 +1224,31 @@ document.addEventListener('DOMContentLoaded', () => {
         lastUserSpeechAt = Date.now();
     });
 
-    socket.on('nova_response', (data) => {
-        addTranscript(data.text, false);
-    updateCallStatus(`${getAgentName()} respondiendo...`, true);
-        addDebugMessage(`🤖 Nova: ${data.text.substring(0, 80)}...`);
-    appendTimeline(`Respuesta de ${getAgentName()}`, 'neutral');
+    function onAssistantResponseShown(text) {
+        updateCallStatus(`${getAgentName()} respondiendo...`, true);
+        addDebugMessage(`🤖 Nova: ${text.substring(0, 80)}...`);
+        appendTimeline(`Respuesta de ${getAgentName()}`, 'neutral');
         setStreamHealth('Respuesta generada', 'positive');
         if (lastUserSpeechAt) {
             const delta = Date.now() - lastUserSpeechAt;
             updateLatencyBadge(delta);
             lastUserSpeechAt = null;
         }
+    }
+
+    socket.on('nova_response', (data) => {
+        addTranscript(data.text, false);
+        onAssistantResponseShown(data.text);
+    });
+
+    // Texto provisional (SPECULATIVE) y su reconciliación con el FINAL vía diff
+    socket.on('nova_response_partial', (data) => {
+        applyAssistantPartial(data);
+        if (!data.final) {
+            onAssistantResponseShown(data.text || '');
+        } else if (data.diff && data.diff.text && typeof data.lead_ms === 'number') {
+            addDebugMessage(`✏️ Texto final corregido (${Math.round(data.lead_ms)} ms después del provisional)`);
+        }
     });
 
     socket.on('nova_speaking', () => {
@@ -1076,8 +1266,14 @@ document.addEventListener('DOMContentLoaded', () => {
             inboundAudioLogAt = now;
         }
 
-        if (data.audio) {
-            playAudioResponse(data.audio);
+        if (data.codec === 'opus' && data.frames) {
+            playOpusFrames(data.frames, data.seq);
+            if (Date.now() - lastAudioTimelineAt > 1500) {
+                appendTimeline('Audio enviado al cliente', 'subtle');
+                lastAudioTimelineAt = Date.now();
+            }
+        } else if (data.audio) {
+            playAudioResponse(data.audio, data.seq);
             if (Date.now() - lastAudioTimelineAt > 1500) {
                 appendTimeline('Audio enviado al cliente', 'subtle');
                 lastAudioTimelineAt = Date.now();
@@ -1102,6 +1298,31 @@ document.addEventListener('DOMContentLoaded', () => {
                 appendTimeline(reconnectMsg, 'warning');
                 break;
                 
+            case 'prompt_switched':
+                const switchMsg = `🔀 Prompt aplicado (${event.mode}${event.elapsedMs != null ? `, ${Math.round(event.elapsedMs)} ms` : ''})`;
+                addDebugMessage(switchMsg);
+                setStreamHealth('Activo', 'positive');
+                appendTimeline(switchMsg, 'positive');
+                break;
+
+            case 'playback_flush':
+                flushPlayback(event);
+                break;
+
+            case 'budget_alert': {
+                const exceeded = event.level === 'exceeded';
+                const limit = event.maxCostUsd ? `${Number(event.maxCostUsd).toFixed(2)} USD` : `${event.maxTokens} tokens`;
+                const budgetMsg = exceeded
+                    ? `💰 Presupuesto agotado (${limit}) → ${event.action}`
+                    : `💰 Presupuesto al ${Math.round((event.ratio || 0) * 100)}% (${limit})`;
+                addDebugMessage(budgetMsg);
+                appendTimeline(budgetMsg, exceeded ? 'negative' : 'warning');
+                if (exceeded) {
+                    setStreamHealth('Presupuesto agotado', 'warning');
+                }
+                break;
+            }
+
             case 'stream_reconnected':
                 const successMsg = `✅ Reconexión exitosa (intento ${event.attempt})`;
                 addDebugMessage(successMsg);
@@ -1132,6 +1353,88 @@ document.addEventListener('DOMContentLoaded', () => {
                     appendTimeline('Error del stream', 'negative');
                 }
                 break;
+
+            case 'stream_metrics': {
+                const metrics = event.metrics || {};
+                addDebugMessage(
+                    `📊 Uplink: ${metrics.uplink_chunks_in || 0} chunks → ${metrics.uplink_events_out || 0} eventos ` +
+                    `(ratio ${metrics.uplink_coalescing_ratio || 0}, fusionados ${metrics.uplink_coalesced_events || 0})`
+                );
+                if (metrics.pacing) {
+                    const latency = metrics.first_response_latency_ms != null ? `${metrics.first_response_latency_ms} ms` : 'N/A';
+                    addDebugMessage(
+                        `🎚️ Pacing ${metrics.pacing.mode}: primera respuesta ${latency}, ` +
+                        `errores ${metrics.stream_errors || 0} (throttling ${metrics.throttle_errors || 0})`
+                    );
+                }
+                if (metrics.inference) {
+                    const profile = metrics.inference;
+                    const stats = (metrics.inference_profiles || {})[profile.name] || {};
+                    addDebugMessage(
+                        `🧠 Perfil ${profile.name} (maxTokens ${profile.maxTokens}, temperature ${profile.temperature}): ` +
+                        `respuesta media ${stats.avg_response_ms ?? 'N/A'} ms, ` +
+                        `costo medio por turno ${stats.avg_cost_per_turn_usd ?? 'N/A'} USD`
+                    );
+                }
+                if (metrics.retry_coordinator) {
+                    const retry = metrics.retry_coordinator;
+                    addDebugMessage(
+                        `🛡️ Reintentos en ${metrics.region || 'la región'}: circuito ${retry.state} (aperturas ${retry.trips}, ` +
+                        `llamadas rechazadas ${retry.rejected_calls}), presupuesto ${retry.retry_tokens}, ` +
+                        `denegados ${retry.retries_denied}`
+                    );
+                }
+                if (metrics.regions && Object.keys(metrics.regions.regions || {}).length > 1) {
+                    const summary = Object.entries(metrics.regions.regions)
+                        .map(([name, stats]) => `${name} ${stats.score_ms ?? '?'} ms (${stats.circuit})`)
+                        .join(', ');
+                    addDebugMessage(
+                        `🌎 Regiones: ${summary} · mejor ${metrics.regions.best}, failovers ${metrics.regions.failovers}`
+                    );
+                }
+                if (metrics.injections && metrics.injections.queued) {
+                    const injections = metrics.injections;
+                    addDebugMessage(
+                        `📝 Coach: ${injections.queued} instrucciones → ${injections.blocks_sent} bloques ` +
+                        `(fusionadas ${injections.merged}, reemplazadas ${injections.superseded}), ~${injections.tokens_total} tokens`
+                    );
+                }
+                Object.entries(metrics.outbound_queue || {}).forEach(([kind, stats]) => {
+                    if (!stats || !stats.sent) return;
+                    addDebugMessage(`⏳ Cola ${kind}: ${stats.sent} envíos, espera media ${stats.avg_wait_ms} ms (máx ${stats.max_wait_ms} ms)`);
+                });
+                if (metrics.downlink) {
+                    const downlink = metrics.downlink;
+                    addDebugMessage(
+                        `🔈 Downlink ${downlink.codec}: ${downlink.wire_kbps} kbit/s en ${downlink.audio_seconds}s de audio ` +
+                        `(encode medio ${downlink.encode_ms_avg} ms, máx ${downlink.encode_ms_max} ms)`
+                    );
+                }
+                if (metrics.barge_ins) {
+                    addDebugMessage(
+                        `✋ Barge-ins ${metrics.barge_ins}: ${metrics.barge_in_dropped_chunks || 0} chunks TTS descartados ` +
+                        `(último flush ${metrics.last_barge_in_flush_ms} ms)`
+                    );
+                }
+                if (metrics.reconnects || metrics.rollovers) {
+                    addDebugMessage(
+                        `🔁 Reconexiones ${metrics.reconnects || 0} (última ${metrics.last_reconnect_ms ?? 'N/A'} ms), ` +
+                        `rollovers ${metrics.rollovers || 0} (cambio ${metrics.last_rollover_handover_ms ?? 'N/A'} ms)`
+                    );
+                }
+                if (metrics.read_stalls) {
+                    const kinds = metrics.read_stalls_by_kind || {};
+                    addDebugMessage(
+                        `🧊 Stalls de lectura ${metrics.read_stalls} (respuesta ${kinds.response || 0}, uplink ${kinds.uplink || 0}), ` +
+                        `último detectado a ${metrics.last_stall_detect_ms} ms sin eventos`
+                    );
+                }
+                if (metrics.context_cache) {
+                    const cache = metrics.context_cache;
+                    addDebugMessage(`📚 Caché de contexto: ${cache.hits} hits / ${cache.misses} misses (hit rate ${cache.hit_rate})`);
+                }
+                break;
+            }
         }
     });
 
@@ -1140,6 +1443,12 @@ document.addEventListener('DOMContentLoaded', () => {
         addDebugMessage(`  - Modelo: ${data.model || 'N/A'}`);
         addDebugMessage(`  - Region: ${data.region || 'N/A'}`);
         addDebugMessage(`  - Voice: ${data.voice || 'N/A'}`);
+        if (data.pool) {
+            addDebugMessage(`  - Stream pre-calentado: ${data.pool === 'hit' ? 'sí' : 'no'}`);
+        }
+        if (data.downlink) {
+            addDebugMessage(`  - Downlink TTS: ${data.downlink}`);
+        }
         // Actualizar el nombre del bot según el prompt confirmado por el backend (si viene)
         if (data && data.prompt) {
             updateBotDisplayName(data.prompt);
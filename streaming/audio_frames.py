@@ -0,0 +1,75 @@
+"""Chunks de audio TTS que viajan en base64 de extremo a extremo.
+
+Nova Sonic entrega ``audioOutput`` en base64 y el navegador lo consume en
+base64: decodificar en el manager y re-codificar en el adaptador son dos
+pasadas y dos copias por chunk sin ningún consumidor del PCM. El chunk guarda
+el string original y decodifica solo si alguien pide ``pcm`` (grabación,
+referencia de eco, encoder), una única vez.
+"""
+
+from __future__ import annotations
+
+import base64
+from typing import Optional
+
+
+class OutputAudioChunk:
+    __slots__ = ("b64", "seq", "_pcm")
+
+    def __init__(self, b64: str, seq: int = 0) -> None:
+        self.b64 = b64
+        self.seq = seq  # orden de reproducción (corte de barge-in en el cliente)
+        self._pcm: Optional[bytes] = None
+
+    @property
+    def pcm(self) -> bytes:
+        if self._pcm is None:
+            self._pcm = base64.b64decode(self.b64)
+        return self._pcm
+
+    @property
+    def decoded(self) -> bool:
+        return self._pcm is not None
+
+    @property
+    def pcm_size(self) -> int:
+        """Bytes PCM que representa el chunk, sin decodificarlo."""
+        size = len(self.b64) * 3 // 4
+        return size - self.b64.count("=", -2)
+
+
+_AUDIO_OUTPUT_KEY = b'"audioOutput"'
+_CONTENT_KEY = b'"content"'
+
+
+def extract_audio_output(raw: bytes) -> Optional[str]:
+    """Extrae el base64 de un audioOutput sin parsear el JSON completo.
+
+    Devuelve None si el mensaje no es audioOutput o no tiene la forma esperada
+    (el llamador cae entonces al json.loads genérico).
+    """
+    key_at = raw.find(_AUDIO_OUTPUT_KEY, 0, 64)
+    if key_at < 0:
+        return None
+    pos = raw.find(_CONTENT_KEY, key_at)
+    if pos < 0:
+        return None
+    pos += len(_CONTENT_KEY)
+    # Saltar ':' y espacios opcionales hasta la comilla de apertura
+    length = len(raw)
+    while pos < length and raw[pos] in b" \t:":
+        pos += 1
+    if pos >= length or raw[pos] != 0x22:  # '"'
+        return None
+    start = pos + 1
+    end = raw.find(b'"', start)
+    if end < 0:
+        return None
+    content = raw[start:end]
+    # base64 con escapes JSON (p. ej. "\/") no se puede usar tal cual
+    if b"\\" in content:
+        return None
+    return content.decode("ascii")
+
+
+__all__ = ["OutputAudioChunk", "extract_audio_output"]
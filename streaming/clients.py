@@ -0,0 +1,168 @@
+"""Clientes Bedrock Runtime por región y event loop, con credenciales por worker.
+
+Las conexiones y futures del cliente HTTP del SDK quedan atados al loop donde
+se crearon, y cada llamada corre en su propio loop (también las que reciben un
+stream cebado del ``StreamPool``). Por eso el cliente **no** se comparte entre
+llamadas: lo que se reutiliza es
+
+- dentro de una sesión, el cliente de su loop: las reconexiones y los
+  rollovers abren el stream nuevo sobre conexiones HTTP/2 ya establecidas en
+  lugar de repetir endpoint y handshake TLS;
+- en todo el worker, las credenciales: un ``CachedCredentialsResolver`` por
+  región evita releerlas en cada llamada (``refresh_credentials`` lo invalida
+  tras un error de autenticación).
+
+El cliente de un loop se descarta cuando ese loop ya se cerró.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import datetime
+import os
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+from aws_sdk_bedrock_runtime.client import BedrockRuntimeClient
+from aws_sdk_bedrock_runtime.config import Config
+from smithy_aws_core.identity.environment import EnvironmentCredentialsResolver
+
+# Refrescar credenciales temporales con este margen antes de su expiración
+CREDENTIALS_REFRESH_MARGIN_SECONDS = 300.0
+# Credenciales sin expiración (claves permanentes) se releen cada tanto igualmente
+CREDENTIALS_MAX_AGE_SECONDS = 900.0
+
+
+class CachedCredentialsResolver:
+    """Envuelve un resolver de identidad y reutiliza la identidad hasta que caduque."""
+
+    def __init__(
+        self,
+        delegate: Any,
+        *,
+        refresh_margin_seconds: float = CREDENTIALS_REFRESH_MARGIN_SECONDS,
+        max_age_seconds: float = CREDENTIALS_MAX_AGE_SECONDS,
+    ) -> None:
+        self._delegate = delegate
+        self._refresh_margin = datetime.timedelta(seconds=refresh_margin_seconds)
+        self._max_age = datetime.timedelta(seconds=max_age_seconds)
+        self._identity: Any = None
+        self._fetched_at: Optional[datetime.datetime] = None
+        self.refreshes = 0
+
+    def invalidate(self) -> None:
+        self._identity = None
+        self._fetched_at = None
+
+    def _is_fresh(self, now: datetime.datetime) -> bool:
+        if self._identity is None or self._fetched_at is None:
+            return False
+        if now - self._fetched_at >= self._max_age:
+            return False
+        expiration = getattr(self._identity, "expiration", None)
+        if expiration is None:
+            return True
+        if expiration.tzinfo is None:
+            expiration = expiration.replace(tzinfo=datetime.timezone.utc)
+        return now < expiration - self._refresh_margin
+
+    async def get_identity(self, **kwargs: Any) -> Any:
+        now = datetime.datetime.now(datetime.timezone.utc)
+        if self._is_fresh(now):
+            return self._identity
+        # Sin lock asyncio: el resolver se comparte entre loops; un refresco
+        # concurrente duplicado es inofensivo
+        identity = await self._delegate.get_identity(**kwargs)
+        self._identity = identity
+        self._fetched_at = now
+        self.refreshes += 1
+        return identity
+
+
+_ClientKey = Tuple[str, Optional[asyncio.AbstractEventLoop]]
+
+_clients: Dict[_ClientKey, BedrockRuntimeClient] = {}
+_installed: Dict[str, Any] = {}
+_resolvers: Dict[str, CachedCredentialsResolver] = {}
+_lock = threading.Lock()
+
+
+def _current_loop() -> Optional[asyncio.AbstractEventLoop]:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def _build_client(region: str) -> BedrockRuntimeClient:
+    config_params: Dict[str, Any] = {
+        "endpoint_uri": f"https://bedrock-runtime.{region}.amazonaws.com",
+        "region": region,
+    }
+    # Solo especificar resolver si hay variables de entorno explícitas; si no,
+    # el SDK usa su cadena por defecto (IAM role de App Runner/ECS/EC2)
+    if os.getenv("AWS_ACCESS_KEY_ID"):
+        resolver = _resolvers.get(region)
+        if resolver is None:
+            resolver = CachedCredentialsResolver(EnvironmentCredentialsResolver())
+            _resolvers[region] = resolver
+        config_params["aws_credentials_identity_resolver"] = resolver
+    return BedrockRuntimeClient(config=Config(**config_params))
+
+
+def _drop_closed_loops() -> None:
+    for key in [key for key in _clients if key[1] is not None and key[1].is_closed()]:
+        del _clients[key]
+
+
+def get_shared_client(region: str) -> BedrockRuntimeClient:
+    """Cliente único por región para el event loop en curso (thread-safe)."""
+    installed = _installed.get(region)
+    if installed is not None:
+        return installed
+    key = (region, _current_loop())
+    client = _clients.get(key)
+    if client is not None:
+        return client
+    with _lock:
+        client = _clients.get(key)
+        if client is None:
+            # Los loops de sesiones ya terminadas no vuelven: soltar sus clientes
+            _drop_closed_loops()
+            client = _build_client(region)
+            _clients[key] = client
+        return client
+
+
+def install_client(region: str, client: Any) -> None:
+    """Registra un cliente para ``region`` en todos los loops (endpoints falsos en tests y benchmarks)."""
+    with _lock:
+        _installed[region] = client
+        _resolvers.pop(region, None)
+
+
+def refresh_credentials(region: Optional[str] = None) -> None:
+    """Fuerza releer credenciales (p. ej. tras un error de token expirado)."""
+    with _lock:
+        targets = [region] if region else list(_resolvers)
+        for name in targets:
+            resolver = _resolvers.get(name)
+            if resolver:
+                resolver.invalidate()
+
+
+def reset_shared_clients() -> None:
+    """Descarta los clientes compartidos; el siguiente uso crea uno nuevo."""
+    with _lock:
+        _clients.clear()
+        _installed.clear()
+        _resolvers.clear()
+
+
+__all__ = [
+    "CachedCredentialsResolver",
+    "get_shared_client",
+    "install_client",
+    "refresh_credentials",
+    "reset_shared_clients",
+]
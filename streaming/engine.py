@@ -0,0 +1,176 @@
+"""Interfaz común de los motores de sesión Nova Sonic y selección por prompt.
+
+- ``full``: ``BedrockStreamManager`` (nova_sonic_es_sd.py). Reconexión y
+  rollover, tool use, processor con heurísticas de captura de leads, coach,
+  presupuesto, barge-in y métricas detalladas.
+- ``lean``: ``NovaSonicRealtimeSession`` (nova_sonic_realtime.py). Handshake,
+  audio de ida y vuelta y texto FINAL; sin Subject, sin monitor de silencio ni
+  hooks de processor. Pensado para despliegues de alta densidad que no
+  necesitan captura de leads.
+
+El YAML de contexto elige el motor (por defecto ``NOVA_SONIC_ENGINE``)::
+
+    engine: lean
+"""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, List, Optional
+
+from config.constants import SESSION_ENGINE
+
+ENGINE_FULL = "full"
+ENGINE_LEAN = "lean"
+ENGINE_KINDS = (ENGINE_FULL, ENGINE_LEAN)
+
+EventHandler = Callable[[Dict[str, Any]], None]
+ErrorHandler = Callable[[Exception], None]
+
+
+class SessionEngine(ABC):
+    """Lo que el adaptador web necesita de un motor de sesión.
+
+    Además de los métodos, cada motor expone ``is_active`` (bool), ``region``
+    y ``audio_output_queue`` (``asyncio.Queue`` de ``OutputAudioChunk`` con el TTS).
+    Las capacidades opcionales se consultan con los flags ``supports_*`` antes de
+    llamarlas; en un motor que no las tiene son no-ops.
+    """
+
+    engine_kind: str = ""
+    # Inyección de instrucciones (coach) y cambio de prompt en llamada
+    supports_injection: bool = False
+    supports_context_switch: bool = False
+
+    @abstractmethod
+    async def initialize_stream(self, *, open_audio: bool = False) -> "SessionEngine":
+        """Abre el stream y envía el handshake (y el contentStart de audio si ``open_audio``)."""
+
+    @abstractmethod
+    async def send_audio_content_start_event(self) -> None:
+        """Abre el contenido de audio del usuario (no-op si ya está abierto)."""
+
+    @abstractmethod
+    def add_audio_chunk(self, audio_bytes: bytes) -> None:
+        """Encola PCM 16 kHz del micrófono (se llama desde el loop del motor)."""
+
+    @abstractmethod
+    def subscribe(self, on_next: EventHandler, on_error: Optional[ErrorHandler] = None) -> Any:
+        """Suscribe a los eventos no-audio; devuelve un objeto con ``dispose()``."""
+
+    @abstractmethod
+    def get_stream_metrics(self) -> Dict[str, Any]:
+        """Copia de las métricas de la sesión (incluye ``engine``)."""
+
+    @abstractmethod
+    async def close(self) -> None:
+        """Cierra contenido, prompt y sesión y libera las tareas del motor."""
+
+    # ------------------------------------------------ capacidades opcionales
+    def rebind(self, *, processor: Any = None, debug_callback: Optional[Callable[[str], None]] = None) -> None:
+        """Asigna processor/logger al entregar un stream pre-calentado."""
+
+    def set_silence_timeout(self, seconds: float) -> None:
+        """Ajuste del fin de turno por silencio; sin efecto si el motor delega el VAD en Nova."""
+
+    def queue_system_message(
+        self,
+        text: str,
+        *,
+        role: str = "SYSTEM",
+        key: Optional[str] = None,
+        envelope: tuple = ("", ""),
+    ) -> None:
+        """Encola una instrucción para inyectar; sin efecto si ``supports_injection`` es False."""
+
+    def request_context_switch(
+        self,
+        context_sources: List[Any],
+        *,
+        tool_registry: Any = None,
+        inference: Any = None,
+        reason: str = "",
+        label: Optional[str] = None,
+    ) -> None:
+        """Programa un cambio de prompt; sin efecto si ``supports_context_switch`` es False."""
+
+
+class CallbackSubscription:
+    """Suscripción a una lista de callbacks (``dispose()`` la quita)."""
+
+    def __init__(self, listeners: List[Any], entry: Any) -> None:
+        self._listeners = listeners
+        self._entry = entry
+
+    def dispose(self) -> None:
+        try:
+            self._listeners.remove(self._entry)
+        except ValueError:
+            pass
+
+
+def resolve_engine_kind(settings: Optional[Dict[str, Any]]) -> str:
+    """Motor declarado en la sección ``engine`` del YAML (o ``NOVA_SONIC_ENGINE``)."""
+    kind = str((settings or {}).get("engine") or SESSION_ENGINE).lower()
+    if kind not in ENGINE_KINDS:
+        raise ValueError(f"Motor de sesión inválido '{kind}' ({' | '.join(ENGINE_KINDS)})")
+    return kind
+
+
+def load_engine_kind(config_path: str) -> str:
+    from context.bootstrap import load_context_settings
+
+    return resolve_engine_kind(load_context_settings(config_path))
+
+
+def create_session_engine(
+    kind: str,
+    *,
+    context_sources: List[Any],
+    region: str,
+    voice_id: str,
+    settings: Optional[Dict[str, Any]] = None,
+    processor: Any = None,
+    tool_registry: Any = None,
+    debug_callback: Optional[Callable[[str], None]] = None,
+) -> SessionEngine:
+    """Construye el motor ``kind`` con la configuración del prompt (``settings``)."""
+    settings = settings or {}
+    if kind == ENGINE_LEAN:
+        from nova_sonic_realtime import NovaSonicRealtimeSession
+        from streaming.inference import InferenceProfile
+
+        return NovaSonicRealtimeSession(
+            voice_id=voice_id,
+            context_sources=context_sources,
+            region=region,
+            on_debug=debug_callback,
+            inference=InferenceProfile.from_config(settings.get("inference")),
+        )
+    if kind != ENGINE_FULL:
+        raise ValueError(f"Motor de sesión inválido '{kind}' ({' | '.join(ENGINE_KINDS)})")
+    from nova_sonic_es_sd import BedrockStreamManager
+
+    return BedrockStreamManager(
+        context_sources=context_sources,
+        processor=processor,
+        region=region,
+        voice_id=voice_id,
+        debug_callback=debug_callback,
+        audio_pacing=settings.get("audio_pacing"),
+        tool_registry=tool_registry,
+        budget=settings.get("budget"),
+        inference=settings.get("inference"),
+    )
+
+
+__all__ = [
+    "ENGINE_FULL",
+    "ENGINE_KINDS",
+    "ENGINE_LEAN",
+    "CallbackSubscription",
+    "SessionEngine",
+    "create_session_engine",
+    "load_engine_kind",
+    "resolve_engine_kind",
+]
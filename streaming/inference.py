@@ -0,0 +1,175 @@
+"""Perfil de inferencia por prompt (sección ``inference`` del YAML) y sus métricas.
+
+    inference:
+      name: minimal_fast     # etiqueta para agrupar métricas (por defecto "default")
+      max_tokens: 512
+      top_p: 0.9
+      temperature: 0.7
+
+Las claves ausentes toman los defaults de entorno (NOVA_SONIC_MAX_TOKENS, ...).
+Las métricas se agregan por nombre de perfil en el worker para comparar
+latencia de respuesta y costo por turno entre despliegues.
+"""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from config.constants import (
+    INFERENCE_MAX_TOKENS,
+    INFERENCE_TEMPERATURE,
+    INFERENCE_TOP_P,
+)
+
+INFERENCE_KEYS = ("name", "max_tokens", "top_p", "temperature")
+DEFAULT_PROFILE_NAME = "default"
+
+
+@dataclass(frozen=True)
+class InferenceProfile:
+    name: str = DEFAULT_PROFILE_NAME
+    max_tokens: int = INFERENCE_MAX_TOKENS
+    top_p: float = INFERENCE_TOP_P
+    temperature: float = INFERENCE_TEMPERATURE
+
+    def __post_init__(self) -> None:
+        if not self.name:
+            raise ValueError("inference.name no puede estar vacío")
+        if self.max_tokens <= 0:
+            raise ValueError(f"inference.max_tokens debe ser > 0 (recibido {self.max_tokens})")
+        if not 0.0 < self.top_p <= 1.0:
+            raise ValueError(f"inference.top_p debe estar en (0, 1] (recibido {self.top_p})")
+        if not 0.0 <= self.temperature <= 1.0:
+            raise ValueError(f"inference.temperature debe estar en [0, 1] (recibido {self.temperature})")
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict[str, Any]]) -> "InferenceProfile":
+        """Construye el perfil desde la sección ``inference`` del YAML (o los defaults)."""
+        if config is None:
+            return cls()
+        if not isinstance(config, dict):
+            raise ValueError("'inference' debe ser un mapa (max_tokens, top_p, temperature, name)")
+        unknown = sorted(set(config) - set(INFERENCE_KEYS))
+        if unknown:
+            raise ValueError(f"Claves de 'inference' desconocidas: {unknown} ({' | '.join(INFERENCE_KEYS)})")
+        try:
+            max_tokens = int(config.get("max_tokens", INFERENCE_MAX_TOKENS))
+            top_p = float(config.get("top_p", INFERENCE_TOP_P))
+            temperature = float(config.get("temperature", INFERENCE_TEMPERATURE))
+        except (TypeError, ValueError) as exc:
+            raise ValueError(f"Sección 'inference' inválida: {exc}") from exc
+        return cls(
+            name=str(config.get("name", DEFAULT_PROFILE_NAME)),
+            max_tokens=max_tokens,
+            top_p=top_p,
+            temperature=temperature,
+        )
+
+    def session_config(self) -> Dict[str, Any]:
+        """``inferenceConfiguration`` para el evento sessionStart."""
+        return {"maxTokens": self.max_tokens, "topP": self.top_p, "temperature": self.temperature}
+
+    def describe(self) -> Dict[str, Any]:
+        return {"name": self.name, **self.session_config()}
+
+
+class InferenceProfileStats:
+    """Latencia de respuesta y costo por turno agregados por perfil (thread-safe)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._profiles: Dict[str, Dict[str, Any]] = {}
+
+    def _entry(self, profile: InferenceProfile) -> Dict[str, Any]:
+        entry = self._profiles.get(profile.name)
+        if entry is None:
+            entry = self._profiles[profile.name] = {
+                "config": profile.session_config(),
+                "sessions": 0,
+                "responses": 0,
+                "response_ms_total": 0.0,
+                "max_response_ms": 0.0,
+                "turns": 0,
+                "turn_tokens_total": 0,
+                "turn_output_tokens_total": 0,
+                "turn_cost_usd_total": 0.0,
+            }
+        return entry
+
+    def record_session(self, profile: InferenceProfile) -> None:
+        with self._lock:
+            self._entry(profile)["sessions"] += 1
+
+    def record_response(self, profile: InferenceProfile, latency_ms: float) -> None:
+        with self._lock:
+            entry = self._entry(profile)
+            entry["responses"] += 1
+            entry["response_ms_total"] += latency_ms
+            entry["max_response_ms"] = max(entry["max_response_ms"], latency_ms)
+
+    def record_turn(self, profile: InferenceProfile, turn: Dict[str, Any]) -> None:
+        """``turn`` es el resumen de ``UsageLedger.close_turn``."""
+        tokens = turn.get("tokens") or {}
+        with self._lock:
+            entry = self._entry(profile)
+            entry["turns"] += 1
+            entry["turn_tokens_total"] += int(turn.get("totalTokens") or 0)
+            entry["turn_output_tokens_total"] += int(tokens.get("assistant_text", 0)) + int(
+                tokens.get("assistant_speech", 0)
+            )
+            entry["turn_cost_usd_total"] += float(turn.get("costUsd") or 0.0)
+
+    def get_metrics(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            metrics: Dict[str, Dict[str, Any]] = {}
+            for name, entry in self._profiles.items():
+                responses = entry["responses"]
+                turns = entry["turns"]
+                metrics[name] = {
+                    "config": dict(entry["config"]),
+                    "sessions": entry["sessions"],
+                    "responses": responses,
+                    "avg_response_ms": round(entry["response_ms_total"] / responses, 1) if responses else None,
+                    "max_response_ms": round(entry["max_response_ms"], 1) if responses else None,
+                    "turns": turns,
+                    "avg_tokens_per_turn": round(entry["turn_tokens_total"] / turns, 1) if turns else None,
+                    "avg_output_tokens_per_turn": (
+                        round(entry["turn_output_tokens_total"] / turns, 1) if turns else None
+                    ),
+                    "avg_cost_per_turn_usd": round(entry["turn_cost_usd_total"] / turns, 6) if turns else None,
+                }
+            return metrics
+
+    def reset(self) -> None:
+        with self._lock:
+            self._profiles.clear()
+
+
+def load_inference_profile(config_path: str) -> InferenceProfile:
+    """Perfil declarado en el YAML de contexto (valida la sección 'inference')."""
+    from context.bootstrap import load_context_settings
+
+    return InferenceProfile.from_config(load_context_settings(config_path).get("inference"))
+
+
+_stats: Optional[InferenceProfileStats] = None
+_stats_lock = threading.Lock()
+
+
+def get_inference_stats() -> InferenceProfileStats:
+    """Métricas por perfil compartidas por todas las sesiones del worker."""
+    global _stats
+    with _stats_lock:
+        if _stats is None:
+            _stats = InferenceProfileStats()
+        return _stats
+
+
+__all__ = [
+    "InferenceProfile",
+    "InferenceProfileStats",
+    "get_inference_stats",
+    "load_inference_profile",
+]
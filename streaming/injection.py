@@ -0,0 +1,149 @@
+"""Cola de inyección de texto de sistema/coach hacia Nova Sonic.
+
+Cada inyección suelta cuesta un triple contentStart/textInput/contentEnd y
+tokens de entrada que el modelo relee antes de su próxima respuesta. Las
+heurísticas del coach pueden disparar varias veces en el mismo turno, así que
+los textos se acumulan durante una ventana corta y salen como un solo bloque:
+
+- textos del mismo canal (rol + envoltorio) se fusionan en un bloque;
+- un texto con la misma ``key`` que otro pendiente lo reemplaza (la
+  instrucción más nueva refleja el estado más reciente del lead);
+- los tokens inyectados se contabilizan por turno.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+# Aproximación de caracteres por token de texto (misma que UsageLedger)
+_CHARS_PER_TOKEN = 4
+_MAX_TURNS_KEPT = 20
+# Eventos que ahorra cada texto fusionado (contentStart + textInput + contentEnd)
+_EVENTS_PER_BLOCK = 3
+
+Envelope = Tuple[str, str]
+
+
+@dataclass
+class _PendingText:
+    text: str
+    role: str
+    envelope: Envelope
+    key: Optional[str]
+
+
+@dataclass(frozen=True)
+class InjectionBlock:
+    """Bloque listo para enviar: varios textos pendientes fusionados."""
+
+    role: str
+    text: str
+    count: int
+
+    @property
+    def estimated_tokens(self) -> int:
+        return -(-len(self.text) // _CHARS_PER_TOKEN)
+
+
+class InjectionQueue:
+    """Textos pendientes de inyectar en la sesión (se usa desde el loop del manager)."""
+
+    def __init__(self) -> None:
+        self._pending: List[_PendingText] = []
+        self.queued = 0
+        self.superseded = 0
+        self.dropped = 0
+        self.blocks = 0
+        self.texts_sent = 0
+        self.tokens_total = 0
+        self._turn_tokens = 0
+        self._turn_blocks = 0
+        self._turns: Deque[Dict[str, int]] = deque(maxlen=_MAX_TURNS_KEPT)
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def add(
+        self,
+        text: str,
+        *,
+        role: str = "SYSTEM",
+        key: Optional[str] = None,
+        envelope: Envelope = ("", ""),
+    ) -> bool:
+        """Encola ``text``. Devuelve True si reemplazó a un pendiente con la misma ``key``."""
+        text = (text or "").strip()
+        if not text:
+            return False
+        replaced = 0
+        if key is not None:
+            kept = [item for item in self._pending if item.key != key]
+            replaced = len(self._pending) - len(kept)
+            self.superseded += replaced
+            self._pending = kept
+        self._pending.append(_PendingText(text, role, envelope, key))
+        self.queued += 1
+        return replaced > 0
+
+    def drain(self) -> List[InjectionBlock]:
+        """Vacía la cola: un bloque por canal, en el orden del primer texto de cada canal."""
+        channels: Dict[Tuple[str, Envelope], List[str]] = {}
+        for item in self._pending:
+            texts = channels.setdefault((item.role, item.envelope), [])
+            # Dos heurísticas pueden producir exactamente la misma instrucción
+            if item.text in texts:
+                self.superseded += 1
+            else:
+                texts.append(item.text)
+        self._pending = []
+        blocks = []
+        for (role, (prefix, suffix)), texts in channels.items():
+            body = "\n".join(texts)
+            blocks.append(InjectionBlock(role=role, text=f"{prefix}{body}{suffix}", count=len(texts)))
+        return blocks
+
+    def discard(self) -> int:
+        """Descarta lo pendiente (la sesión se cierra) y devuelve cuántos textos eran."""
+        count = len(self._pending)
+        self._pending = []
+        self.dropped += count
+        return count
+
+    def record_sent(self, block: InjectionBlock) -> None:
+        tokens = block.estimated_tokens
+        self.blocks += 1
+        self.texts_sent += block.count
+        self.tokens_total += tokens
+        self._turn_blocks += 1
+        self._turn_tokens += tokens
+
+    def close_turn(self, index: int) -> Optional[Dict[str, int]]:
+        """Cierra el turno ``index`` (numeración del UsageLedger); devuelve lo inyectado en él."""
+        if not self._turn_blocks:
+            return None
+        summary = {"index": index, "blocks": self._turn_blocks, "tokens": self._turn_tokens}
+        self._turns.append(summary)
+        self._turn_blocks = 0
+        self._turn_tokens = 0
+        return summary
+
+    def get_metrics(self) -> Dict[str, Any]:
+        merged = self.texts_sent - self.blocks
+        return {
+            "queued": self.queued,
+            "pending": len(self._pending),
+            "blocks_sent": self.blocks,
+            "texts_sent": self.texts_sent,
+            "merged": merged,
+            "superseded": self.superseded,
+            "dropped": self.dropped,
+            "events_saved": (merged + self.superseded) * _EVENTS_PER_BLOCK,
+            "tokens_total": self.tokens_total,
+            "tokens_current_turn": self._turn_tokens,
+            "tokens_by_turn": list(self._turns),
+        }
+
+
+__all__ = ["InjectionBlock", "InjectionQueue"]
@@ -0,0 +1,100 @@
+"""Downlink de TTS comprimido en Opus (24 kHz mono s16le → paquetes Opus).
+
+El PCM en base64 cuesta ~512 kbit/s por sesión hablando; Opus de voz a 32 kbit/s
+es más de 10x menos. El encoder corre en proceso vía ``opuslib`` (binding de
+libopus), que es opcional: sin él el adaptador sigue entregando PCM.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+try:
+    import opuslib
+except Exception:
+    opuslib = None
+
+OPUS_AVAILABLE = opuslib is not None
+_SAMPLE_WIDTH = 2
+
+
+class DownlinkMeter:
+    """Bytes por segundo de audio y latencia de encode del downlink de una sesión."""
+
+    def __init__(self, codec: str, sample_rate: int, channels: int = 1) -> None:
+        self.codec = codec
+        self._pcm_bytes_per_second = sample_rate * channels * _SAMPLE_WIDTH
+        self.pcm_bytes = 0
+        self.wire_bytes = 0
+        self.chunks = 0
+        self._encode_ms_total = 0.0
+        self._encode_ms_max = 0.0
+
+    def record(self, pcm_bytes: int, wire_bytes: int, encode_ms: float = 0.0) -> None:
+        self.pcm_bytes += pcm_bytes
+        self.wire_bytes += wire_bytes
+        self.chunks += 1
+        self._encode_ms_total += encode_ms
+        if encode_ms > self._encode_ms_max:
+            self._encode_ms_max = encode_ms
+
+    def get_metrics(self) -> Dict[str, Any]:
+        audio_seconds = self.pcm_bytes / self._pcm_bytes_per_second if self._pcm_bytes_per_second else 0.0
+        return {
+            "codec": self.codec,
+            "audio_seconds": round(audio_seconds, 2),
+            "wire_bytes": self.wire_bytes,
+            "wire_kbps": round(self.wire_bytes * 8 / audio_seconds / 1000.0, 1) if audio_seconds else 0.0,
+            "encode_ms_avg": round(self._encode_ms_total / self.chunks, 3) if self.chunks else 0.0,
+            "encode_ms_max": round(self._encode_ms_max, 3),
+        }
+
+
+class OpusDownlinkEncoder:
+    """Empaqueta PCM en frames Opus de ``frame_ms``; el resto queda pendiente hasta el siguiente chunk."""
+
+    def __init__(
+        self,
+        *,
+        sample_rate: int = 24000,
+        channels: int = 1,
+        frame_ms: int = 20,
+        bitrate: int = 32000,
+    ) -> None:
+        if opuslib is None:
+            raise ImportError("Falta opuslib/libopus para el downlink Opus: pip install opuslib")
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.frame_ms = frame_ms
+        self.frame_samples = sample_rate * frame_ms // 1000
+        self.frame_bytes = self.frame_samples * channels * _SAMPLE_WIDTH
+        self._encoder = opuslib.Encoder(sample_rate, channels, opuslib.APPLICATION_VOIP)
+        self._encoder.bitrate = bitrate
+        self._pending = bytearray()
+
+    @property
+    def pending_bytes(self) -> int:
+        return len(self._pending)
+
+    def encode(self, pcm: bytes) -> List[bytes]:
+        self._pending += pcm
+        packets: List[bytes] = []
+        while len(self._pending) >= self.frame_bytes:
+            frame = bytes(self._pending[:self.frame_bytes])
+            del self._pending[:self.frame_bytes]
+            packets.append(self._encoder.encode(frame, self.frame_samples))
+        return packets
+
+    def flush(self) -> List[bytes]:
+        """Cierra el frame parcial (relleno con silencio) al terminar una ráfaga de TTS."""
+        if not self._pending:
+            return []
+        self._pending += bytes(self.frame_bytes - len(self._pending))
+        return self.encode(b"")
+
+    def reset(self) -> None:
+        """Barge-in: descarta el frame parcial pendiente."""
+        self._pending.clear()
+
+
+__all__ = ["OPUS_AVAILABLE", "DownlinkMeter", "OpusDownlinkEncoder"]
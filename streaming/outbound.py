@@ -0,0 +1,190 @@
+"""Planificador de salida hacia el stream bidireccional de Nova Sonic.
+
+Un único sender drena colas por clase de prioridad (ciclo de vida > resultados
+de herramientas > inyecciones de texto > audio) para que un resultado de tool
+no espere detrás de una ráfaga de audio. Cada clase tiene un límite de ráfaga:
+si lo agota mientras hay clases de menor prioridad esperando, se cede un envío
+a la siguiente clase pendiente para no dejarla sin servicio.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from enum import IntEnum
+from typing import Awaitable, Callable, Deque, Dict, Optional, Tuple
+
+
+class SendPriority(IntEnum):
+    LIFECYCLE = 0
+    TOOL_RESULT = 1
+    TEXT = 2
+    AUDIO = 3
+
+
+# Envíos consecutivos permitidos por clase antes de ceder a una clase inferior
+DEFAULT_BURST_LIMITS: Dict[SendPriority, int] = {
+    SendPriority.LIFECYCLE: 16,
+    SendPriority.TOOL_RESULT: 6,
+    SendPriority.TEXT: 6,
+    SendPriority.AUDIO: 0,  # 0 = sin límite (no hay clase inferior)
+}
+
+Writer = Callable[[bytes], Awaitable[None]]
+_QueuedItem = Tuple[bytes, "asyncio.Future[None]", float]
+
+
+class OutboundScheduler:
+    """Serializa los envíos al stream respetando prioridades y equidad."""
+
+    def __init__(
+        self,
+        writer: Writer,
+        *,
+        burst_limits: Optional[Dict[SendPriority, int]] = None,
+    ) -> None:
+        self._writer = writer
+        self._burst_limits = dict(DEFAULT_BURST_LIMITS)
+        if burst_limits:
+            self._burst_limits.update(burst_limits)
+        self._queues: Dict[SendPriority, Deque[_QueuedItem]] = {
+            priority: deque() for priority in SendPriority
+        }
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+        self._streak_priority: Optional[SendPriority] = None
+        self._streak = 0
+        self._stats: Dict[SendPriority, Dict[str, float]] = {
+            priority: {"sent": 0, "wait_total_ms": 0.0, "wait_max_ms": 0.0}
+            for priority in SendPriority
+        }
+
+    # ------------------------------------------------------------ lifecycle
+    def start(self) -> None:
+        if self._task and not self._task.done():
+            return
+        self._closing = False
+        self._task = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        """Envía lo pendiente y detiene el sender."""
+        self._closing = True
+        self._wakeup.set()
+        task = self._task
+        if task is None:
+            return
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self._task = None
+
+    def cancel(self) -> None:
+        """Detiene el sender sin drenar; los envíos pendientes fallan."""
+        self._closing = True
+        if self._task and not self._task.done():
+            self._task.cancel()
+        self._fail_pending(RuntimeError("Planificador de salida detenido"))
+
+    # ------------------------------------------------------------ envíos
+    def submit_nowait(self, data: bytes, priority: SendPriority) -> "asyncio.Future[None]":
+        loop = asyncio.get_running_loop()
+        future: "asyncio.Future[None]" = loop.create_future()
+        if self._closing and (self._task is None or self._task.done()):
+            future.set_exception(RuntimeError("Planificador de salida detenido"))
+            return future
+        self._queues[priority].append((data, future, time.monotonic()))
+        self._wakeup.set()
+        if self._task is None or self._task.done():
+            self.start()
+        return future
+
+    async def submit(self, data: bytes, priority: SendPriority) -> None:
+        """Encola ``data`` y espera a que el sender lo haya escrito en el stream."""
+        await self.submit_nowait(data, priority)
+
+    def pending(self, priority: Optional[SendPriority] = None) -> int:
+        if priority is not None:
+            return len(self._queues[priority])
+        return sum(len(q) for q in self._queues.values())
+
+    def get_metrics(self) -> Dict[str, Dict[str, float]]:
+        metrics: Dict[str, Dict[str, float]] = {}
+        for priority, stats in self._stats.items():
+            sent = int(stats["sent"])
+            metrics[priority.name.lower()] = {
+                "sent": sent,
+                "avg_wait_ms": round(stats["wait_total_ms"] / sent, 2) if sent else 0.0,
+                "max_wait_ms": round(stats["wait_max_ms"], 2),
+            }
+        return metrics
+
+    # ------------------------------------------------------------ internals
+    def _next_item(self) -> Optional[Tuple[SendPriority, _QueuedItem]]:
+        waiting = [priority for priority in SendPriority if self._queues[priority]]
+        if not waiting:
+            return None
+        chosen = waiting[0]
+        limit = self._burst_limits.get(chosen, 0)
+        if (
+            limit
+            and len(waiting) > 1
+            and self._streak_priority == chosen
+            and self._streak >= limit
+        ):
+            chosen = waiting[1]
+        if chosen == self._streak_priority:
+            self._streak += 1
+        else:
+            self._streak_priority = chosen
+            self._streak = 1
+        return chosen, self._queues[chosen].popleft()
+
+    async def _run(self) -> None:
+        try:
+            while True:
+                picked = self._next_item()
+                if picked is None:
+                    if self._closing:
+                        break
+                    self._wakeup.clear()
+                    await self._wakeup.wait()
+                    continue
+                priority, (data, future, enqueued_at) = picked
+                if future.done():  # el llamador canceló su espera
+                    continue
+                waited_ms = (time.monotonic() - enqueued_at) * 1000.0
+                stats = self._stats[priority]
+                stats["sent"] += 1
+                stats["wait_total_ms"] += waited_ms
+                if waited_ms > stats["wait_max_ms"]:
+                    stats["wait_max_ms"] = waited_ms
+                try:
+                    await self._writer(data)
+                except asyncio.CancelledError:
+                    if not future.done():
+                        future.cancel()
+                    raise
+                except Exception as exc:
+                    if not future.done():
+                        future.set_exception(exc)
+                else:
+                    if not future.done():
+                        future.set_result(None)
+        finally:
+            self._fail_pending(RuntimeError("Planificador de salida detenido"))
+
+    def _fail_pending(self, exc: Exception) -> None:
+        for queue in self._queues.values():
+            while queue:
+                _data, future, _ts = queue.popleft()
+                if not future.done():
+                    future.set_exception(exc)
+                    # Evita "exception was never retrieved" si nadie espera el futuro
+                    future.exception()
+
+
+__all__ = ["OutboundScheduler", "SendPriority", "DEFAULT_BURST_LIMITS"]
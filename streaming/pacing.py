@@ -0,0 +1,112 @@
+"""Pacing del uplink de audio hacia Nova Sonic.
+
+Modos:
+- ``off``: sin pacing, el audio sale tan rápido como llega (comportamiento histórico).
+- ``realtime``: el audio nunca se adelanta al tiempo real.
+- ``burst``: permite adelantarse hasta ``lookahead_ms`` (p. ej. para vaciar un
+  backlog de golpe) y luego vuelve a tiempo real.
+
+Es un token bucket expresado como reloj virtual: cada byte enviado avanza el
+reloj de media; solo se duerme cuando ese reloj supera ``now + lookahead``.
+Con audio en vivo el reloj va a la par de ``time.monotonic()`` y no hay sleeps.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from enum import Enum
+from typing import Any, Callable, Dict, Optional
+
+# Por debajo de este umbral no vale la pena ceder el loop
+_MIN_SLEEP_SECONDS = 0.005
+
+
+class PacingMode(str, Enum):
+    OFF = "off"
+    REALTIME = "realtime"
+    BURST = "burst"
+
+
+class AudioPacer:
+    """Calcula cuándo puede salir el siguiente chunk de audio."""
+
+    def __init__(
+        self,
+        mode: PacingMode | str = PacingMode.OFF,
+        *,
+        bytes_per_second: int,
+        lookahead_ms: int = 0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        try:
+            self.mode = PacingMode(str(getattr(mode, "value", mode)).lower())
+        except ValueError:
+            raise ValueError(
+                f"Modo de pacing desconocido: {mode!r} (usa off, realtime o burst)"
+            ) from None
+        if bytes_per_second <= 0:
+            raise ValueError("bytes_per_second debe ser positivo")
+        if lookahead_ms < 0:
+            raise ValueError("lookahead_ms no puede ser negativo")
+        self.bytes_per_second = bytes_per_second
+        self.lookahead = lookahead_ms / 1000.0 if self.mode is PacingMode.BURST else 0.0
+        self._clock = clock
+        self._media_clock: Optional[float] = None
+        self.sleeps = 0
+        self.delay_total = 0.0
+
+    @classmethod
+    def from_config(
+        cls,
+        config: Optional[Dict[str, Any]],
+        *,
+        bytes_per_second: int,
+        default_mode: str = "off",
+        default_lookahead_ms: int = 0,
+    ) -> "AudioPacer":
+        """Construye el pacer desde la sección ``audio_pacing`` del YAML de contexto."""
+        config = config or {}
+        if not isinstance(config, dict):
+            raise ValueError("'audio_pacing' debe ser un mapa con 'mode' y 'lookahead_ms'")
+        mode = config.get("mode", default_mode)
+        lookahead = config.get("lookahead_ms", default_lookahead_ms)
+        try:
+            lookahead = int(lookahead)
+        except (TypeError, ValueError):
+            raise ValueError(f"lookahead_ms inválido: {lookahead!r}") from None
+        return cls(mode, bytes_per_second=bytes_per_second, lookahead_ms=lookahead)
+
+    def reset(self) -> None:
+        self._media_clock = None
+
+    def reserve(self, byte_count: int) -> float:
+        """Registra ``byte_count`` bytes a enviar y devuelve cuánto esperar antes (s)."""
+        if self.mode is PacingMode.OFF or byte_count <= 0:
+            return 0.0
+        now = self._clock()
+        start = self._media_clock if self._media_clock is not None else now
+        if start < now:
+            start = now  # no acumulamos crédito por silencios pasados
+        self._media_clock = start + byte_count / self.bytes_per_second
+        delay = start - self.lookahead - now
+        return delay if delay > 0 else 0.0
+
+    async def pace(self, byte_count: int) -> None:
+        delay = self.reserve(byte_count)
+        if delay < _MIN_SLEEP_SECONDS:
+            return
+        self.sleeps += 1
+        self.delay_total += delay
+        await asyncio.sleep(delay)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            "mode": self.mode.value,
+            "lookahead_ms": int(self.lookahead * 1000),
+            "sleeps": self.sleeps,
+            "delay_total_ms": round(self.delay_total * 1000.0, 1),
+        }
+
+
+__all__ = ["AudioPacer", "PacingMode"]
@@ -0,0 +1,232 @@
+"""Selección de región de Bedrock por latencia medida y salud del circuito.
+
+Cada sesión nueva se enruta a una de las regiones configuradas
+(``NOVA_SONIC_REGIONS``; por defecto solo ``AWS_REGION``):
+
+- Las sesiones reportan la latencia de apertura del stream y la del primer
+  evento de respuesta tras el turno del usuario; se guardan como promedios
+  móviles por región.
+- Gana la región de menor latencia cuyo circuit breaker (uno por región, ver
+  ``streaming.retry``) admita la llamada; si el circuito de la mejor está
+  abierto, la sesión va a la siguiente (failover).
+- Una región sin muestras recientes recibe de vez en cuando una sesión para
+  volver a medirla: la ruta más rápida cambia a lo largo del día.
+
+Los clientes Bedrock siguen siendo uno por región (``streaming.clients``).
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from config.constants import (
+    BEDROCK_REGIONS,
+    DEFAULT_AWS_REGION,
+    REGION_LATENCY_ALPHA,
+    REGION_PROBE_SECONDS,
+)
+from streaming.retry import CIRCUIT_OPEN, CircuitOpenError, get_retry_coordinator
+
+
+def default_region() -> str:
+    return os.environ.get("AWS_REGION") or os.environ.get("AWS_DEFAULT_REGION") or DEFAULT_AWS_REGION
+
+
+def configured_regions() -> List[str]:
+    return list(BEDROCK_REGIONS) or [default_region()]
+
+
+@dataclass
+class _RegionStats:
+    open_ms: Optional[float] = None
+    first_event_ms: Optional[float] = None
+    open_samples: int = 0
+    first_event_samples: int = 0
+    last_sample_at: Optional[float] = None
+    probe_started_at: Optional[float] = None
+    routed: int = 0
+
+
+class RegionSelector:
+    """Elige la región de cada sesión nueva (thread-safe: las sesiones viven en loops distintos)."""
+
+    def __init__(
+        self,
+        regions: Iterable[str],
+        *,
+        latency_alpha: float = REGION_LATENCY_ALPHA,
+        probe_seconds: float = REGION_PROBE_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.regions = list(dict.fromkeys(region for region in regions if region))
+        if not self.regions:
+            raise ValueError("El selector necesita al menos una región")
+        if not 0.0 < latency_alpha <= 1.0:
+            raise ValueError(f"latency_alpha debe estar en (0, 1] (recibido {latency_alpha})")
+        self.latency_alpha = latency_alpha
+        self.probe_seconds = max(0.0, float(probe_seconds))
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._stats: Dict[str, _RegionStats] = {region: _RegionStats() for region in self.regions}
+        self._metrics = {"routed": 0, "failovers": 0, "probes": 0, "rejected": 0}
+
+    # ------------------------------------------------------------ ruteo
+    def choose(self, *, exclude: Iterable[str] = ()) -> str:
+        """Región para una sesión nueva; consume la admisión de su circuito.
+
+        Lanza ``CircuitOpenError`` si ninguna región admite llamadas.
+        """
+        excluded = set(exclude)
+        now = self._clock()
+        with self._lock:
+            ranked = [region for region in self._ranked() if region not in excluded]
+            probe = self._probe_candidate(now, excluded)
+        candidates = ([probe] if probe else []) + [region for region in ranked if region != probe]
+        for region in candidates:
+            if not get_retry_coordinator(region).admit_call():
+                continue
+            with self._lock:
+                stats = self._stats[region]
+                stats.routed += 1
+                self._metrics["routed"] += 1
+                if region == probe:
+                    stats.probe_started_at = now
+                    self._metrics["probes"] += 1
+                elif ranked and region != ranked[0]:
+                    self._metrics["failovers"] += 1
+            return region
+        with self._lock:
+            self._metrics["rejected"] += 1
+        waits = [get_retry_coordinator(region).open_remaining() for region in self.regions if region not in excluded]
+        raise CircuitOpenError(max(1.0, min(waits, default=0.0)))
+
+    def best_region(self) -> str:
+        """La región que hoy ganaría (sin consumir admisiones); para logs y métricas."""
+        with self._lock:
+            ranked = self._ranked()
+        healthy = [region for region in ranked if self.is_healthy(region)]
+        return (healthy or ranked)[0]
+
+    def is_healthy(self, region: str) -> bool:
+        return get_retry_coordinator(region).state != CIRCUIT_OPEN
+
+    # ------------------------------------------------------------ mediciones
+    def record_open(self, region: str, latency_ms: float) -> None:
+        """Latencia de abrir el stream bidireccional en ``region``."""
+        with self._lock:
+            stats = self._stats.get(region)
+            if stats is None:
+                return
+            stats.open_ms = self._ewma(stats.open_ms, latency_ms)
+            stats.open_samples += 1
+            stats.last_sample_at = self._clock()
+
+    def record_first_event(self, region: str, latency_ms: float) -> None:
+        """Latencia del fin del turno del usuario al primer evento de respuesta."""
+        with self._lock:
+            stats = self._stats.get(region)
+            if stats is None:
+                return
+            stats.first_event_ms = self._ewma(stats.first_event_ms, latency_ms)
+            stats.first_event_samples += 1
+            stats.last_sample_at = self._clock()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            metrics: Dict[str, Any] = dict(self._metrics)
+            scores = {region: self._score(region) for region in self.regions}
+            regions = {}
+            for region, stats in self._stats.items():
+                regions[region] = {
+                    "open_ms": round(stats.open_ms, 1) if stats.open_ms is not None else None,
+                    "first_event_ms": round(stats.first_event_ms, 1) if stats.first_event_ms is not None else None,
+                    "open_samples": stats.open_samples,
+                    "first_event_samples": stats.first_event_samples,
+                    "score_ms": round(scores[region], 1) if scores[region] is not None else None,
+                    "routed": stats.routed,
+                }
+        for region, entry in regions.items():
+            entry["circuit"] = get_retry_coordinator(region).state
+        metrics["regions"] = regions
+        metrics["best"] = self.best_region()
+        return metrics
+
+    # ------------------------------------------------------------ internos
+    def _ewma(self, current: Optional[float], sample: float) -> float:
+        sample = max(0.0, float(sample))
+        if current is None:
+            return sample
+        return current + self.latency_alpha * (sample - current)
+
+    def _score(self, region: str) -> Optional[float]:
+        stats = self._stats[region]
+        if stats.open_ms is None and stats.first_event_ms is None:
+            return None
+        # Un componente sin muestras se toma como el peor conocido: una región
+        # no gana solo porque todavía nadie habló en ella
+        first_known = [s.first_event_ms for s in self._stats.values() if s.first_event_ms is not None]
+        open_known = [s.open_ms for s in self._stats.values() if s.open_ms is not None]
+        open_ms = stats.open_ms if stats.open_ms is not None else max(open_known, default=0.0)
+        first_ms = stats.first_event_ms if stats.first_event_ms is not None else max(first_known, default=0.0)
+        return open_ms + first_ms
+
+    def _ranked(self) -> List[str]:
+        """Regiones medidas por puntaje, luego las no medidas en el orden configurado."""
+        order = {region: index for index, region in enumerate(self.regions)}
+        scores = {region: self._score(region) for region in self.regions}
+        return sorted(
+            self.regions,
+            key=lambda region: (scores[region] is None, scores[region] or 0.0, order[region]),
+        )
+
+    def _probe_candidate(self, now: float, excluded: set) -> Optional[str]:
+        """Región sana a re-medir (nunca medida o con muestras viejas), o None."""
+        if len(self.regions) < 2:
+            return None
+        for region in self.regions:
+            if region in excluded:
+                continue
+            stats = self._stats[region]
+            if stats.probe_started_at is not None and (
+                not self.probe_seconds or now - stats.probe_started_at < self.probe_seconds
+            ):
+                continue
+            if stats.last_sample_at is None:
+                return region
+            if self.probe_seconds and now - stats.last_sample_at >= self.probe_seconds:
+                return region
+        return None
+
+
+_selector: Optional[RegionSelector] = None
+_selector_lock = threading.Lock()
+
+
+def get_region_selector() -> RegionSelector:
+    """Selector compartido por todas las sesiones del worker."""
+    global _selector
+    with _selector_lock:
+        if _selector is None:
+            _selector = RegionSelector(configured_regions())
+        return _selector
+
+
+def reset_region_selector(selector: Optional[RegionSelector] = None) -> RegionSelector:
+    """Reemplaza el selector del worker (tests y benchmarks)."""
+    global _selector
+    with _selector_lock:
+        _selector = selector or RegionSelector(configured_regions())
+        return _selector
+
+
+__all__ = [
+    "RegionSelector",
+    "configured_regions",
+    "default_region",
+    "get_region_selector",
+    "reset_region_selector",
+]
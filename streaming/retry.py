@@ -0,0 +1,359 @@
+"""Coordinación de reintentos contra Bedrock compartida por el worker (por región).
+
+Cada sesión reintentaba por su cuenta con demoras fijas: ante throttling todas
+las sesiones vivas reintentaban al mismo tiempo y empeoraban el throttling.
+Aquí se centraliza la decisión:
+
+- ``classify_error`` traduce la excepción a un ``ErrorKind`` (por tipo y, como
+  respaldo, por texto) que dice si vale la pena reintentar.
+- Backoff exponencial con jitter: sesiones que fallan a la vez se dispersan.
+- Presupuesto de reintentos por worker (token bucket): una tormenta de errores
+  no puede multiplicar la carga hacia Bedrock.
+- Circuit breaker: demasiadas fallas del servicio en la ventana lo abren; con
+  el circuito abierto no se admiten llamadas nuevas y los reintentos de las
+  sesiones vivas esperan a que termine el enfriamiento.
+"""
+
+from __future__ import annotations
+
+import random
+import threading
+import time
+from collections import deque
+from enum import Enum
+from typing import Any, Callable, Deque, Dict, Optional
+
+from config.constants import (
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_OPEN_SECONDS,
+    CIRCUIT_WINDOW_SECONDS,
+    RETRY_BUDGET_REFILL_PER_SECOND,
+    RETRY_BUDGET_TOKENS,
+)
+
+
+class ErrorKind(str, Enum):
+    THROTTLING = "throttling"
+    UNAVAILABLE = "unavailable"
+    TIMEOUT = "timeout"
+    STALL = "stall"
+    CONNECTION = "connection"
+    VALIDATION = "validation"
+    AUTH = "auth"
+    UNKNOWN = "unknown"
+
+    @property
+    def retryable(self) -> bool:
+        return self in _RETRYABLE
+
+    @property
+    def counts_for_circuit(self) -> bool:
+        """Fallas que reflejan la salud del servicio (no errores de la petición)."""
+        return self in _RETRYABLE
+
+
+_RETRYABLE = frozenset({
+    ErrorKind.THROTTLING,
+    ErrorKind.UNAVAILABLE,
+    ErrorKind.TIMEOUT,
+    ErrorKind.STALL,
+    ErrorKind.CONNECTION,
+})
+
+# Nombres de excepción del SDK / stdlib (se recorre el MRO, sin importar el SDK)
+_KIND_BY_EXCEPTION: Dict[str, ErrorKind] = {
+    "ThrottlingException": ErrorKind.THROTTLING,
+    "ServiceQuotaExceededException": ErrorKind.THROTTLING,
+    "TooManyRequestsException": ErrorKind.THROTTLING,
+    "ServiceUnavailableException": ErrorKind.UNAVAILABLE,
+    "InternalServerException": ErrorKind.UNAVAILABLE,
+    "ModelStreamErrorException": ErrorKind.UNAVAILABLE,
+    "ModelNotReadyException": ErrorKind.UNAVAILABLE,
+    "ModelTimeoutException": ErrorKind.TIMEOUT,
+    "TimeoutError": ErrorKind.TIMEOUT,
+    "StreamStallError": ErrorKind.STALL,
+    "ConnectionError": ErrorKind.CONNECTION,
+    "ValidationException": ErrorKind.VALIDATION,
+    "ModelErrorException": ErrorKind.VALIDATION,
+    "AccessDeniedException": ErrorKind.AUTH,
+    "UnrecognizedClientException": ErrorKind.AUTH,
+    "ExpiredTokenException": ErrorKind.AUTH,
+    "NoCredentialsError": ErrorKind.AUTH,
+}
+
+# Respaldo por texto para errores genéricos (el SDK a veces solo trae el mensaje)
+_KIND_BY_TEXT = (
+    (("throttl", "too many requests", "rate exceeded"), ErrorKind.THROTTLING),
+    (("validation", "malformed", "invalid input"), ErrorKind.VALIDATION),
+    (("access denied", "not authorized", "security token", "credentials"), ErrorKind.AUTH),
+    (("timeout", "timed out"), ErrorKind.TIMEOUT),
+    (
+        (
+            "unexpected error",
+            "try your request again",
+            "temporarily unavailable",
+            "service unavailable",
+            "internal error",
+            "internal server",
+        ),
+        ErrorKind.UNAVAILABLE,
+    ),
+    (("connection reset", "connection closed", "stream closed", "broken pipe"), ErrorKind.CONNECTION),
+)
+
+# Demora base del backoff por tipo (el throttling necesita separarse más)
+_BASE_DELAY_SECONDS: Dict[ErrorKind, float] = {ErrorKind.THROTTLING: 1.0}
+_DEFAULT_BASE_DELAY_SECONDS = 0.25
+RETRY_MAX_DELAY_SECONDS = 8.0
+# Tokens del presupuesto que consume cada reintento
+_RETRY_COST: Dict[ErrorKind, float] = {ErrorKind.THROTTLING: 2.0}
+
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_OPEN = "open"
+CIRCUIT_HALF_OPEN = "half_open"
+
+
+def classify_error(error: BaseException) -> ErrorKind:
+    """Clasifica un error de Bedrock/stream en un ``ErrorKind``."""
+    for cls in type(error).__mro__:
+        kind = _KIND_BY_EXCEPTION.get(cls.__name__)
+        if kind is not None:
+            return kind
+    text = str(error).lower()
+    for patterns, kind in _KIND_BY_TEXT:
+        if any(pattern in text for pattern in patterns):
+            return kind
+    return ErrorKind.UNKNOWN
+
+
+class CircuitOpenError(RuntimeError):
+    """Llamada rechazada: el circuito hacia Bedrock está abierto."""
+
+    def __init__(self, retry_after: float) -> None:
+        super().__init__(f"Bedrock no disponible temporalmente (circuito abierto, reintenta en {retry_after:.0f}s)")
+        self.retry_after = retry_after
+
+
+class RetryCoordinator:
+    """Backoff con jitter, presupuesto de reintentos y circuit breaker (thread-safe).
+
+    Las sesiones corren en loops de hilos distintos (y el pool en el suyo), por
+    eso el estado se protege con un ``threading.Lock`` y no con primitivas de asyncio.
+    """
+
+    def __init__(
+        self,
+        *,
+        budget_tokens: float = RETRY_BUDGET_TOKENS,
+        refill_per_second: float = RETRY_BUDGET_REFILL_PER_SECOND,
+        failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        window_seconds: float = CIRCUIT_WINDOW_SECONDS,
+        open_seconds: float = CIRCUIT_OPEN_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+        rng: Optional[random.Random] = None,
+    ) -> None:
+        self.budget_tokens = max(0.0, float(budget_tokens))
+        self.refill_per_second = max(0.0, float(refill_per_second))
+        self.failure_threshold = max(0, int(failure_threshold))  # 0 = breaker desactivado
+        self.window_seconds = max(0.0, float(window_seconds))
+        self.open_seconds = max(0.0, float(open_seconds))
+        self._clock = clock
+        self._rng = rng or random.Random()
+        self._lock = threading.Lock()
+        self._tokens = self.budget_tokens
+        self._refilled_at = clock()
+        self._failures: Deque[float] = deque()
+        self._state = CIRCUIT_CLOSED
+        self._opened_at = 0.0
+        self._probe_inflight = False
+        self._probe_started_at = 0.0
+        self._metrics: Dict[str, Any] = {
+            "trips": 0,
+            "rejected_calls": 0,
+            "retries_granted": 0,
+            "retries_denied": 0,
+            "failures_by_kind": {kind.value: 0 for kind in ErrorKind},
+        }
+
+    # ------------------------------------------------------------ estado
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state(self._clock())
+
+    def open_remaining(self) -> float:
+        with self._lock:
+            return self._open_remaining(self._clock())
+
+    def admit_call(self) -> bool:
+        """¿Se puede abrir una llamada nueva? En half-open pasa una sola de prueba."""
+        with self._lock:
+            now = self._clock()
+            state = self._current_state(now)
+            if state == CIRCUIT_CLOSED:
+                return True
+            if state == CIRCUIT_HALF_OPEN and not self._probe_inflight:
+                self._probe_inflight = True
+                self._probe_started_at = now
+                return True
+            self._metrics["rejected_calls"] += 1
+            return False
+
+    def check_admission(self) -> None:
+        """Como ``admit_call`` pero lanza ``CircuitOpenError`` si se rechaza."""
+        if not self.admit_call():
+            raise CircuitOpenError(max(1.0, self.open_remaining()))
+
+    # ------------------------------------------------------------ resultados
+    def record_success(self) -> None:
+        with self._lock:
+            state = self._current_state(self._clock())
+            self._probe_inflight = False
+            if state == CIRCUIT_HALF_OPEN:
+                self._state = CIRCUIT_CLOSED
+                self._failures.clear()
+
+    def record_failure(self, kind: ErrorKind) -> None:
+        with self._lock:
+            now = self._clock()
+            self._metrics["failures_by_kind"][kind.value] += 1
+            if not kind.counts_for_circuit or not self.failure_threshold:
+                return
+            state = self._current_state(now)
+            self._probe_inflight = False
+            if state == CIRCUIT_HALF_OPEN:
+                self._trip(now)  # la prueba falló: otro enfriamiento completo
+                return
+            if state == CIRCUIT_OPEN:
+                return
+            self._failures.append(now)
+            while self._failures and now - self._failures[0] > self.window_seconds:
+                self._failures.popleft()
+            if len(self._failures) >= self.failure_threshold:
+                self._trip(now)
+
+    # ------------------------------------------------------------ reintentos
+    def acquire_retry(self, kind: ErrorKind, attempt: int) -> Optional[float]:
+        """Demora del reintento ``attempt`` (1..n) o None si el presupuesto no alcanza.
+
+        Con el circuito abierto el reintento se concede pero no antes del fin del
+        enfriamiento, así las sesiones vivas no martillan al servicio.
+        """
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            cost = _RETRY_COST.get(kind, 1.0)
+            if self._tokens < cost:
+                self._metrics["retries_denied"] += 1
+                return None
+            self._tokens -= cost
+            self._metrics["retries_granted"] += 1
+            delay = self._backoff(kind, attempt)
+            if self._current_state(now) == CIRCUIT_OPEN:
+                delay = max(delay, self._open_remaining(now) + self._rng.uniform(0.0, 1.0))
+            return delay
+
+    def get_metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            metrics = dict(self._metrics)
+            metrics["failures_by_kind"] = dict(self._metrics["failures_by_kind"])
+            metrics["state"] = self._current_state(now)
+            metrics["open_remaining_s"] = round(self._open_remaining(now), 1)
+            metrics["retry_tokens"] = round(self._tokens, 2)
+            metrics["recent_failures"] = len(self._failures)
+            return metrics
+
+    # ------------------------------------------------------------ internos
+    def _backoff(self, kind: ErrorKind, attempt: int) -> float:
+        # "Equal jitter": la mitad fija conserva el crecimiento exponencial y la
+        # mitad aleatoria separa a las sesiones que fallaron en el mismo instante
+        base = _BASE_DELAY_SECONDS.get(kind, _DEFAULT_BASE_DELAY_SECONDS)
+        ceiling = min(RETRY_MAX_DELAY_SECONDS, base * (2 ** max(0, attempt - 1)))
+        return ceiling / 2.0 + self._rng.uniform(0.0, ceiling / 2.0)
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._refilled_at
+        self._refilled_at = now
+        if elapsed > 0:
+            self._tokens = min(self.budget_tokens, self._tokens + elapsed * self.refill_per_second)
+
+    def _trip(self, now: float) -> None:
+        self._state = CIRCUIT_OPEN
+        self._opened_at = now
+        self._failures.clear()
+        self._metrics["trips"] += 1
+
+    def _current_state(self, now: float) -> str:
+        if self._state == CIRCUIT_OPEN and now - self._opened_at >= self.open_seconds:
+            self._state = CIRCUIT_HALF_OPEN
+            self._probe_inflight = False
+        elif (
+            self._state == CIRCUIT_HALF_OPEN
+            and self._probe_inflight
+            and now - self._probe_started_at >= self.open_seconds
+        ):
+            # La llamada de prueba nunca informó resultado (p. ej. falló antes de
+            # llegar a Bedrock): se libera el cupo para otra
+            self._probe_inflight = False
+        return self._state
+
+    def _open_remaining(self, now: float) -> float:
+        if self._current_state(now) != CIRCUIT_OPEN:
+            return 0.0
+        return max(0.0, self.open_seconds - (now - self._opened_at))
+
+
+_coordinators: Dict[str, RetryCoordinator] = {}
+_coordinator_override: Optional[RetryCoordinator] = None
+_coordinator_lock = threading.Lock()
+
+
+def get_retry_coordinator(region: Optional[str] = None) -> RetryCoordinator:
+    """Coordinador de ``region`` compartido por todas las sesiones del worker.
+
+    Cada región tiene su propio presupuesto y breaker: el throttling de una no
+    bloquea las llamadas que pueden ir a otra.
+    """
+    with _coordinator_lock:
+        if _coordinator_override is not None:
+            return _coordinator_override
+        key = region or ""
+        coordinator = _coordinators.get(key)
+        if coordinator is None:
+            coordinator = _coordinators[key] = RetryCoordinator()
+        return coordinator
+
+
+def reset_retry_coordinator(
+    coordinator: Optional[RetryCoordinator] = None,
+    *,
+    region: Optional[str] = None,
+) -> RetryCoordinator:
+    """Reemplaza coordinadores del worker (tests y benchmarks).
+
+    Con ``region`` solo se reemplaza el de esa región. Sin ella se descartan
+    todos y, si se pasa ``coordinator``, todas las regiones usan ese.
+    """
+    global _coordinator_override
+    with _coordinator_lock:
+        if region is not None:
+            _coordinator_override = None
+            _coordinators[region] = coordinator = coordinator or RetryCoordinator()
+            return coordinator
+        _coordinators.clear()
+        _coordinator_override = coordinator
+        if coordinator is None:
+            coordinator = _coordinators[""] = RetryCoordinator()
+        return coordinator
+
+
+__all__ = [
+    "CircuitOpenError",
+    "ErrorKind",
+    "RetryCoordinator",
+    "classify_error",
+    "get_retry_coordinator",
+    "reset_retry_coordinator",
+]
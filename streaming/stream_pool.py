@@ -0,0 +1,316 @@
+"""Pool por worker de streams de Nova Sonic ya inicializados.
+
+Cada entrada es un manager con ``sessionStart``, ``promptStart`` y el contexto
+del sistema ya enviados, listo para que una llamada nueva abra su audio sin
+esperar el handshake. Un manager no se puede mover entre loops, así que cada
+entrada se ceba en su propio event loop (un hilo por stream cebado): la llamada
+que la recibe corre en ese loop y es su única dueña, de modo que la
+decodificación o las escrituras a disco de una llamada no frenan el audio de
+otra. El loop del pool solo repone y caduca entradas.
+
+Las entradas caducan antes del límite de inactividad del servidor y se
+reponen en segundo plano.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Deque, Dict, Hashable, Iterable, Optional, Tuple
+
+Factory = Callable[[Hashable], Awaitable[Any]]
+Closer = Callable[[Any], Awaitable[None]]
+
+# Reintento de creación tras un fallo (p. ej. credenciales/red)
+_RETRY_AFTER_FAILURE_SECONDS = 5.0
+
+
+class _StreamLoop:
+    """Event loop dedicado a un stream cebado, en su propio hilo."""
+
+    def __init__(self, name: str) -> None:
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        loop = self.loop
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_forever()
+        finally:
+            pending = asyncio.all_tasks(loop)
+            for task in pending:
+                task.cancel()
+            if pending:
+                loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+            loop.run_until_complete(loop.shutdown_asyncgens())
+            loop.close()
+
+    def submit(self, coro: Awaitable[Any]) -> "asyncio.Future[Any]":
+        """Corre ``coro`` en este loop; el future se espera desde el loop llamador."""
+        return asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, self.loop))
+
+    def stop(self, *, wait: bool = False) -> None:
+        if not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(self.loop.stop)
+        if wait and self._thread is not threading.current_thread():
+            self._thread.join(timeout=5)
+
+    @property
+    def running(self) -> bool:
+        return self._thread.is_alive()
+
+
+@dataclass
+class PooledStream:
+    """Manager cebado entregado a una llamada, junto con el loop donde vive.
+
+    La llamada corre su sesión con ``run`` y, al terminar, ``release`` detiene
+    el loop (el manager ya debe estar cerrado).
+    """
+
+    manager: Any
+    _owner: _StreamLoop = field(repr=False)
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        return self._owner.loop
+
+    def run(self, coro: Awaitable[Any]) -> Any:
+        """Ejecuta ``coro`` en el loop del stream y bloquea hasta que termine."""
+        return asyncio.run_coroutine_threadsafe(coro, self._owner.loop).result()
+
+    def release(self) -> None:
+        self._owner.stop(wait=True)
+
+
+class StreamPool:
+    """Mantiene ``size`` managers inactivos y cebados por clave (config, voz)."""
+
+    def __init__(
+        self,
+        factory: Factory,
+        *,
+        closer: Closer,
+        size: int = 1,
+        max_idle_seconds: float = 30.0,
+        is_usable: Optional[Callable[[Any], bool]] = None,
+        logger: Optional[Callable[[str], None]] = None,
+    ) -> None:
+        if size < 1:
+            raise ValueError("El pool necesita size >= 1")
+        if max_idle_seconds <= 0:
+            raise ValueError("max_idle_seconds debe ser positivo")
+        self._factory = factory
+        self._closer = closer
+        self.size = size
+        self.max_idle_seconds = max_idle_seconds
+        self._is_usable = is_usable
+        self._logger = logger
+
+        self._lock = threading.Lock()
+        self._entries: Dict[Hashable, Deque[Tuple[float, PooledStream]]] = {}
+        self._inflight: Dict[Hashable, int] = {}
+        self._keys: set = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._reaper: Optional[asyncio.TimerHandle] = None
+        self._closing = False
+        self._metrics = {
+            "hits": 0,
+            "misses": 0,
+            "bypass": 0,
+            "created": 0,
+            "failed": 0,
+            "expired": 0,
+        }
+
+    # ------------------------------------------------------------ lifecycle
+    @property
+    def loop(self) -> Optional[asyncio.AbstractEventLoop]:
+        """Loop de mantenimiento del pool (las sesiones corren en el de su stream)."""
+        return self._loop
+
+    def start(self, keys: Iterable[Hashable]) -> None:
+        """Arranca el loop del pool y empieza a cebar las claves indicadas."""
+        with self._lock:
+            self._keys.update(keys)
+            for key in self._keys:
+                self._entries.setdefault(key, deque())
+                self._inflight.setdefault(key, 0)
+            if self._thread is None:
+                ready = threading.Event()
+                self._thread = threading.Thread(target=self._run_loop, args=(ready,), daemon=True)
+                self._thread.start()
+                ready.wait()
+        assert self._loop is not None
+        self._loop.call_soon_threadsafe(self._fill_all)
+
+    def shutdown(self) -> None:
+        loop = self._loop
+        if loop is None:
+            return
+        self._closing = True
+        future = asyncio.run_coroutine_threadsafe(self._drain_all(), loop)
+        try:
+            future.result(timeout=10)
+        except Exception:
+            pass
+        loop.call_soon_threadsafe(loop.stop)
+        if self._thread:
+            self._thread.join(timeout=5)
+        self._thread = None
+        self._loop = None
+
+    # ------------------------------------------------------------ handoff
+    def acquire(self, key: Hashable) -> Optional[PooledStream]:
+        """Entrega un stream cebado para ``key`` o ``None`` (thread-safe)."""
+        if key not in self._keys or self._loop is None:
+            with self._lock:
+                self._metrics["bypass"] += 1
+            return None
+        pooled = None
+        now = time.monotonic()
+        with self._lock:
+            entries = self._entries.get(key) or deque()
+            while entries:
+                created_at, candidate = entries.popleft()
+                if now - created_at < self.max_idle_seconds and self._is_alive(candidate.manager):
+                    pooled = candidate
+                    break
+                self._metrics["expired"] += 1
+                self._schedule_close(candidate)
+            self._metrics["hits" if pooled is not None else "misses"] += 1
+        self._loop.call_soon_threadsafe(self._fill, key)
+        return pooled
+
+    def get_metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            metrics: Dict[str, Any] = dict(self._metrics)
+            metrics["idle"] = {str(key): len(entries) for key, entries in self._entries.items()}
+        lookups = metrics["hits"] + metrics["misses"]
+        metrics["hit_rate"] = round(metrics["hits"] / lookups, 3) if lookups else 0.0
+        return metrics
+
+    # ------------------------------------------------------------ internals
+    def _log(self, message: str) -> None:
+        if self._logger:
+            try:
+                self._logger(message)
+            except Exception:
+                pass
+
+    def _is_alive(self, manager: Any) -> bool:
+        if not getattr(manager, "is_active", True):
+            return False
+        return self._is_usable is None or self._is_usable(manager)
+
+    def _run_loop(self, ready: threading.Event) -> None:
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        self._loop = loop
+        self._reaper = loop.call_later(self._reap_interval(), self._reap)
+        ready.set()
+        try:
+            loop.run_forever()
+        finally:
+            pending = asyncio.all_tasks(loop)
+            for task in pending:
+                task.cancel()
+            if pending:
+                loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+            loop.close()
+
+    def _reap_interval(self) -> float:
+        return max(1.0, self.max_idle_seconds / 4.0)
+
+    def _fill_all(self) -> None:
+        for key in list(self._keys):
+            self._fill(key)
+
+    def _fill(self, key: Hashable) -> None:
+        if self._closing:
+            return
+        with self._lock:
+            missing = self.size - len(self._entries[key]) - self._inflight[key]
+            if missing <= 0:
+                return
+            self._inflight[key] += missing
+        for _ in range(missing):
+            asyncio.ensure_future(self._create(key))
+
+    async def _create(self, key: Hashable) -> None:
+        started = time.monotonic()
+        owner = _StreamLoop(name=f"nova-pool-{key}")
+        try:
+            manager = await owner.submit(self._factory(key))
+        except asyncio.CancelledError:
+            owner.stop()  # shutdown con un cebado en curso
+            raise
+        except Exception as exc:
+            owner.stop()
+            with self._lock:
+                self._inflight[key] -= 1
+                self._metrics["failed"] += 1
+            self._log(f"⚠️ Pool: no se pudo cebar stream {key}: {exc}")
+            asyncio.get_running_loop().call_later(_RETRY_AFTER_FAILURE_SECONDS, self._fill, key)
+            return
+        with self._lock:
+            self._inflight[key] -= 1
+            self._metrics["created"] += 1
+            closing = self._closing
+            pooled = PooledStream(manager, owner)
+            if not closing:
+                self._entries[key].append((time.monotonic(), pooled))
+        if closing:
+            await self._close(pooled)
+            return
+        self._log(f"♨️ Pool: stream cebado para {key} en {time.monotonic() - started:.2f}s")
+
+    def _reap(self) -> None:
+        now = time.monotonic()
+        with self._lock:
+            for key, entries in self._entries.items():
+                keep = deque()
+                for created_at, pooled in entries:
+                    if now - created_at < self.max_idle_seconds and self._is_alive(pooled.manager):
+                        keep.append((created_at, pooled))
+                    else:
+                        self._metrics["expired"] += 1
+                        self._schedule_close(pooled)
+                self._entries[key] = keep
+        self._fill_all()
+        if not self._closing and self._loop is not None:
+            self._reaper = self._loop.call_later(self._reap_interval(), self._reap)
+
+    def _schedule_close(self, pooled: PooledStream) -> None:
+        loop = self._loop
+        if loop is None:
+            pooled._owner.stop()
+            return
+        loop.call_soon_threadsafe(lambda: asyncio.ensure_future(self._close(pooled)))
+
+    async def _close(self, pooled: PooledStream) -> None:
+        # El closer corre en el loop del stream; después ese loop se detiene
+        try:
+            await pooled._owner.submit(self._closer(pooled.manager))
+        except Exception as exc:
+            self._log(f"⚠️ Pool: error cerrando stream inactivo: {exc}")
+        finally:
+            pooled._owner.stop()
+
+    async def _drain_all(self) -> None:
+        if self._reaper:
+            self._reaper.cancel()
+        with self._lock:
+            pooled = [entry for entries in self._entries.values() for _, entry in entries]
+            for entries in self._entries.values():
+                entries.clear()
+        await asyncio.gather(*(self._close(entry) for entry in pooled), return_exceptions=True)
+
+
+__all__ = ["PooledStream", "StreamPool"]
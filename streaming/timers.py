@@ -0,0 +1,87 @@
+"""Temporizadores de plazo sobre el event loop (sin polling)."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Callable, Optional
+
+# asyncio puede despertar un handle hasta una resolución de reloj antes de su hora
+_CLOCK_TOLERANCE = 0.001
+
+
+class DeadlineTimer:
+    """Dispara ``callback`` cuando vence un plazo que se puede reprogramar.
+
+    Reprogramar hacia adelante no crea un ``TimerHandle`` nuevo: solo mueve el
+    plazo, y al despertar el handle vigente se re-arma por el tiempo restante.
+    Así un stream de audio que reprograma en cada chunk no genera churn de
+    timers y una sesión inactiva no despierta el loop en absoluto.
+    """
+
+    def __init__(self, callback: Callable[[], None]) -> None:
+        self._callback = callback
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._handle: Optional[asyncio.TimerHandle] = None
+        self._handle_when: Optional[float] = None
+        self._deadline: Optional[float] = None
+        self.wakeups = 0  # veces que el loop despertó por este timer
+        self.fires = 0    # veces que el plazo venció y se llamó al callback
+
+    @property
+    def armed(self) -> bool:
+        return self._deadline is not None
+
+    @property
+    def deadline(self) -> Optional[float]:
+        return self._deadline
+
+    def time(self) -> float:
+        return self._get_loop().time()
+
+    def reschedule(self, delay: float) -> None:
+        """Fija el plazo a ``delay`` segundos desde ahora."""
+        self.reschedule_at(self.time() + max(0.0, delay))
+
+    def reschedule_at(self, when: float) -> None:
+        """Fija el plazo absoluto ``when`` (reloj de ``loop.time()``)."""
+        loop = self._get_loop()
+        self._deadline = when
+        if self._handle is not None and self._handle_when is not None and self._handle_when <= when:
+            return  # el handle actual despierta antes y se re-armará solo
+        self._arm(loop, when)
+
+    def cancel(self) -> None:
+        self._deadline = None
+        if self._handle is not None:
+            self._handle.cancel()
+        self._handle = None
+        self._handle_when = None
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        if self._loop is None:
+            self._loop = asyncio.get_running_loop()
+        return self._loop
+
+    def _arm(self, loop: asyncio.AbstractEventLoop, when: float) -> None:
+        if self._handle is not None:
+            self._handle.cancel()
+        self._handle_when = when
+        self._handle = loop.call_at(when, self._on_timer)
+
+    def _on_timer(self) -> None:
+        self.wakeups += 1
+        self._handle = None
+        self._handle_when = None
+        deadline = self._deadline
+        if deadline is None:
+            return
+        loop = self._get_loop()
+        if loop.time() + _CLOCK_TOLERANCE < deadline:
+            self._arm(loop, deadline)
+            return
+        self._deadline = None
+        self.fires += 1
+        self._callback()
+
+
+__all__ = ["DeadlineTimer"]
@@ -0,0 +1,67 @@
+"""Ejecución de tool calls fuera del loop de lectura del stream."""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import inspect
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from config.constants import TOOL_EXECUTOR_WORKERS
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_tool_executor() -> ThreadPoolExecutor:
+    """Pool de hilos compartido por el worker para handlers síncronos de tools."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=max(1, TOOL_EXECUTOR_WORKERS),
+                thread_name_prefix="nova-tool",
+            )
+        return _executor
+
+
+async def run_tool_call(
+    handler: Callable[..., Any],
+    *args: Any,
+    timeout: Optional[float] = None,
+) -> Any:
+    """Ejecuta un handler de tool con plazo.
+
+    Los handlers ``async`` corren como corrutina en el loop; los síncronos van
+    al pool de hilos para no bloquear la lectura de audio/texto. Si vence el
+    plazo se lanza ``asyncio.TimeoutError``: la corrutina se cancela, pero un
+    hilo en curso no se puede interrumpir y su resultado simplemente se descarta.
+    """
+    if inspect.iscoroutinefunction(handler):
+        call = handler(*args)
+    else:
+        loop = asyncio.get_running_loop()
+        call = loop.run_in_executor(get_tool_executor(), functools.partial(handler, *args))
+    if timeout is None or timeout <= 0:
+        result = await call
+    else:
+        result = await asyncio.wait_for(call, timeout)
+    # Handlers síncronos que devuelven un awaitable (p. ej. un Future)
+    if inspect.isawaitable(result):
+        result = await result
+    return result
+
+
+def tool_timeout_result(tool_name: Optional[str], timeout: float) -> Dict[str, Any]:
+    """Resultado estructurado que recibe el modelo cuando un tool excede su plazo."""
+    return {
+        "status": "timeout",
+        "tool": tool_name,
+        "timeout_s": timeout,
+        "message": (
+            f"La herramienta '{tool_name}' no respondió en {timeout:g} s. "
+            "Informa al usuario que hubo una demora y continúa la conversación."
+        ),
+    }
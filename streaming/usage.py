@@ -0,0 +1,294 @@
+"""Contabilidad de tokens y costo por turno, con presupuesto por sesión."""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+
+from config.constants import (
+    SESSION_BUDGET_ACTION,
+    SESSION_BUDGET_FALLBACK_PROMPT,
+    SESSION_BUDGET_TOKENS,
+    SESSION_BUDGET_USD,
+    SESSION_BUDGET_WARN_RATIO,
+    SPEECH_TOKENS_PER_SECOND,
+    calculate_usage_cost,
+)
+
+# user_speech: voz del usuario · context: texto de entrada (prompt, KB, historial)
+# coach: instrucciones inyectadas · assistant_text / assistant_speech: salida del modelo
+USAGE_CATEGORIES = ("user_speech", "context", "coach", "assistant_text", "assistant_speech")
+BUDGET_ACTIONS = ("wrap_up", "switch_prompt", "none")
+
+# Aproximación de caracteres por token de texto (español) para atribuir el coach
+_CHARS_PER_TOKEN = 4
+_MAX_TURNS_KEPT = 50
+
+
+def _count(block: Any, key: str) -> int:
+    if not isinstance(block, dict):
+        return 0
+    try:
+        return int(block.get(key) or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _cost(tokens: Dict[str, int]) -> float:
+    return calculate_usage_cost(
+        speech_input=tokens["user_speech"],
+        text_input=tokens["context"] + tokens["coach"],
+        speech_output=tokens["assistant_speech"],
+        text_output=tokens["assistant_text"],
+    )
+
+
+class UsageLedger:
+    """Acumula tokens por categoría y por turno a partir de usageEvent/performanceMetrics.
+
+    Nova Sonic informa el uso con retraso; mientras tanto se estima con la
+    duración del audio de ida y vuelta (``SPEECH_TOKENS_PER_SECOND``). Cada
+    evento autoritativo reemplaza la estimación pendiente.
+    """
+
+    def __init__(self, speech_tokens_per_second: float = SPEECH_TOKENS_PER_SECOND) -> None:
+        self._speech_rate = max(0.0, speech_tokens_per_second)
+        self.totals: Dict[str, int] = dict.fromkeys(USAGE_CATEGORIES, 0)
+        self._turn: Dict[str, int] = dict.fromkeys(USAGE_CATEGORIES, 0)
+        self.turn_index = 1
+        self.turns: Deque[Dict[str, Any]] = deque(maxlen=_MAX_TURNS_KEPT)
+        # Totales acumulados del servidor (para derivar deltas si no viene details.delta)
+        self._server_totals: Dict[str, int] = {}
+        self._coach_chars = 0
+        self._pending_user_audio_s = 0.0
+        self._pending_assistant_audio_s = 0.0
+        self.events = 0
+
+    # ------------------------------------------------------------ entradas
+    def note_coach_text(self, text: str) -> None:
+        self._coach_chars += len(text or "")
+
+    def note_user_audio(self, seconds: float) -> None:
+        self._pending_user_audio_s += seconds
+
+    def note_assistant_audio(self, seconds: float) -> None:
+        self._pending_assistant_audio_s += seconds
+
+    def record(self, metrics: Dict[str, Any]) -> bool:
+        """Aplica un evento de uso. Devuelve False si no traía tokens."""
+        delta = self._extract_delta(metrics)
+        if delta is None:
+            return False
+        speech_in, text_in, speech_out, text_out = delta
+        coach = min(text_in, -(-self._coach_chars // _CHARS_PER_TOKEN))
+        self._coach_chars = max(0, self._coach_chars - coach * _CHARS_PER_TOKEN)
+        self._add({
+            "user_speech": speech_in,
+            "context": text_in - coach,
+            "coach": coach,
+            "assistant_text": text_out,
+            "assistant_speech": speech_out,
+        })
+        # El dato real reemplaza la estimación por duración de audio
+        self._pending_user_audio_s = 0.0
+        self._pending_assistant_audio_s = 0.0
+        self.events += 1
+        return True
+
+    def close_turn(self) -> Optional[Dict[str, Any]]:
+        """Cierra el turno en curso (fin de respuesta del asistente) y lo devuelve."""
+        if not any(self._turn.values()):
+            return None
+        summary = {
+            "index": self.turn_index,
+            "tokens": dict(self._turn),
+            "totalTokens": sum(self._turn.values()),
+            "costUsd": _cost(self._turn),
+        }
+        self.turns.append(summary)
+        self._turn = dict.fromkeys(USAGE_CATEGORIES, 0)
+        self.turn_index += 1
+        return summary
+
+    # ------------------------------------------------------------- lecturas
+    @property
+    def total_tokens(self) -> int:
+        return sum(self.totals.values())
+
+    @property
+    def cost_usd(self) -> float:
+        return _cost(self.totals)
+
+    def pending_estimate(self) -> Dict[str, int]:
+        return {
+            "user_speech": int(self._pending_user_audio_s * self._speech_rate),
+            "assistant_speech": int(self._pending_assistant_audio_s * self._speech_rate),
+        }
+
+    def projected(self) -> Tuple[int, float]:
+        """(tokens, costo) incluyendo la estimación pendiente por audio."""
+        estimate = self.pending_estimate()
+        tokens = dict(self.totals)
+        tokens["user_speech"] += estimate["user_speech"]
+        tokens["assistant_speech"] += estimate["assistant_speech"]
+        return sum(tokens.values()), _cost(tokens)
+
+    def payload(self) -> Dict[str, Any]:
+        """Payload de usage_update (las claves legacy se mantienen para la UI)."""
+        totals = self.totals
+        input_tokens = totals["user_speech"] + totals["context"] + totals["coach"]
+        output_tokens = totals["assistant_text"] + totals["assistant_speech"]
+        estimate = self.pending_estimate()
+        projected_tokens, projected_cost = self.projected()
+        return {
+            "inputTokens": input_tokens,
+            "outputTokens": output_tokens,
+            "speechTokens": totals["user_speech"] + totals["assistant_speech"],
+            "totalTokens": input_tokens + output_tokens,
+            "estimatedCostUsd": projected_cost,
+            "reportedCostUsd": self.cost_usd,
+            "breakdown": dict(totals),
+            "turn": {
+                "index": self.turn_index,
+                "tokens": dict(self._turn),
+                "costUsd": _cost(self._turn),
+            },
+            "lastTurn": self.turns[-1] if self.turns else None,
+            "pendingEstimate": estimate,
+            "provisional": projected_tokens > input_tokens + output_tokens,
+        }
+
+    # ------------------------------------------------------------- internos
+    def _add(self, tokens: Dict[str, int]) -> None:
+        for key, value in tokens.items():
+            if value > 0:
+                self.totals[key] += value
+                self._turn[key] += value
+
+    def _extract_delta(self, metrics: Dict[str, Any]) -> Optional[Tuple[int, int, int, int]]:
+        details = metrics.get("details") if isinstance(metrics.get("details"), dict) else {}
+        delta = details.get("delta")
+        if isinstance(delta, dict):
+            values = (
+                _count(delta.get("input"), "speechTokens"),
+                _count(delta.get("input"), "textTokens"),
+                _count(delta.get("output"), "speechTokens"),
+                _count(delta.get("output"), "textTokens"),
+            )
+            return values if any(values) else None
+
+        total = details.get("total")
+        if isinstance(total, dict):
+            current = {
+                "speech_in": _count(total.get("input"), "speechTokens"),
+                "text_in": _count(total.get("input"), "textTokens"),
+                "speech_out": _count(total.get("output"), "speechTokens"),
+                "text_out": _count(total.get("output"), "textTokens"),
+            }
+            return self._diff_server_totals(current)
+
+        if "totalInputTokens" in metrics or "totalOutputTokens" in metrics:
+            # Sin desglose por modalidad: se atribuye como texto (tarifa legacy)
+            current = {
+                "text_in": _count(metrics, "totalInputTokens"),
+                "text_out": _count(metrics, "totalOutputTokens"),
+            }
+            return self._diff_server_totals(current)
+
+        # performanceMetrics legacy: contadores por evento
+        text_in = (
+            _count(metrics, "inputTokenCount")
+            or _count(metrics, "inputTextTokenCount")
+            or _count(metrics, "inputTokens")
+        )
+        text_out = (
+            _count(metrics, "outputTokenCount")
+            or _count(metrics, "outputTextTokenCount")
+            or _count(metrics, "outputTokens")
+        )
+        if not text_in and not text_out:
+            return None
+        return 0, text_in, 0, text_out
+
+    def _diff_server_totals(self, current: Dict[str, int]) -> Optional[Tuple[int, int, int, int]]:
+        diff = {key: max(0, value - self._server_totals.get(key, 0)) for key, value in current.items()}
+        self._server_totals.update(current)
+        values = (
+            diff.get("speech_in", 0),
+            diff.get("text_in", 0),
+            diff.get("speech_out", 0),
+            diff.get("text_out", 0),
+        )
+        return values if any(values) else None
+
+
+class SessionBudget:
+    """Límite de costo/tokens por sesión con aviso previo y una acción al agotarse."""
+
+    def __init__(
+        self,
+        *,
+        max_cost_usd: float = 0.0,
+        max_tokens: int = 0,
+        warn_ratio: float = SESSION_BUDGET_WARN_RATIO,
+        action: str = SESSION_BUDGET_ACTION,
+        fallback_prompt: Optional[str] = SESSION_BUDGET_FALLBACK_PROMPT,
+    ) -> None:
+        if action not in BUDGET_ACTIONS:
+            raise ValueError(f"Acción de presupuesto inválida '{action}' ({' | '.join(BUDGET_ACTIONS)})")
+        self.max_cost_usd = max(0.0, float(max_cost_usd))
+        self.max_tokens = max(0, int(max_tokens))
+        self.warn_ratio = min(max(float(warn_ratio), 0.0), 1.0)
+        self.action = action
+        self.fallback_prompt = fallback_prompt
+        self._warned = False
+        self._exceeded = False
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict[str, Any]]) -> "SessionBudget":
+        """Construye el presupuesto desde la sección ``budget`` del YAML (o los defaults de entorno)."""
+        if config is None:
+            config = {}
+        if not isinstance(config, dict):
+            raise ValueError("'budget' debe ser un mapa (max_cost_usd, max_tokens, action, ...)")
+        return cls(
+            max_cost_usd=config.get("max_cost_usd", SESSION_BUDGET_USD),
+            max_tokens=config.get("max_tokens", SESSION_BUDGET_TOKENS),
+            warn_ratio=config.get("warn_ratio", SESSION_BUDGET_WARN_RATIO),
+            action=str(config.get("action", SESSION_BUDGET_ACTION)).lower(),
+            fallback_prompt=config.get("fallback_prompt", SESSION_BUDGET_FALLBACK_PROMPT),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_cost_usd > 0 or self.max_tokens > 0
+
+    def usage_ratio(self, cost_usd: float, tokens: int) -> float:
+        ratios = []
+        if self.max_cost_usd > 0:
+            ratios.append(cost_usd / self.max_cost_usd)
+        if self.max_tokens > 0:
+            ratios.append(tokens / self.max_tokens)
+        return max(ratios) if ratios else 0.0
+
+    def check(self, cost_usd: float, tokens: int) -> Optional[str]:
+        """Devuelve 'warn' o 'exceeded' la primera vez que se cruza cada umbral."""
+        if not self.enabled or self._exceeded:
+            return None
+        ratio = self.usage_ratio(cost_usd, tokens)
+        if ratio >= 1.0:
+            self._exceeded = True
+            return "exceeded"
+        if ratio >= self.warn_ratio and not self._warned:
+            self._warned = True
+            return "warn"
+        return None
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            "max_cost_usd": self.max_cost_usd,
+            "max_tokens": self.max_tokens,
+            "action": self.action,
+            "warned": self._warned,
+            "exceeded": self._exceeded,
+        }
@@ -0,0 +1,60 @@
+"""Fakes compartidos por los tests: stream bidireccional y cliente Bedrock en memoria."""
+
+import asyncio
+import json
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+MINIMAL_CONTEXT = os.path.join(ROOT, "config", "context_v8_minimal.yaml")
+
+
+class FakeStream:
+    """Stream bidireccional falso: acepta escrituras y lanza la falla inyectada al leer."""
+
+    def __init__(self) -> None:
+        self.sent = []
+        self.input_stream = self
+        self._fault = asyncio.get_running_loop().create_future()
+
+    async def send(self, chunk) -> None:
+        self.sent.append(json.loads(chunk.value.bytes_))
+
+    async def close(self) -> None:
+        pass
+
+    async def await_output(self):
+        return None, self
+
+    async def receive(self):
+        raise await asyncio.shield(self._fault)
+
+    def inject(self, exc: Exception) -> None:
+        if not self._fault.done():
+            self._fault.set_result(exc)
+
+
+class FakeBedrockClient:
+    def __init__(self) -> None:
+        self.streams = []
+
+    async def invoke_model_with_bidirectional_stream(self, request):
+        stream = FakeStream()
+        self.streams.append(stream)
+        return stream
+
+
+async def open_manager(client, *, open_audio: bool = True, events=None, **kwargs):
+    """BedrockStreamManager con el contexto mínimo, inicializado sobre ``client``."""
+    from context.bootstrap import load_context_sources
+    from nova_sonic_es_sd import BedrockStreamManager
+
+    manager = BedrockStreamManager(context_sources=load_context_sources(MINIMAL_CONTEXT), **kwargs)
+    manager.bedrock_client = client
+    on_next = events.append if events is not None else (lambda event: None)
+    manager.output_subject.subscribe(on_next=on_next, on_error=lambda exc: None)
+    await manager.initialize_stream(open_audio=open_audio)
+    return manager
@@ -0,0 +1,65 @@
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(__file__))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from streaming.pacing import AudioPacer, PacingMode
+
+BYTES_PER_SECOND = 32000  # 16 kHz, 16 bits mono
+CHUNK_100MS = 3200
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 50.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_off_never_waits():
+    pacer = AudioPacer("off", bytes_per_second=BYTES_PER_SECOND, clock=FakeClock())
+    assert [pacer.reserve(CHUNK_100MS) for _ in range(5)] == [0.0] * 5
+
+
+def test_realtime_backlog_is_sent_at_media_speed():
+    pacer = AudioPacer(PacingMode.REALTIME, bytes_per_second=BYTES_PER_SECOND, clock=FakeClock())
+    delays = [round(pacer.reserve(CHUNK_100MS), 3) for _ in range(4)]
+    assert delays == [0.0, 0.1, 0.2, 0.3]
+
+
+def test_burst_allows_lookahead_then_paces():
+    pacer = AudioPacer("BURST", bytes_per_second=BYTES_PER_SECOND, lookahead_ms=150, clock=FakeClock())
+    delays = [round(pacer.reserve(CHUNK_100MS), 3) for _ in range(4)]
+    assert delays == [0.0, 0.0, 0.05, 0.15]
+    assert pacer.get_metrics()["lookahead_ms"] == 150
+
+
+def test_silence_does_not_bank_credit():
+    clock = FakeClock()
+    pacer = AudioPacer("realtime", bytes_per_second=BYTES_PER_SECOND, clock=clock)
+    pacer.reserve(CHUNK_100MS)
+    clock.now += 5.0  # el usuario calló: al volver no hay ráfaga adelantada
+    assert pacer.reserve(CHUNK_100MS) == 0.0
+    assert round(pacer.reserve(CHUNK_100MS), 3) == 0.1
+
+
+def test_config_validation():
+    # lookahead solo aplica en burst
+    pacer = AudioPacer.from_config({"mode": "realtime", "lookahead_ms": 200}, bytes_per_second=BYTES_PER_SECOND)
+    assert pacer.lookahead == 0.0
+    for config in ({"mode": "turbo"}, {"lookahead_ms": "x"}, {"mode": "burst", "lookahead_ms": -1}, ["burst"]):
+        try:
+            AudioPacer.from_config(config, bytes_per_second=BYTES_PER_SECOND)
+            raise AssertionError(f"se esperaba ValueError para {config!r}")
+        except ValueError:
+            pass
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"✅ {name}")
@@ -0,0 +1,83 @@
+import json
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(__file__))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from context.base import ContextSource
+from context.cache import RenderedContextCache
+
+
+class CountingSource(ContextSource):
+    def __init__(self, text, key="v1", role="SYSTEM", error=None) -> None:
+        self.text = text
+        self.key = key
+        self.role = role
+        self.error = error
+        self.renders = 0
+
+    def render(self) -> str:
+        self.renders += 1
+        if self.error:
+            raise self.error
+        return self.text
+
+    def cache_key(self):
+        return None if self.key is None else ("counting", self.text, self.key)
+
+
+def test_hits_until_a_source_changes():
+    cache = RenderedContextCache()
+    prompt, kb = CountingSource("Eres un asistente."), CountingSource("KB: horarios")
+    first = cache.get([prompt, kb])
+    assert cache.get([prompt, kb]) is first
+    assert prompt.renders == 1
+    kb.key = "v2"  # editar la KB cambia su cache_key (mtime/tamaño)
+    assert cache.get([prompt, kb]) is not first
+    assert cache.get_metrics() == {"hits": 1, "misses": 2, "entries": 2, "hit_rate": 0.333}
+
+
+def test_uncacheable_and_failed_renders_are_not_stored():
+    cache = RenderedContextCache()
+    dynamic = CountingSource("Hoy es lunes.", key=None)
+    cache.get([dynamic])
+    cache.get([dynamic])
+    assert dynamic.renders == 2
+
+    broken = CountingSource("", error=OSError("no existe"))
+    assert cache.get([broken]).errors == ["no existe"]
+    cache.get([broken])
+    assert broken.renders == 2 and cache.get_metrics()["entries"] == 0
+
+
+def test_lru_evicts_oldest_entry():
+    cache = RenderedContextCache(max_entries=2)
+    a, b, c = CountingSource("a"), CountingSource("b"), CountingSource("c")
+    cache.get([a])
+    cache.get([b])
+    cache.get([a])  # a pasa a ser la más reciente
+    cache.get([c])  # sale b
+    cache.get([a])
+    cache.get([b])
+    assert (a.renders, b.renders, c.renders) == (1, 2, 1)
+
+
+def test_system_sources_share_one_block_with_session_prompt_name():
+    cache = RenderedContextCache()
+    rendered = cache.get([CountingSource("Prompt"), CountingSource("KB"), CountingSource("Hola", role="USER")])
+    assert [(b.role, b.combined, b.fragment_lengths) for b in rendered.blocks] == [
+        ("SYSTEM", True, [6, 2]),
+        ("USER", False, [4]),
+    ]
+    [(block, events), _] = rendered.events_for("prompt-123")
+    names = {next(iter(json.loads(e)["event"].values()))["promptName"] for e in events}
+    assert names == {"prompt-123"} and len(events) == 4  # contentStart + 2 textInput + contentEnd
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"✅ {name}")
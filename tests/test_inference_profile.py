@@ -0,0 +1,54 @@
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(__file__))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from streaming.inference import InferenceProfile, InferenceProfileStats
+
+
+def _rejects(config):
+    try:
+        InferenceProfile.from_config(config)
+    except ValueError:
+        return True
+    return False
+
+
+def test_profile_from_config_and_defaults():
+    profile = InferenceProfile.from_config({"name": "minimal_fast", "max_tokens": "512", "top_p": 0.9})
+    assert profile.session_config()["maxTokens"] == 512 and profile.top_p == 0.9
+    assert profile.temperature == InferenceProfile().temperature
+    assert InferenceProfile.from_config(None) == InferenceProfile()
+
+
+def test_invalid_profiles_are_rejected():
+    assert _rejects(["max_tokens", 512])
+    assert _rejects({"maxTokens": 512})  # clave desconocida (camelCase del evento)
+    assert _rejects({"max_tokens": "mucho"})
+    assert _rejects({"max_tokens": 0})
+    assert _rejects({"top_p": 0.0})
+    assert _rejects({"top_p": 1.5})
+    assert _rejects({"temperature": -0.1})
+    assert _rejects({"name": ""})
+
+
+def test_stats_aggregate_by_profile_name():
+    stats = InferenceProfileStats()
+    fast = InferenceProfile(name="fast", max_tokens=256)
+    stats.record_session(fast)
+    stats.record_response(fast, 300.0)
+    stats.record_response(fast, 500.0)
+    stats.record_turn(fast, {"totalTokens": 100, "costUsd": 0.002, "tokens": {"assistant_speech": 40}})
+    metrics = stats.get_metrics()["fast"]
+    assert metrics["config"]["maxTokens"] == 256
+    assert metrics["avg_response_ms"] == 400.0 and metrics["max_response_ms"] == 500.0
+    assert metrics["avg_output_tokens_per_turn"] == 40.0
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"✅ {name}")
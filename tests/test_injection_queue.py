@@ -0,0 +1,64 @@
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(__file__))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from streaming.injection import InjectionQueue
+
+COACH = ("[COACH] ", " [/COACH]")
+
+
+def test_same_channel_texts_merge_into_one_block():
+    queue = InjectionQueue()
+    queue.add("Pide el DNI.", envelope=COACH)
+    queue.add("Confirma el teléfono.", envelope=COACH)
+    queue.add("Saluda al usuario.", role="USER")
+    blocks = queue.drain()
+    assert [(b.role, b.count) for b in blocks] == [("SYSTEM", 2), ("USER", 1)]
+    assert blocks[0].text == "[COACH] Pide el DNI.\nConfirma el teléfono. [/COACH]"
+    assert len(queue) == 0 and queue.drain() == []
+
+
+def test_newer_text_with_same_key_supersedes_pending_one():
+    queue = InjectionQueue()
+    assert not queue.add("Faltan: nombre, DNI.", key="missing")
+    queue.add("Habla más despacio.", key="pace")
+    assert queue.add("Falta: DNI.", key="missing")
+    [block] = queue.drain()
+    assert block.text == "Habla más despacio.\nFalta: DNI."
+    assert queue.get_metrics()["superseded"] == 1
+
+
+def test_items_without_key_are_never_superseded():
+    queue = InjectionQueue()
+    queue.add("Presupuesto agotado: despídete.")  # key=None
+    queue.add("Falta: DNI.", key="missing")
+    queue.add("Falta: teléfono.", key="missing")
+    [block] = queue.drain()
+    assert block.text.startswith("Presupuesto agotado: despídete.")
+    assert block.count == 2
+
+
+def test_duplicates_collapse_and_tokens_are_counted_per_turn():
+    queue = InjectionQueue()
+    queue.add("Pide el DNI.")
+    queue.add("Pide el DNI.")
+    queue.add("   ")  # vacío: se ignora
+    [block] = queue.drain()
+    assert block.count == 1
+    queue.record_sent(block)
+    assert queue.close_turn(3) == {"index": 3, "blocks": 1, "tokens": block.estimated_tokens}
+    assert queue.close_turn(4) is None
+    queue.add("Pendiente al colgar.")
+    assert queue.discard() == 1
+    metrics = queue.get_metrics()
+    assert metrics["superseded"] == 1 and metrics["dropped"] == 1 and metrics["queued"] == 3
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"✅ {name}")
@@ -0,0 +1,82 @@
+import asyncio
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(__file__))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from streaming.outbound import OutboundScheduler, SendPriority
+
+
+async def _send_order(burst_limits=None):
+    written = []
+
+    async def writer(data: bytes) -> None:
+        written.append(data.decode())
+
+    scheduler = OutboundScheduler(writer, burst_limits=burst_limits)
+    futures = []
+    # Todo se encola antes de que el sender corra: el orden lo decide el planificador
+    for i in range(3):
+        futures.append(scheduler.submit_nowait(f"audio{i}".encode(), SendPriority.AUDIO))
+    for i in range(8):
+        futures.append(scheduler.submit_nowait(f"text{i}".encode(), SendPriority.TEXT))
+    futures.append(scheduler.submit_nowait(b"tool", SendPriority.TOOL_RESULT))
+    futures.append(scheduler.submit_nowait(b"session", SendPriority.LIFECYCLE))
+    await asyncio.gather(*futures)
+    metrics = scheduler.get_metrics()
+    await scheduler.close()
+    return written, metrics
+
+
+def test_priority_order_with_bursts_yielding_to_audio():
+    written, metrics = asyncio.run(_send_order({SendPriority.TEXT: 3}))
+    assert written == [
+        "session", "tool",
+        "text0", "text1", "text2", "audio0",
+        "text3", "text4", "text5", "audio1",
+        "text6", "text7", "audio2",
+    ]
+    assert metrics["text"]["sent"] == 8 and metrics["audio"]["sent"] == 3
+
+
+def test_default_bursts_drain_higher_classes_first():
+    written, _ = asyncio.run(_send_order())
+    # Ráfaga por defecto de texto (6): un audio se cuela tras el sexto texto
+    assert written[:2] == ["session", "tool"]
+    assert written[2:9] == ["text0", "text1", "text2", "text3", "text4", "text5", "audio0"]
+    assert written[9:] == ["text6", "text7", "audio1", "audio2"]
+
+
+async def _writer_error_reaches_its_caller():
+    async def writer(data: bytes) -> None:
+        if data == b"bad":
+            raise ConnectionResetError("stream cerrado")
+
+    scheduler = OutboundScheduler(writer)
+    await scheduler.submit(b"ok", SendPriority.TEXT)
+    try:
+        await scheduler.submit(b"bad", SendPriority.TOOL_RESULT)
+        raise AssertionError("se esperaba ConnectionResetError")
+    except ConnectionResetError:
+        pass
+    # El sender sigue vivo para los envíos siguientes
+    await scheduler.submit(b"ok", SendPriority.AUDIO)
+    await scheduler.close()
+    try:
+        await scheduler.submit(b"late", SendPriority.AUDIO)
+        raise AssertionError("se esperaba RuntimeError tras close()")
+    except RuntimeError:
+        pass
+
+
+def test_writer_error_reaches_its_caller():
+    asyncio.run(_writer_error_reaches_its_caller())
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"✅ {name}")
@@ -0,0 +1,111 @@
+import asyncio
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(__file__))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from streaming.engine import ENGINE_FULL
+
+ORIGINAL = "config/context_v8_minimal.yaml"
+OTHER = "config/context_simple_test.yaml"
+
+
+class SwitchRecorder:
+    """Manager mínimo: anota los cambios programados sin aplicarlos."""
+
+    engine_kind = ENGINE_FULL
+    supports_context_switch = True
+
+    def __init__(self) -> None:
+        self.requests = []
+
+    def request_context_switch(self, context_sources, *, tool_registry=None, inference=None, reason="", label=None):
+        self.requests.append(label)
+
+
+def _adapter():
+    from nova_sonic_web_adapter_v3 import NovaSonicWebAdapterV3
+
+    adapter = NovaSonicWebAdapterV3(context_config=ORIGINAL)
+    adapter.manager = SwitchRecorder()
+    return adapter
+
+
+def _switched(label):
+    return {"event": {"promptSwitched": {"mode": "in_stream", "reason": "test", "label": label}}}
+
+
+def _in_root(test):
+    # Las rutas de PROMPT_CONFIG_MAPPING son relativas a la raíz del repo
+    def wrapper():
+        cwd = os.getcwd()
+        os.chdir(ROOT)
+        try:
+            test()
+        finally:
+            os.chdir(cwd)
+    wrapper.__name__ = test.__name__
+    return wrapper
+
+
+@_in_root
+def test_prompt_config_changes_only_when_switch_is_applied():
+    adapter = _adapter()
+    adapter._switch_prompt_config("simple_test", reason="test")
+    assert adapter.manager.requests == [OTHER]
+    # Programado, no aplicado: la sesión sigue reportando el prompt vigente
+    assert adapter.context_config == ORIGINAL
+
+    adapter._handle_event(_switched(OTHER))
+    assert adapter.context_config == OTHER and adapter._pending_prompt_config is None
+
+
+@_in_root
+def test_switching_back_while_pending_is_not_short_circuited():
+    adapter = _adapter()
+    adapter._switch_prompt_config("simple_test", reason="test")
+    adapter._switch_prompt_config("simple_test", reason="test")
+    assert adapter.manager.requests == [OTHER]
+
+    # Volver al prompt vigente reemplaza el cambio pendiente
+    adapter._switch_prompt_config("v8_minimal", reason="test")
+    assert adapter.manager.requests == [OTHER, ORIGINAL]
+    adapter._handle_event(_switched(ORIGINAL))
+    assert adapter.context_config == ORIGINAL and adapter._pending_prompt_config is None
+    adapter._switch_prompt_config("v8_minimal", reason="test")
+    assert adapter.manager.requests == [OTHER, ORIGINAL]
+
+
+@_in_root
+def test_lean_engine_skips_coach_and_prompt_switch_without_raising():
+    from nova_sonic_realtime import NovaSonicRealtimeSession
+
+    adapter = _adapter()
+    lean = NovaSonicRealtimeSession(voice_id="matthew")
+    assert not lean.supports_injection and not lean.supports_context_switch
+    adapter.manager = lean
+    adapter._switch_prompt_config("simple_test", reason="test")
+    assert adapter.context_config == ORIGINAL and adapter._pending_prompt_config is None
+
+    # El coach se descarta antes de programar nada en el loop de la sesión
+    loop = asyncio.new_event_loop()
+    errors = []
+    loop.set_exception_handler(lambda _loop, context: errors.append(context))
+    adapter.loop = loop
+    adapter.is_running = True
+    try:
+        adapter._send_coach_instruction("Pide el DNI", "coach:flujo")
+        loop.run_until_complete(asyncio.sleep(0))
+    finally:
+        adapter.is_running = False
+        loop.close()
+    assert errors == []
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"✅ {name}")
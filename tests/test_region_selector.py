@@ -0,0 +1,163 @@
+import asyncio
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(__file__))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from streaming.regions import RegionSelector, reset_region_selector
+from streaming.retry import (
+    CircuitOpenError,
+    ErrorKind,
+    RetryCoordinator,
+    get_retry_coordinator,
+    reset_retry_coordinator,
+)
+from fakes import FakeStream
+
+
+class ThrottlingException(Exception):
+    pass
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _isolated_regions(*regions, failure_threshold=3):
+    reset_retry_coordinator()
+    for region in regions:
+        reset_retry_coordinator(RetryCoordinator(failure_threshold=failure_threshold), region=region)
+
+
+def test_measures_every_region_then_routes_to_fastest():
+    _isolated_regions("us-east-1", "us-west-2", "sa-east-1")
+    clock = FakeClock()
+    selector = RegionSelector(["us-east-1", "us-west-2", "sa-east-1"], probe_seconds=60, clock=clock)
+    # Sin muestras se prueba cada región una vez, en el orden configurado
+    assert [selector.choose() for _ in range(3)] == ["us-east-1", "us-west-2", "sa-east-1"]
+    selector.record_open("us-east-1", 180)
+    selector.record_open("us-west-2", 260)
+    selector.record_open("sa-east-1", 90)
+    selector.record_first_event("us-east-1", 700)
+    selector.record_first_event("sa-east-1", 650)
+    # us-west-2 sin primer evento se evalúa con el peor conocido (700)
+    assert selector.choose() == "sa-east-1"
+    metrics = selector.get_metrics()
+    assert metrics["regions"]["us-west-2"]["score_ms"] == 960.0
+    assert metrics["best"] == "sa-east-1" and metrics["probes"] == 3
+
+    # Promedio móvil: sa-east-1 se degrada y pierde contra us-east-1
+    for _ in range(10):
+        selector.record_first_event("sa-east-1", 1500)
+    assert selector.choose() == "us-east-1"
+
+
+def test_stale_region_is_probed_again():
+    _isolated_regions("us-east-1", "sa-east-1")
+    clock = FakeClock()
+    selector = RegionSelector(["us-east-1", "sa-east-1"], probe_seconds=60, clock=clock)
+    selector.record_open("us-east-1", 100)
+    selector.record_open("sa-east-1", 400)
+    assert selector.choose() == "us-east-1"
+    clock.now += 61
+    selector.record_open("us-east-1", 100)
+    assert selector.choose() == "sa-east-1"  # una sesión para re-medirla
+    assert selector.choose() == "us-east-1"  # mientras la prueba está en curso
+
+
+def test_failover_on_circuit_trip():
+    _isolated_regions("us-east-1", "sa-east-1", failure_threshold=2)
+    selector = RegionSelector(["us-east-1", "sa-east-1"], probe_seconds=0)
+    selector.record_open("us-east-1", 100)
+    selector.record_open("sa-east-1", 300)
+    for _ in range(2):
+        get_retry_coordinator("us-east-1").record_failure(ErrorKind.THROTTLING)
+    assert not selector.is_healthy("us-east-1")
+    assert selector.choose() == "sa-east-1"
+    assert selector.get_metrics()["failovers"] == 1
+    for _ in range(2):
+        get_retry_coordinator("sa-east-1").record_failure(ErrorKind.UNAVAILABLE)
+    try:
+        selector.choose()
+        raise AssertionError("se esperaba CircuitOpenError")
+    except CircuitOpenError as exc:
+        assert exc.retry_after >= 1.0
+
+
+# ---------------------------------------------------------------- endpoints falsos por región
+class LatencyEndpoint:
+    """Cliente de una región que tarda ``open_delay`` segundos en abrir cada stream."""
+
+    def __init__(self, open_delay: float) -> None:
+        self.open_delay = open_delay
+        self.streams = []
+
+    async def invoke_model_with_bidirectional_stream(self, request):
+        await asyncio.sleep(self.open_delay)
+        stream = FakeStream()
+        self.streams.append(stream)
+        return stream
+
+
+async def _routing_and_live_failover():
+    from context.bootstrap import load_context_sources
+    from nova_sonic_es_sd import BedrockStreamManager
+    from streaming.clients import install_client
+
+    endpoints = {"us-east-1": LatencyEndpoint(0.15), "sa-east-1": LatencyEndpoint(0.02)}
+    for region, endpoint in endpoints.items():
+        install_client(region, endpoint)
+    _isolated_regions(*endpoints, failure_threshold=1)
+    selector = reset_region_selector(RegionSelector(list(endpoints), probe_seconds=0))
+    sources = load_context_sources(os.path.join(ROOT, "config", "context_v8_minimal.yaml"))
+
+    sessions = []
+    for _ in range(5):
+        manager = BedrockStreamManager(context_sources=sources, region=selector.choose())
+        events = []
+        manager.output_subject.subscribe(on_next=events.append, on_error=lambda exc: None)
+        await manager.initialize_stream()
+        sessions.append((manager, events))
+    # Las dos primeras miden cada región; el resto va a la de menor latencia de apertura
+    assert [m.region for m, _ in sessions] == ["us-east-1", "sa-east-1", "sa-east-1", "sa-east-1", "sa-east-1"]
+    metrics = selector.get_metrics()["regions"]
+    assert metrics["sa-east-1"]["open_ms"] < metrics["us-east-1"]["open_ms"]
+
+    # Throttling en la región rápida: su circuito se abre y una sesión viva se
+    # reconecta en la otra región en lugar de esperar el enfriamiento
+    live, events = sessions[-1]
+    endpoints["sa-east-1"].streams[-1].inject(ThrottlingException("Too many requests"))
+    await asyncio.sleep(1.5)  # backoff de throttling: 0.5-1 s
+    assert live.region == "us-east-1" and live.is_active
+    assert any("streamReconnected" in e.get("event", {}) for e in events)
+    assert live.get_stream_metrics()["region_failovers"] == 1
+    assert len(endpoints["us-east-1"].streams) == 2
+    # Las sesiones nuevas también van a la región sana
+    assert selector.choose() == "us-east-1"
+
+    for manager, _ in sessions:
+        await manager.close()
+
+
+def test_fake_regional_endpoints_routing_and_failover():
+    from streaming.clients import reset_shared_clients
+
+    try:
+        asyncio.run(_routing_and_live_failover())
+    finally:
+        reset_shared_clients()
+        reset_region_selector()
+        reset_retry_coordinator()
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"✅ {name}")
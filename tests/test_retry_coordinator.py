@@ -0,0 +1,188 @@
+import asyncio
+import os
+import random
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(__file__))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from streaming.retry import (
+    CircuitOpenError,
+    ErrorKind,
+    RetryCoordinator,
+    classify_error,
+    reset_retry_coordinator,
+)
+from fakes import FakeBedrockClient, open_manager
+
+
+# Excepciones con el mismo nombre que las del SDK (classify_error mira el nombre de clase)
+class ThrottlingException(Exception):
+    pass
+
+
+class ValidationException(Exception):
+    pass
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_error_taxonomy():
+    assert classify_error(ThrottlingException("slow down")) is ErrorKind.THROTTLING
+    assert classify_error(ValidationException("bad event")) is ErrorKind.VALIDATION
+    assert classify_error(asyncio.TimeoutError()) is ErrorKind.TIMEOUT
+    assert classify_error(ConnectionResetError()) is ErrorKind.CONNECTION
+    assert classify_error(RuntimeError("Unexpected error, try your request again")) is ErrorKind.UNAVAILABLE
+    assert classify_error(RuntimeError("Too Many Requests")) is ErrorKind.THROTTLING
+    assert classify_error(RuntimeError("algo raro")) is ErrorKind.UNKNOWN
+    assert ErrorKind.THROTTLING.retryable and not ErrorKind.VALIDATION.retryable
+
+
+def test_jittered_backoff_bounds():
+    coordinator = RetryCoordinator(budget_tokens=100, failure_threshold=0, rng=random.Random(1))
+    delays = [coordinator.acquire_retry(ErrorKind.THROTTLING, 1) for _ in range(20)]
+    # Equal jitter: entre la mitad y el total de la demora base (1 s para throttling)
+    assert all(0.5 <= d <= 1.0 for d in delays)
+    assert len(set(delays)) == len(delays)
+    assert 1.0 <= coordinator.acquire_retry(ErrorKind.THROTTLING, 2) <= 2.0
+    assert coordinator.acquire_retry(ErrorKind.UNAVAILABLE, 10) <= 8.0
+
+
+def test_retry_budget_exhaustion_and_refill():
+    clock = FakeClock()
+    coordinator = RetryCoordinator(budget_tokens=4, refill_per_second=1.0, failure_threshold=0, clock=clock)
+    assert coordinator.acquire_retry(ErrorKind.THROTTLING, 1) is not None  # cuesta 2
+    assert coordinator.acquire_retry(ErrorKind.THROTTLING, 1) is not None
+    assert coordinator.acquire_retry(ErrorKind.UNAVAILABLE, 1) is None
+    clock.now += 1.0
+    assert coordinator.acquire_retry(ErrorKind.UNAVAILABLE, 1) is not None
+    metrics = coordinator.get_metrics()
+    assert metrics["retries_granted"] == 3 and metrics["retries_denied"] == 1
+
+
+def test_circuit_breaker_trip_and_half_open():
+    clock = FakeClock()
+    coordinator = RetryCoordinator(failure_threshold=3, window_seconds=10, open_seconds=5, clock=clock)
+    coordinator.record_failure(ErrorKind.VALIDATION)  # errores de la petición no cuentan
+    for _ in range(3):
+        coordinator.record_failure(ErrorKind.THROTTLING)
+    assert coordinator.state == "open"
+    assert not coordinator.admit_call()
+    try:
+        coordinator.check_admission()
+        raise AssertionError("se esperaba CircuitOpenError")
+    except CircuitOpenError as exc:
+        assert exc.retry_after > 0
+    # Los reintentos de sesiones vivas esperan al fin del enfriamiento
+    assert coordinator.acquire_retry(ErrorKind.THROTTLING, 1) >= 5.0
+
+    clock.now += 5.0
+    assert coordinator.state == "half_open"
+    assert coordinator.admit_call()        # una llamada de prueba
+    assert not coordinator.admit_call()
+    coordinator.record_failure(ErrorKind.UNAVAILABLE)
+    assert coordinator.state == "open"     # la prueba falló: otro enfriamiento
+
+    clock.now += 5.0
+    assert coordinator.admit_call()
+    coordinator.record_success()
+    assert coordinator.state == "closed" and coordinator.admit_call()
+    assert coordinator.get_metrics()["trips"] == 2
+
+
+def test_failures_outside_window_do_not_trip():
+    clock = FakeClock()
+    coordinator = RetryCoordinator(failure_threshold=3, window_seconds=10, clock=clock)
+    for _ in range(5):
+        coordinator.record_failure(ErrorKind.TIMEOUT)
+        clock.now += 6.0
+    assert coordinator.state == "closed"
+
+
+# ---------------------------------------------------------------- inyección de fallas
+async def _open_sessions(client, count):
+    managers = []
+    for _ in range(count):
+        events = []
+        manager = await open_manager(client, open_audio=False, events=events)
+        managers.append((manager, events))
+    return managers
+
+
+def _stream_events(events, name):
+    return [e["event"][name] for e in events if name in e.get("event", {})]
+
+
+async def _lockstep_throttling():
+    # El breaker usa un reloj falso; los backoff del manager sí esperan tiempo real
+    clock = FakeClock()
+    coordinator = reset_retry_coordinator(RetryCoordinator(
+        budget_tokens=6, refill_per_second=0, failure_threshold=4,
+        window_seconds=10, open_seconds=15, clock=clock, rng=random.Random(7),
+    ))
+    client = FakeBedrockClient()
+    sessions = await _open_sessions(client, 5)
+    # Bedrock throttlea a todas las sesiones del worker en el mismo instante
+    for stream in list(client.streams):
+        stream.inject(ThrottlingException("Too many requests, please wait before trying again."))
+    await asyncio.sleep(1.5)
+
+    delays = [r["delaySeconds"] for _, events in sessions for r in _stream_events(events, "streamReconnecting")]
+    reconnected = [m for m, events in sessions if _stream_events(events, "streamReconnected")]
+    fatal = [e for _, events in sessions for e in _stream_events(events, "streamError") if e.get("fatal")]
+    # 3 reintentos caben en el presupuesto (2 tokens c/u); el resto se corta sin reintentar
+    assert len(delays) == 3 and len(reconnected) == 3 and len(fatal) == 2
+    assert len(set(delays)) == 3 and all(0.5 <= d <= 1.0 for d in delays)
+    assert all(e["kind"] == "throttling" for e in fatal)
+    assert len(client.streams) == 5 + 3  # ningún stream extra contra el servicio
+    metrics = coordinator.get_metrics()
+    assert metrics["trips"] == 1 and metrics["state"] == "open" and metrics["retries_denied"] == 2
+    assert not coordinator.admit_call()  # llamada nueva rechazada con el circuito abierto
+
+    # Tras el enfriamiento una llamada de prueba exitosa cierra el circuito
+    clock.now += 15
+    assert coordinator.admit_call()
+    sessions += await _open_sessions(client, 1)
+    assert coordinator.state == "closed"
+    for manager, _ in sessions:
+        await manager.close()
+
+
+async def _validation_error_is_fatal():
+    coordinator = reset_retry_coordinator(RetryCoordinator(failure_threshold=1))
+    client = FakeBedrockClient()
+    [(manager, events)] = await _open_sessions(client, 1)
+    client.streams[0].inject(ValidationException("Invalid input request"))
+    await asyncio.sleep(0.1)
+    assert not _stream_events(events, "streamReconnecting")
+    assert _stream_events(events, "streamError")[0]["kind"] == "validation"
+    assert coordinator.state == "closed"  # un evento mal formado no abre el circuito
+    await manager.close()
+
+
+def test_fault_injection_lockstep_throttling():
+    try:
+        asyncio.run(_lockstep_throttling())
+    finally:
+        reset_retry_coordinator()
+
+
+def test_fault_injection_non_retryable():
+    try:
+        asyncio.run(_validation_error_is_fatal())
+    finally:
+        reset_retry_coordinator()
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"✅ {name}")
@@ -0,0 +1,156 @@
+import asyncio
+import os
+import sys
+import threading
+
+ROOT = os.path.dirname(os.path.dirname(__file__))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import streaming.clients as clients
+from streaming.clients import (
+    CachedCredentialsResolver,
+    get_shared_client,
+    install_client,
+    reset_shared_clients,
+)
+
+
+class LoopBoundClient:
+    """Como el cliente HTTP del SDK: sus conexiones solo sirven en el loop donde nació."""
+
+    def __init__(self, region: str) -> None:
+        self.region = region
+        self.loop = asyncio.get_running_loop()
+        self.opened = 0
+
+    async def invoke_model_with_bidirectional_stream(self, request):
+        if asyncio.get_running_loop() is not self.loop:
+            raise RuntimeError("stream abierto desde otro event loop")
+        await asyncio.sleep(0.01)
+        self.opened += 1
+        return self
+
+
+def _run_sessions_on_own_loops(loops: int, opens: int):
+    results = [None] * loops
+    errors = []
+    barrier = threading.Barrier(loops)
+
+    async def session_group(index):
+        barrier.wait()  # todos los loops piden su cliente a la vez
+        seen = set()
+        for _ in range(opens):
+            client = get_shared_client("us-east-1")
+            await client.invoke_model_with_bidirectional_stream(None)
+            seen.add(id(client))
+        results[index] = (client, seen)
+
+    def runner(index):
+        try:
+            asyncio.run(session_group(index))
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=runner, args=(i,)) for i in range(loops)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=10)
+    assert not errors, errors
+    return results
+
+
+def test_streams_from_concurrent_loops_use_their_own_client():
+    original = clients._build_client
+    clients._build_client = LoopBoundClient
+    try:
+        reset_shared_clients()
+        results = _run_sessions_on_own_loops(loops=3, opens=4)
+        # Un cliente por loop, reutilizado por todas las aperturas de ese loop
+        assert all(len(seen) == 1 for _, seen in results)
+        assert len({id(client) for client, _ in results}) == 3
+        assert all(client.opened == 4 for client, _ in results)
+
+        # Los clientes de loops ya cerrados se sueltan al crear el siguiente
+        _run_sessions_on_own_loops(loops=1, opens=1)
+        assert len(clients._clients) == 1
+    finally:
+        clients._build_client = original
+        reset_shared_clients()
+
+
+def test_installed_client_serves_every_loop():
+    class Endpoint:
+        async def invoke_model_with_bidirectional_stream(self, request):
+            return self
+
+    endpoint = Endpoint()
+    try:
+        install_client("us-east-1", endpoint)
+        results = _run_sessions_on_own_loops(loops=2, opens=1)
+        assert all(client is endpoint for client, _ in results)
+    finally:
+        reset_shared_clients()
+
+
+class ExpiredTokenException(Exception):
+    pass
+
+
+class StaticIdentity:
+    expiration = None
+
+
+class CountingResolver:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def get_identity(self, **kwargs):
+        self.calls += 1
+        return StaticIdentity()
+
+
+class ExpiredTokenEndpoint:
+    async def invoke_model_with_bidirectional_stream(self, request):
+        raise ExpiredTokenException("The security token included in the request is expired")
+
+
+async def _auth_error_invalidates_cached_credentials():
+    from context.bootstrap import load_context_sources
+    from nova_sonic_es_sd import BedrockStreamManager
+
+    delegate = CountingResolver()
+    resolver = CachedCredentialsResolver(delegate)
+    await resolver.get_identity()
+    await resolver.get_identity()
+    assert delegate.calls == 1  # cacheada
+
+    install_client("us-east-1", ExpiredTokenEndpoint())
+    clients._resolvers["us-east-1"] = resolver
+    sources = load_context_sources(os.path.join(ROOT, "config", "context_v8_minimal.yaml"))
+    manager = BedrockStreamManager(context_sources=sources, region="us-east-1")
+    try:
+        await manager.initialize_stream()
+        raise AssertionError("se esperaba ExpiredTokenException")
+    except ExpiredTokenException:
+        pass
+    await resolver.get_identity()
+    assert delegate.calls == 2  # releída tras el error de autenticación
+
+
+def test_auth_error_invalidates_cached_credentials():
+    from streaming.retry import reset_retry_coordinator
+
+    try:
+        asyncio.run(_auth_error_invalidates_cached_credentials())
+    finally:
+        reset_shared_clients()
+        reset_retry_coordinator()
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"✅ {name}")
@@ -0,0 +1,48 @@
+import asyncio
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(__file__))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from streaming.retry import reset_retry_coordinator
+from fakes import FakeBedrockClient, open_manager
+
+# 75 ms de micrófono @ 16 kHz: ruido de fondo de un usuario callado y voz
+QUIET_CHUNK = b"\x10\x00\xf0\xff" * 600
+SPEECH_CHUNK = b"\x00\x10\x00\xf0" * 600
+
+
+async def _uplink_stalls(chunk: bytes, seconds: float = 0.7) -> dict:
+    manager = await open_manager(FakeBedrockClient())
+    manager._stall_uplink_timeout = 0.3
+    manager._stall_response_timeout = 0.0
+    # El stream nunca entrega eventos: solo el audio subido decide si hay stall
+    for _ in range(int(seconds / 0.05)):
+        manager.add_audio_chunk(chunk)
+        await asyncio.sleep(0.05)
+    metrics = manager.get_stream_metrics()
+    await manager.close()
+    return metrics["read_stalls_by_kind"]
+
+
+def test_quiet_open_microphone_is_not_an_uplink_stall():
+    try:
+        assert asyncio.run(_uplink_stalls(QUIET_CHUNK))["uplink"] == 0
+    finally:
+        reset_retry_coordinator()
+
+
+def test_unanswered_speech_is_an_uplink_stall():
+    try:
+        assert asyncio.run(_uplink_stalls(SPEECH_CHUNK))["uplink"] >= 1
+    finally:
+        reset_retry_coordinator()
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"✅ {name}")
@@ -0,0 +1,137 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(__file__))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from streaming.stream_pool import StreamPool
+
+KEY = ("config/context_v8_minimal.yaml", "lupe")
+
+
+class FakeManager:
+    def __init__(self, key) -> None:
+        self.key = key
+        self.loop = asyncio.get_running_loop()
+        self.is_active = True
+        self.closed = False
+
+
+class FakeFactory:
+    def __init__(self, delay: float = 0.0) -> None:
+        self.delay = delay
+        self.created = []
+        self.closed = []
+
+    async def create(self, key) -> FakeManager:
+        await asyncio.sleep(self.delay)
+        manager = FakeManager(key)
+        self.created.append(manager)
+        return manager
+
+    async def close(self, manager: FakeManager) -> None:
+        # El cierre corre en el loop del propio stream
+        assert asyncio.get_running_loop() is manager.loop
+        manager.closed = True
+        self.closed.append(manager)
+
+
+def _wait_for(condition, timeout: float = 3.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("condición no alcanzada a tiempo")
+        time.sleep(0.01)
+
+
+def _pool(factory: FakeFactory, **kwargs) -> StreamPool:
+    pool = StreamPool(factory.create, closer=factory.close, **kwargs)
+    pool.start([KEY])
+    return pool
+
+
+def test_hit_hands_over_a_dedicated_loop_and_refills():
+    factory = FakeFactory()
+    pool = _pool(factory, size=1)
+    try:
+        _wait_for(lambda: pool.get_metrics()["idle"][str(KEY)] == 1)
+        first = pool.acquire(KEY)
+        assert first is not None and first.manager.key == KEY
+        # Se repone en segundo plano, en otro loop
+        _wait_for(lambda: pool.get_metrics()["idle"][str(KEY)] == 1)
+        second = pool.acquire(KEY)
+        loops = {first.loop, second.loop, pool.loop}
+        assert len(loops) == 3
+        # La sesión corre en el loop de su stream, no en el del pool
+        assert first.run(_running_loop()) is first.loop
+        first.release()
+        assert first.loop.is_closed()
+        assert not second.loop.is_closed()
+        second.release()
+        metrics = pool.get_metrics()
+        assert metrics["hits"] == 2 and metrics["created"] >= 2
+    finally:
+        pool.shutdown()
+
+
+async def _running_loop():
+    return asyncio.get_running_loop()
+
+
+def test_misses_bypass_and_hit_rate():
+    factory = FakeFactory(delay=0.3)
+    pool = _pool(factory, size=1)
+    try:
+        assert pool.acquire(KEY) is None  # todavía cebando
+        assert pool.acquire(("otro.yaml", "lupe")) is None  # clave no configurada
+        _wait_for(lambda: pool.get_metrics()["idle"][str(KEY)] == 1)
+        pooled = pool.acquire(KEY)
+        pooled.release()
+        metrics = pool.get_metrics()
+        assert (metrics["hits"], metrics["misses"], metrics["bypass"]) == (1, 1, 1)
+        assert metrics["hit_rate"] == 0.5
+    finally:
+        pool.shutdown()
+
+
+def test_expired_entries_are_closed_on_acquire_and_by_the_reaper():
+    factory = FakeFactory()
+    pool = _pool(factory, size=1, max_idle_seconds=0.2)
+    try:
+        _wait_for(lambda: len(factory.created) == 1)
+        time.sleep(0.25)
+        # Caducada al pedirla: no se entrega, se cierra y se repone
+        assert pool.acquire(KEY) is None
+        _wait_for(lambda: len(factory.closed) == 1)
+        assert factory.closed[0] is factory.created[0]
+        # El reaper (cada ~1 s) retira la entrada repuesta que murió sin que nadie la pidiera
+        _wait_for(lambda: len(factory.created) >= 2)
+        factory.created[1].is_active = False
+        _wait_for(lambda: factory.created[1] in factory.closed, timeout=3.0)
+        assert pool.get_metrics()["expired"] >= 2
+        _wait_for(lambda: factory.created[1].loop.is_closed())
+    finally:
+        pool.shutdown()
+    assert all(manager.closed for manager in factory.created)
+
+
+def test_shutdown_closes_idle_streams_and_their_loops():
+    factory = FakeFactory()
+    pool = _pool(factory, size=2)
+    _wait_for(lambda: pool.get_metrics()["idle"][str(KEY)] == 2)
+    before = threading.active_count()
+    pool.shutdown()
+    assert len(factory.closed) == 2
+    _wait_for(lambda: all(manager.loop.is_closed() for manager in factory.created))
+    assert threading.active_count() < before
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"✅ {name}")
@@ -0,0 +1,137 @@
+import asyncio
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(__file__))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from streaming.retry import reset_retry_coordinator
+from context.bootstrap import load_context_sources
+from fakes import MINIMAL_CONTEXT, FakeBedrockClient, FakeStream, open_manager
+
+
+class ClosingStream(FakeStream):
+    def __init__(self) -> None:
+        super().__init__()
+        self.closed = False
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+class RolloverClient(FakeBedrockClient):
+    """Como FakeBedrockClient, pero puede rechazar la próxima apertura de stream."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.fail_next = None
+
+    async def invoke_model_with_bidirectional_stream(self, request):
+        if self.fail_next is not None:
+            exc, self.fail_next = self.fail_next, None
+            raise exc
+        stream = ClosingStream()
+        self.streams.append(stream)
+        return stream
+
+
+def _event_names(stream):
+    return [next(iter(e["event"])) for e in stream.sent]
+
+
+async def _rollover_hands_over_and_retires_old_stream():
+    client = RolloverClient()
+    manager = await open_manager(client)
+    old_stream = client.streams[0]
+    audio_name = manager.audio_content_name
+
+    await manager._rollover_stream(430.0)
+
+    new_stream = client.streams[1]
+    assert manager.stream_response is new_stream and manager.is_active
+    # El stream nuevo se ceba con el mismo contentName de audio
+    assert _event_names(new_stream)[:2] == ["sessionStart", "promptStart"]
+    audio_starts = [e["event"]["contentStart"] for e in new_stream.sent if "contentStart" in e["event"]]
+    assert audio_starts[-1]["contentName"] == audio_name
+    # El viejo se cierra en orden y queda cerrado
+    assert _event_names(old_stream)[-3:] == ["contentEnd", "promptEnd", "sessionEnd"]
+    assert old_stream.closed and not new_stream.closed
+    assert manager.get_stream_metrics()["rollovers"] == 1
+    await manager.close()
+
+
+async def _failed_rollover_keeps_stream_and_context():
+    client = RolloverClient()
+    manager = await open_manager(client)
+    old_stream = client.streams[0]
+    context = manager.context_sources
+    inference = manager._inference
+
+    client.fail_next = ConnectionResetError("connection reset")
+    await manager._rollover_stream(430.0)
+
+    assert manager.stream_response is old_stream and manager.is_active and not old_stream.closed
+    assert manager.context_sources is context and manager._inference is inference
+    assert manager.get_stream_metrics()["rollover_failures"] == 1
+
+    # Rollover descartado: la sesión se reconectó mientras se cebaba el stream nuevo
+    manager._is_reconnecting = True
+    await manager._rollover_stream(430.0)
+    assert client.streams[1].closed and manager.stream_response is old_stream
+    assert manager.context_sources is context
+    manager._is_reconnecting = False
+    await manager.close()
+
+
+async def _context_switch_event_only_after_rollover_applies_it():
+    client = RolloverClient()
+    events = []
+    manager = await open_manager(client, events=events)
+    # Turno en curso: el cambio espera al rollover
+    manager._turn_active = True
+    manager.request_context_switch(
+        load_context_sources(MINIMAL_CONTEXT), reason="test", label="otro.yaml"
+    )
+
+    def switched():
+        return [e["event"]["promptSwitched"] for e in events if "promptSwitched" in e.get("event", {})]
+
+    client.fail_next = ConnectionResetError("connection reset")
+    await manager._rollover_stream(430.0)
+    # Falló: sin evento y el cambio sigue pendiente
+    assert switched() == [] and manager._pending_context_switch is not None
+
+    await manager._rollover_stream(430.0)
+    assert [(s["mode"], s["label"]) for s in switched()] == [("rollover", "otro.yaml")]
+    assert manager._pending_context_switch is None
+    manager._turn_active = False
+    await manager.close()
+
+
+def test_rollover_hands_over_and_retires_old_stream():
+    try:
+        asyncio.run(_rollover_hands_over_and_retires_old_stream())
+    finally:
+        reset_retry_coordinator()
+
+
+def test_failed_rollover_keeps_stream_and_context():
+    try:
+        asyncio.run(_failed_rollover_keeps_stream_and_context())
+    finally:
+        reset_retry_coordinator()
+
+
+def test_context_switch_event_only_after_rollover_applies_it():
+    try:
+        asyncio.run(_context_switch_event_only_after_rollover_applies_it())
+    finally:
+        reset_retry_coordinator()
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"✅ {name}")
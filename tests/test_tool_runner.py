@@ -0,0 +1,85 @@
+import asyncio
+import os
+import sys
+import threading
+
+ROOT = os.path.dirname(os.path.dirname(__file__))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from streaming.retry import reset_retry_coordinator
+from streaming.tool_runner import run_tool_call
+from fakes import FakeBedrockClient, open_manager
+
+
+async def _slow_processor_tool_times_out_off_loop():
+    manager = await open_manager(FakeBedrockClient())
+
+    release = threading.Event()
+    calls = []
+
+    def handle_tool_use(tool_name, tool_input):
+        # p. ej. una consulta al CRM que no responde
+        calls.append(threading.get_ident())
+        release.wait(2.0)
+        return {"status": "ok"}
+
+    # Sin registro de tools: cae al handler del processor (prompts sin sección 'tools')
+    manager._tool_registry = None
+    manager._tool_timeouts["guardar_lead"] = 0.2
+    manager.processor.handle_tool_use = handle_tool_use
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.02)
+            ticks += 1
+
+    task = asyncio.create_task(ticker())
+    try:
+        await manager._execute_tool("guardar_lead", {"nombre": "Ana"}, "tool-1")
+    finally:
+        release.set()
+        task.cancel()
+    # El handler corrió fuera del loop, el loop siguió atendiendo y venció el plazo
+    assert calls and calls[0] != threading.get_ident()
+    assert ticks >= 5
+    metrics = manager.get_stream_metrics()
+    assert metrics["tool_timeouts"] == 1 and metrics["tool_errors"] == 0
+    await manager.close()
+
+
+def test_slow_processor_tool_times_out_without_blocking_the_loop():
+    try:
+        asyncio.run(_slow_processor_tool_times_out_off_loop())
+    finally:
+        reset_retry_coordinator()
+
+
+def test_lead_writes_from_tool_threads_and_loop_reads_do_not_race():
+    from processors.tool_use_processor import ToolUseProcessor
+
+    processor = ToolUseProcessor()
+    lead = {"nombre_completo": "Ana Pérez", "dni": "12345678", "telefono": "987654321"}
+
+    async def scenario():
+        writes = [run_tool_call(processor.handle_tool_use, "guardar_lead", dict(lead)) for _ in range(20)]
+        snapshots = []
+        for write in asyncio.as_completed(writes):
+            assert (await write)["status"] == "success"
+            snapshots.append(processor.snapshot_lead())
+        return snapshots
+
+    snapshots = asyncio.run(scenario())
+    assert all(snapshot["dni"] == "12345678" for snapshot in snapshots)
+    # El snapshot es una copia: quien lo lea no ve (ni provoca) escrituras a medias
+    snapshots[0]["dni"] = None
+    assert processor.snapshot_lead()["dni"] == "12345678"
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"✅ {name}")
@@ -0,0 +1,99 @@
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(__file__))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from streaming.usage import SessionBudget, UsageLedger
+
+
+def _delta(speech_in=0, text_in=0, speech_out=0, text_out=0):
+    return {"details": {"delta": {
+        "input": {"speechTokens": speech_in, "textTokens": text_in},
+        "output": {"speechTokens": speech_out, "textTokens": text_out},
+    }}}
+
+
+def _total(speech_in=0, text_in=0, speech_out=0, text_out=0):
+    return {"details": {"total": {
+        "input": {"speechTokens": speech_in, "textTokens": text_in},
+        "output": {"speechTokens": speech_out, "textTokens": text_out},
+    }}}
+
+
+def test_delta_events_attribute_coach_text_and_replace_estimate():
+    ledger = UsageLedger(speech_tokens_per_second=25)
+    ledger.note_user_audio(2.0)
+    assert ledger.pending_estimate()["user_speech"] == 50
+    ledger.note_coach_text("x" * 40)  # ~10 tokens de coach
+
+    assert ledger.record(_delta(speech_in=60, text_in=30, speech_out=80, text_out=20))
+    assert ledger.totals == {
+        "user_speech": 60, "context": 20, "coach": 10, "assistant_text": 20, "assistant_speech": 80,
+    }
+    # El dato del servidor reemplaza la estimación por duración de audio
+    assert ledger.pending_estimate() == {"user_speech": 0, "assistant_speech": 0}
+    # El coach ya atribuido no se vuelve a descontar
+    ledger.record(_delta(text_in=30))
+    assert ledger.totals["coach"] == 10 and ledger.totals["context"] == 50
+    assert not ledger.record(_delta())
+
+
+def test_total_events_are_diffed_against_previous_totals():
+    ledger = UsageLedger()
+    assert ledger.record(_total(speech_in=100, text_in=400, speech_out=50, text_out=10))
+    assert ledger.record(_total(speech_in=160, text_in=400, speech_out=90, text_out=25))
+    assert ledger.totals["user_speech"] == 160 and ledger.totals["context"] == 400
+    assert ledger.totals["assistant_speech"] == 90 and ledger.totals["assistant_text"] == 25
+    # Un total repetido no suma nada
+    assert not ledger.record(_total(speech_in=160, text_in=400, speech_out=90, text_out=25))
+    assert ledger.total_tokens == 675 and ledger.events == 2
+
+
+def test_turns_close_with_their_own_tokens():
+    ledger = UsageLedger()
+    assert ledger.close_turn() is None
+    ledger.record(_delta(speech_in=10, text_out=5))
+    turn = ledger.close_turn()
+    assert turn["index"] == 1 and turn["totalTokens"] == 15
+    ledger.record(_delta(speech_out=30))
+    payload = ledger.payload()
+    assert payload["turn"]["index"] == 2 and payload["turn"]["tokens"]["assistant_speech"] == 30
+    assert payload["lastTurn"] is turn and payload["totalTokens"] == 45
+
+
+def test_budget_warns_once_then_exceeds_once():
+    budget = SessionBudget(max_tokens=1000, warn_ratio=0.8, action="wrap_up")
+    assert budget.check(0.0, 500) is None
+    assert budget.check(0.0, 800) == "warn"
+    assert budget.check(0.0, 900) is None
+    assert budget.check(0.0, 1000) == "exceeded"
+    assert budget.check(0.0, 2000) is None
+    assert budget.get_metrics()["warned"] and budget.get_metrics()["exceeded"]
+
+
+def test_budget_uses_the_tightest_limit():
+    budget = SessionBudget(max_cost_usd=0.01, max_tokens=1_000_000, warn_ratio=0.5)
+    assert budget.usage_ratio(0.006, 10) == 0.6
+    # El costo cruza el límite aunque los tokens estén lejos: sin aviso intermedio
+    assert budget.check(0.02, 10) == "exceeded"
+    assert SessionBudget().check(100.0, 10**9) is None  # sin límites = deshabilitado
+
+
+def test_budget_config_validation():
+    for config in ({"action": "hang_up"}, ["max_tokens", 10]):
+        try:
+            SessionBudget.from_config(config)
+            raise AssertionError(f"se esperaba ValueError para {config!r}")
+        except ValueError:
+            pass
+    budget = SessionBudget.from_config({"max_tokens": 500, "action": "SWITCH_PROMPT"})
+    assert budget.enabled and budget.action == "switch_prompt"
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"✅ {name}")